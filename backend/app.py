@@ -9,6 +9,12 @@ from flask_jwt_extended import JWTManager
 from config import config
 from utils.logger import setup_logger
 from utils.db import init_db
+from utils.embedding_cache import get_embedding_cache
+from utils.extraction_cache import get_extraction_cache
+from utils.http_client import get_http_metrics
+from utils.keyword_cache import get_keyword_cache
+from utils.page_cache import get_page_cache
+from services.keyword_pool import get_keyword_pool_metrics
 
 # Import routes
 from routes.auth import auth_bp
@@ -65,9 +71,19 @@ def create_app(config_name='default'):
     @app.route('/api/health', methods=['GET'])
     def health_check():
         """Health check endpoint for monitoring."""
+        page_cache = get_page_cache()
+        extraction_cache = get_extraction_cache()
+        embedding_cache = get_embedding_cache()
+        keyword_cache = get_keyword_cache()
         return jsonify({
             'status': 'healthy',
-            'message': 'Blog Generator API is running'
+            'message': 'Blog Generator API is running',
+            'page_cache': page_cache.stats() if page_cache else None,
+            'extraction_cache': extraction_cache.stats() if extraction_cache else None,
+            'embedding_cache': embedding_cache.stats() if embedding_cache else None,
+            'keyword_cache': keyword_cache.stats() if keyword_cache else None,
+            'keyword_pool': get_keyword_pool_metrics(),
+            'outbound_http': get_http_metrics()
         }), 200
     
     # Error handlers
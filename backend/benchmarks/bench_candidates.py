@@ -0,0 +1,77 @@
+"""
+Keyword candidate pruning benchmark.
+For several document lengths, reports how many candidate phrases KeyBERT's
+vectorizer finds and how many are embedded after pruning, the time pruning
+takes, and KeywordExtractor.extract_keywords latency at several
+KEYWORD_MAX_CANDIDATES values (0 embeds every candidate).
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_candidates [--corpus path/to/dir] [--limits 0,1000,500,200]
+
+The keyword and embedding caches are disabled so every run embeds from
+scratch. Needs keybert (and so scikit-learn) and sentence-transformers.
+"""
+import argparse
+
+from config import Config
+from benchmarks.bench_keywords import generated_documents
+from benchmarks.bench_text_cleaner import corpus_documents, median_seconds
+from services.candidate_pruner import prune_candidates
+from services.keyword_extractor import KeywordExtractor, get_keybert_model
+from services.text_cleaner import TextCleaner
+
+LENGTHS = (2000, 10000, 25000, 50000)
+
+
+def vectorizer_candidates(text):
+    """Number of candidate phrases KeyBERT's default vectorizer finds (1-3 words, English stop words)."""
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    return len(CountVectorizer(ngram_range=(1, 3), stop_words='english').fit([text]).vocabulary_)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--corpus', help='Directory of .txt or .html documents')
+    parser.add_argument('--limits', default='0,1000,500,200', help='Comma-separated candidate limits')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per length and limit')
+    parser.add_argument('--top-n', type=int, default=15, help='Keywords per document')
+    args = parser.parse_args()
+    limits = [int(limit) for limit in args.limits.split(',')]
+
+    # Read when the model loads, so it must be set first
+    Config.KEYWORD_CACHE_SIZE = 0
+    Config.EMBEDDING_CACHE_SIZE = 0
+
+    if not get_keybert_model('en'):
+        raise SystemExit("KeyBERT is not available (not installed or DISABLE_KEYBERT is set)")
+
+    documents = corpus_documents(args.corpus) if args.corpus else []
+    documents = [TextCleaner.clean_text(document) for document in documents] or generated_documents(50)
+    joined = ' '.join(documents)
+
+    def extract(text, limit):
+        return KeywordExtractor.extract_keywords(text, top_n=args.top_n, language='en', max_candidates=limit)
+
+    # Warm up the model so the first run does not pay for lazy initialization
+    extract(joined[:LENGTHS[0]], 0)
+
+    for length in LENGTHS:
+        text = (joined * (length // max(len(joined), 1) + 1))[:length]
+        pruned = [limit for limit in limits if limit > 0]
+        prune_ms = median_seconds(prune_candidates, args.repeat, text, max(pruned or [1])) * 1000
+        print(f"{length} chars: {vectorizer_candidates(text)} vectorizer candidates, "
+              f"pruning {prune_ms:.1f}ms")
+
+        baseline = None
+        for limit in limits:
+            milliseconds = median_seconds(extract, args.repeat, text, limit) * 1000
+            keywords = {keyword for keyword, _ in extract(text, limit)}
+            baseline = baseline if baseline is not None else keywords
+            embedded = len(prune_candidates(text, limit)) if limit else 'all'
+            print(f"  limit {limit or 'none':>5}: {embedded:>5} embedded, {milliseconds:8.1f}ms, "
+                  f"{len(keywords & baseline)}/{len(baseline)} keywords shared with the first limit")
+
+
+if __name__ == '__main__':
+    main()
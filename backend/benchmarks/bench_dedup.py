@@ -0,0 +1,99 @@
+"""
+Near-duplicate removal benchmark.
+Builds a site corpus from saved pages of one website with and without
+NearDuplicateFilter, and times keyword extraction on both to measure the
+downstream time saved by the bytes removed.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_dedup --corpus path/to/site/pages [--repeat 3]
+
+Keyword timings use KeyBERT when it is installed and enabled, otherwise the
+frequency fallback (see DISABLE_KEYBERT). The keyword and embedding caches are
+disabled so every timed run extracts from scratch.
+"""
+import argparse
+import glob
+import os
+import statistics
+import time
+
+from config import Config
+from services.content_extractor import ContentExtractor
+from services.keyword_extractor import KeywordExtractor
+from services.near_duplicate_filter import NearDuplicateFilter
+from services.text_cleaner import TextCleaner
+
+
+def build_without_filter(texts):
+    """Corpus as merged before near-duplicate removal (exact page duplicates only)."""
+    parts = []
+    for text in texts:
+        cleaned_text = TextCleaner.clean_text(text, max_length=Config.MAX_CONTENT_LENGTH)
+        if cleaned_text not in parts:
+            parts.append(cleaned_text)
+    return ' '.join(parts)
+
+
+def build_with_filter(texts):
+    """Corpus as merged by SiteCrawler.build_corpus."""
+    duplicate_filter = NearDuplicateFilter()
+    parts = []
+    for text in texts:
+        paragraphs = duplicate_filter.filter_page(TextCleaner.split_paragraphs(text))
+        if paragraphs:
+            parts.append(TextCleaner.clean_text(' '.join(paragraphs), max_length=Config.MAX_CONTENT_LENGTH))
+    return ' '.join(parts), duplicate_filter.stats()
+
+
+def time_keywords(text, repeat):
+    """Return the median keyword extraction time in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        KeywordExtractor.extract_keywords(text, top_n=15, use_ngrams=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--corpus', required=True, help='Directory of saved .html pages from one site')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed keyword runs per corpus')
+    args = parser.parse_args()
+
+    # Read when the model loads, so it must be set first
+    Config.KEYWORD_CACHE_SIZE = 0
+    Config.EMBEDDING_CACHE_SIZE = 0
+
+    paths = sorted(glob.glob(os.path.join(args.corpus, '*.htm*')))
+    if not paths:
+        raise SystemExit(f"No .html files found in {args.corpus}")
+
+    texts = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            try:
+                texts.append(ContentExtractor._extract_from_html(f.read(), url=path)['text'])
+            except ValueError:
+                continue
+
+    before = build_without_filter(texts)
+    after, stats = build_with_filter(texts)
+
+    # Warm up the keyword model so loading time is not measured
+    KeywordExtractor.extract_keywords(after[:1000], top_n=5)
+    keywords_before = time_keywords(before, args.repeat)
+    keywords_after = time_keywords(after, args.repeat)
+
+    print(f"pages extracted:      {len(texts)}")
+    print(f"pages dropped:        {stats['pages_dropped']}")
+    print(f"paragraphs dropped:   {stats['paragraphs_dropped']}")
+    print(f"corpus bytes:         {len(before.encode('utf-8'))} -> {len(after.encode('utf-8'))} "
+          f"({stats['bytes_removed']} removed)")
+    print(f"filter time:          {stats['seconds'] * 1000:.1f}ms")
+    print(f"keyword extraction:   {keywords_before:.1f}ms -> {keywords_after:.1f}ms")
+    print(f"time saved:           {keywords_before - keywords_after - stats['seconds'] * 1000:.1f}ms net")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Content extraction benchmark.
+Times ContentExtractor over a corpus of saved HTML pages against the previous
+implementation, which re-parsed the raw bytes for every fallback stage and used
+BeautifulSoup's html.parser for the last one.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_extraction --corpus path/to/html/dir [--repeat 5]
+
+The baseline needs beautifulsoup4, which is no longer an app dependency.
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import time
+
+import trafilatura
+
+from services.content_extractor import ContentExtractor
+from trafilatura.utils import load_html
+
+
+def legacy_extract(html):
+    """Extraction chain as it was before the parse-once tree."""
+    downloaded = trafilatura.extract(
+        html, include_comments=False, include_tables=False,
+        favor_precision=True, with_metadata=True, output_format='json'
+    )
+    if not downloaded:
+        downloaded = trafilatura.extract(
+            html, include_comments=True, include_tables=True,
+            favor_precision=False, with_metadata=True, output_format='json'
+        )
+    if downloaded:
+        return json.loads(downloaded)
+    plain_text = trafilatura.extract(html)
+    if plain_text:
+        return {'text': plain_text}
+    return {'text': legacy_visible_text(html)}
+
+
+def legacy_visible_text(html):
+    """Final fallback as it was: BeautifulSoup with the pure-Python parser."""
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html, "html.parser").get_text(separator="\n").strip()
+
+
+def current_extract(html):
+    """Current extraction chain."""
+    try:
+        return ContentExtractor._extract_from_html(html, url='benchmark')
+    except ValueError:
+        return None
+
+
+def current_visible_text(html):
+    """Current final fallback: parse with lxml and walk visible text nodes."""
+    return ContentExtractor._visible_text(load_html(html))
+
+
+def time_call(func, html, repeat):
+    """Return the median wall time of func(html) in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--corpus', required=True, help='Directory of saved .html pages')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per page')
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.corpus, '*.htm*')))
+    if not paths:
+        raise SystemExit(f"No .html files found in {args.corpus}")
+
+    rows = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            html = f.read()
+        rows.append((
+            os.path.basename(path),
+            len(html) / 1024,
+            time_call(legacy_extract, html, args.repeat),
+            time_call(current_extract, html, args.repeat),
+            time_call(legacy_visible_text, html, args.repeat),
+            time_call(current_visible_text, html, args.repeat),
+        ))
+
+    header = f"{'page':<28}{'KB':>8}{'chain before':>14}{'chain after':>13}{'fallback before':>17}{'fallback after':>16}"
+    print(header)
+    print('-' * len(header))
+    for name, size_kb, chain_old, chain_new, text_old, text_new in rows:
+        print(f"{name[:27]:<28}{size_kb:>8.1f}{chain_old:>12.1f}ms{chain_new:>11.1f}ms{text_old:>15.1f}ms{text_new:>14.1f}ms")
+
+    print('-' * len(header))
+    means = [statistics.mean(row[i] for row in rows) for i in range(2, 6)]
+    print(f"{'mean per page':<36}{means[0]:>12.1f}ms{means[1]:>11.1f}ms{means[2]:>15.1f}ms{means[3]:>14.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
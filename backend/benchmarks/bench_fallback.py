@@ -0,0 +1,78 @@
+"""
+Fallback keyword extractor benchmark.
+Compares the TF-IDF fallback with the previous Counter-based one: time per
+document at several document lengths, and the keywords each returns. With a
+corpus, IDF statistics are first learned from it into a temporary store, as
+they would be from blog_history.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_fallback [--corpus path/to/dir] [--repeat 5]
+"""
+import argparse
+import re
+import tempfile
+from collections import Counter
+
+from config import Config
+from benchmarks.bench_keywords import generated_documents
+from benchmarks.bench_text_cleaner import corpus_documents, median_seconds
+from services.text_cleaner import TextCleaner
+from services.tfidf_keywords import TfidfKeywordExtractor, candidate_hashes
+from utils import idf_store
+
+
+def legacy_fallback(text, top_n=10, use_ngrams=True):
+    """_simple_keyword_fallback as it was before the TF-IDF extractor (English)."""
+    stop_words = {
+        "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
+        "with", "is", "of", "that", "this", "it", "as", "by", "from", "are"
+    }
+    words = re.findall(r"\b[a-z]{4,}\b", (text or "").lower())
+    words = [w for w in words if w not in stop_words]
+    candidates = list(words)
+    if use_ngrams and len(words) >= 2:
+        for n in (2, 3):
+            candidates.extend([" ".join(words[i:i+n]) for i in range(len(words) - n + 1)])
+    most_common = [w for w, _ in Counter(candidates).most_common(top_n)]
+    return [(kw, 1.0) for kw in most_common]
+
+
+def current_fallback(text, top_n=10, use_ngrams=True):
+    """Current TF-IDF fallback."""
+    return TfidfKeywordExtractor.extract_keywords(text, top_n=top_n, use_ngrams=use_ngrams, language='en')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--corpus', help='Directory of .txt or .html documents')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per extractor')
+    parser.add_argument('--top-n', type=int, default=15, help='Keywords per document')
+    args = parser.parse_args()
+
+    documents = corpus_documents(args.corpus) if args.corpus else []
+    documents = [TextCleaner.clean_text(document) for document in documents] or generated_documents(50)
+
+    # Learn document frequencies from the corpus into a throwaway store
+    Config.IDF_REFRESH_SECONDS = 0
+    store = idf_store.IdfStore(tempfile.mkdtemp(prefix='idf-'), Config.IDF_BUCKETS)
+    with store.lock():
+        for document in documents:
+            store.add_document(candidate_hashes(document)[1])
+        store.write_meta(len(documents), None)
+    idf_store._idf_store = store
+    print(f"IDF learned from:     {len(documents)} documents")
+
+    joined = ' '.join(documents)
+    for length in (2000, 10000, Config.MAX_CONTENT_LENGTH):
+        text = (joined * (length // max(len(joined), 1) + 1))[:length]
+        before = median_seconds(legacy_fallback, args.repeat, text, args.top_n) * 1000
+        after = median_seconds(current_fallback, args.repeat, text, args.top_n) * 1000
+        print(f"{length:>6} chars:         {before:7.2f}ms -> {after:6.2f}ms ({before / after:.1f}x)")
+
+    sample = max(documents, key=len)[:Config.MAX_CONTENT_LENGTH]
+    print(f"keywords before:      {', '.join(keyword for keyword, _ in legacy_fallback(sample, args.top_n))}")
+    print(f"keywords after:       {', '.join(keyword for keyword, _ in current_fallback(sample, args.top_n))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Keyword extraction benchmark.
+Reports documents per second for KeywordExtractor.extract_keywords called once
+per text, and for KeywordExtractor.extract_keywords_batch at several batch
+sizes, and checks that both return results of the same shape.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_keywords [--corpus path/to/dir] [--docs 64] [--batch-sizes 1,4,16,64]
+
+The corpus directory may hold extracted text (.txt) or saved pages (.html,
+extracted first). Without one, generated English documents are used. The
+keyword result cache is always disabled, and the embedding cache unless
+--cache is given, so every run embeds from scratch. Needs keybert and sentence-transformers; runs on CPU by default.
+"""
+import argparse
+import numbers
+import random
+import time
+
+from config import Config
+from benchmarks.bench_text_cleaner import corpus_documents
+from services.keyword_extractor import KeywordExtractor, get_keybert_model
+from services.text_cleaner import TextCleaner
+
+TOPICS = [
+    'solar panels convert sunlight into electricity for homes and businesses',
+    'machine learning models need clean training data and careful evaluation',
+    'coffee roasting changes the flavor of the beans through heat and time',
+    'remote teams rely on clear written communication and shared tools',
+    'electric cars reduce emissions but depend on charging infrastructure',
+    'container gardening lets city residents grow vegetables on balconies',
+    'password managers store strong unique credentials for every account',
+    'marathon training plans build endurance with gradual weekly mileage',
+]
+
+
+def generated_documents(count, seed=0):
+    """English documents of a few hundred words built from topic sentences."""
+    rng = random.Random(seed)
+    documents = []
+    for _ in range(count):
+        sentences = []
+        for _ in range(rng.randint(15, 40)):
+            words = rng.choice(TOPICS).split()
+            rng.shuffle(words)
+            sentences.append(' '.join(words).capitalize() + '.')
+        documents.append(' '.join(sentences))
+    return documents
+
+
+def docs_per_second(func, documents):
+    """Run func over all documents; return (docs/sec, results)."""
+    started = time.perf_counter()
+    results = func(documents)
+    return len(documents) / (time.perf_counter() - started), results
+
+
+def same_shape(single, batched):
+    """True if both runs return a list of (str, float) tuples of equal length per text."""
+    for one, other in zip(single, batched):
+        if len(one) != len(other):
+            return False
+        for keyword, score in one + other:
+            if not isinstance(keyword, str) or not isinstance(score, numbers.Real):
+                return False
+    return len(single) == len(batched)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--corpus', help='Directory of .txt or .html documents')
+    parser.add_argument('--docs', type=int, default=64, help='Documents per run')
+    parser.add_argument('--batch-sizes', default='1,4,16,64', help='Comma-separated batch sizes')
+    parser.add_argument('--top-n', type=int, default=15, help='Keywords per document')
+    parser.add_argument('--cache', action='store_true', help='Keep the embedding cache enabled')
+    args = parser.parse_args()
+
+    # Repeated runs over the same texts would otherwise be served from the cache
+    Config.KEYWORD_CACHE_SIZE = 0
+
+    # Read when the model loads, so it must be set first
+    if not args.cache:
+        Config.EMBEDDING_CACHE_SIZE = 0
+
+    if not get_keybert_model('en'):
+        raise SystemExit("KeyBERT is not available (not installed or DISABLE_KEYBERT is set)")
+
+    documents = corpus_documents(args.corpus) if args.corpus else []
+    documents = [TextCleaner.clean_text(document, Config.MAX_CONTENT_LENGTH) for document in documents]
+    documents = (documents + generated_documents(args.docs))[:args.docs]
+    languages = ['en'] * len(documents)
+
+    # Warm up the model so the first run does not pay for lazy initialization
+    KeywordExtractor.extract_keywords(documents[0], top_n=args.top_n, language='en')
+
+    single_rate, single = docs_per_second(
+        lambda texts: [KeywordExtractor.extract_keywords(text, top_n=args.top_n, language='en') for text in texts],
+        documents
+    )
+    print(f"documents:             {len(documents)}")
+    print(f"one call per text:     {single_rate:.1f} docs/sec")
+
+    for batch_size in (int(size) for size in args.batch_sizes.split(',')):
+        rate, batched = docs_per_second(
+            lambda texts: KeywordExtractor.extract_keywords_batch(
+                texts, top_n=args.top_n, languages=languages, batch_size=batch_size
+            ),
+            documents
+        )
+        shape = 'same shape' if same_shape(single, batched) else 'SHAPE MISMATCH'
+        print(f"batch size {batch_size:<4}        {rate:.1f} docs/sec ({rate / single_rate:.1f}x, {shape})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Long document keyword benchmark.
+Reports KeywordExtractor.extract_keywords latency as a function of document
+length, with the document embedded as pooled sentence-aligned windows
+(KEYWORD_WINDOW_CHARS) and embedded in one truncated piece, and how many
+keywords the two agree on.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_long_documents [--corpus path/to/dir] [--repeat 3]
+
+The keyword and embedding caches are disabled so every run embeds from
+scratch. Needs keybert and sentence-transformers; runs on CPU by default.
+"""
+import argparse
+
+from config import Config
+from benchmarks.bench_keywords import generated_documents
+from benchmarks.bench_text_cleaner import corpus_documents, median_seconds
+from services.keyword_extractor import KeywordExtractor, get_keybert_model
+from services.text_cleaner import TextCleaner
+from utils.document import Document
+
+LENGTHS = (1000, 2500, 5000, 10000, 25000, 50000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--corpus', help='Directory of .txt or .html documents')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per length and mode')
+    parser.add_argument('--top-n', type=int, default=15, help='Keywords per document')
+    args = parser.parse_args()
+
+    # Read when the model loads, so it must be set first
+    Config.KEYWORD_CACHE_SIZE = 0
+    Config.EMBEDDING_CACHE_SIZE = 0
+
+    if not get_keybert_model('en'):
+        raise SystemExit("KeyBERT is not available (not installed or DISABLE_KEYBERT is set)")
+
+    documents = corpus_documents(args.corpus) if args.corpus else []
+    documents = [TextCleaner.clean_text(document) for document in documents] or generated_documents(50)
+    joined = ' '.join(documents)
+    window_chars = Config.KEYWORD_WINDOW_CHARS or 500
+
+    def extract(text, window):
+        Config.KEYWORD_WINDOW_CHARS = window
+        return KeywordExtractor.extract_keywords(text, top_n=args.top_n, language='en')
+
+    # Warm up the model so the first run does not pay for lazy initialization
+    extract(joined[:LENGTHS[0]], window_chars)
+
+    print(f"window:               {window_chars} chars")
+    print("length    windows   whole (ms)   windowed (ms)   shared keywords")
+    for length in LENGTHS:
+        text = (joined * (length // max(len(joined), 1) + 1))[:length]
+        windows = len(Document(text).windows(window_chars))
+        whole = median_seconds(extract, args.repeat, text, 0) * 1000
+        windowed = median_seconds(extract, args.repeat, text, window_chars) * 1000
+        shared = {keyword for keyword, _ in extract(text, 0)} & {keyword for keyword, _ in extract(text, window_chars)}
+        print(f"{length:>6}   {windows:>8}   {whole:10.1f}   {windowed:13.1f}   {len(shared):>8}/{args.top_n}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+ONNX keyword backend benchmark.
+Runs keyword extraction with the PyTorch and the quantized ONNX backends, each
+in a fresh process, and reports:
+  - parity: overlap of the top keywords and agreement of the first keyword
+    per document (exits with status 1 below --min-overlap)
+  - latency: median and p95 seconds per document
+  - memory: RSS after loading the model and peak RSS
+
+Usage (from the backend directory, after exporting the model with
+`python -m services.onnx_embedder paraphrase-MiniLM-L3-v2`):
+    python -m benchmarks.bench_onnx [--corpus path/to/dir] [--docs 32] [--min-overlap 0.8]
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+from config import Config
+from benchmarks.bench_keywords import generated_documents
+from benchmarks.bench_text_cleaner import corpus_documents
+from services.text_cleaner import TextCleaner
+
+
+def rss_mb():
+    """Current resident set size in MB."""
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def load_documents(corpus, count):
+    """Cleaned corpus documents topped up with generated ones."""
+    documents = corpus_documents(corpus) if corpus else []
+    documents = [TextCleaner.clean_text(document, Config.MAX_CONTENT_LENGTH) for document in documents]
+    return (documents + generated_documents(count))[:count]
+
+
+def run_backend(backend, args):
+    """Measure one backend in this process; returns a JSON-serializable result."""
+    os.environ['KEYBERT_BACKEND'] = backend
+    # Every timed document must reach the model, including the warm-up one
+    Config.KEYWORD_CACHE_SIZE = 0
+    Config.EMBEDDING_CACHE_SIZE = 0
+    from services.keyword_extractor import KeywordExtractor, get_keybert_model
+    from services.onnx_embedder import OnnxEmbedder
+
+    documents = load_documents(args.corpus, args.docs)
+    before = rss_mb()
+    started = time.perf_counter()
+    model = get_keybert_model('en')
+    if not model:
+        raise SystemExit("KeyBERT is not available (not installed or DISABLE_KEYBERT is set)")
+    if backend == 'onnx' and not isinstance(model.model.embedding_model, OnnxEmbedder):
+        raise SystemExit("ONNX export not found; run python -m services.onnx_embedder first")
+    load_seconds = time.perf_counter() - started
+    loaded = rss_mb()
+
+    KeywordExtractor.extract_keywords(documents[0], top_n=args.top_n, language='en')
+    keywords, timings = [], []
+    for document in documents:
+        started = time.perf_counter()
+        result = KeywordExtractor.extract_keywords(document, top_n=args.top_n, language='en')
+        timings.append(time.perf_counter() - started)
+        keywords.append([keyword for keyword, score in result])
+
+    timings.sort()
+    return {
+        'backend': backend,
+        'keywords': keywords,
+        'load_seconds': load_seconds,
+        'median_seconds': statistics.median(timings),
+        'p95_seconds': timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        'model_rss_mb': loaded - before,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+
+def measure(backend, args):
+    """Run one backend in a fresh interpreter so its memory is measured in isolation."""
+    command = [
+        sys.executable, '-m', 'benchmarks.bench_onnx', '--worker', backend,
+        '--docs', str(args.docs), '--top-n', str(args.top_n)
+    ]
+    if args.corpus:
+        command += ['--corpus', args.corpus]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def parity(reference, candidate):
+    """Mean top-n overlap and share of documents with the same first keyword."""
+    overlaps, firsts = [], []
+    for expected, actual in zip(reference, candidate):
+        if not expected:
+            continue
+        overlaps.append(len(set(expected) & set(actual)) / len(expected))
+        firsts.append(bool(actual) and actual[0] == expected[0])
+    if not overlaps:
+        return 1.0, 1.0
+    return statistics.mean(overlaps), sum(firsts) / len(firsts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--corpus', help='Directory of .txt or .html documents')
+    parser.add_argument('--docs', type=int, default=32, help='Documents per backend')
+    parser.add_argument('--top-n', type=int, default=15, help='Keywords per document')
+    parser.add_argument('--min-overlap', type=float, default=0.8, help='Required mean top-n overlap')
+    parser.add_argument('--worker', choices=('torch', 'onnx'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_backend(args.worker, args)))
+        return
+
+    torch_result = measure('torch', args)
+    onnx_result = measure('onnx', args)
+    overlap, first = parity(torch_result['keywords'], onnx_result['keywords'])
+
+    print(f"documents:            {args.docs} (top {args.top_n} keywords)")
+    print(f"parity:               {overlap:.1%} top-n overlap, {first:.1%} same first keyword")
+    for name in ('load_seconds', 'median_seconds', 'p95_seconds', 'model_rss_mb', 'peak_rss_mb'):
+        before, after = torch_result[name], onnx_result[name]
+        print(f"{name + ':':<22}{before:>9.3f} torch {after:>9.3f} onnx")
+
+    if overlap < args.min_overlap:
+        print(f"PARITY FAILED: overlap below {args.min_overlap:.0%}")
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+Text cleaner benchmark.
+Checks that TextCleaner.clean_text and the chunked TextCleaner.iter_clean produce
+byte-for-byte the same output as the previous multi-pass implementation, then
+reports cleaning throughput in MB/s on large documents for both, and the time to
+clean a large document down to MAX_CONTENT_LENGTH.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_text_cleaner [--corpus path/to/dir] [--size-mb 5] [--repeat 5]
+
+The corpus directory may hold extracted text (.txt) or saved pages (.html,
+extracted first). Without one, generated documents with URLs, emails, dot runs
+and non-ASCII text are used.
+"""
+import argparse
+import glob
+import os
+import random
+import re
+import statistics
+import string
+import time
+
+from config import Config
+from services.text_cleaner import TextCleaner
+
+
+def legacy_clean_text(text, max_length=None):
+    """clean_text as it was before the single-pass engine."""
+    if not text:
+        return ""
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\.{3,}', '...', text)
+    text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+    text = re.sub(r'\S+@\S+', '', text)
+    text = re.sub(r'[^\w\s.,!?;:\-\'"()&]', '', text)
+    text = text.replace('"', '"').replace('"', '"')
+    text = text.replace("'", "'").replace("'", "'")
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+    if max_length and len(text) > max_length:
+        text = text[:max_length]
+        last_space = text.rfind(' ')
+        if last_space > max_length * 0.9:
+            text = text[:last_space]
+        text += '...'
+    return text
+
+
+# Fragments that exercise every cleaning rule and their interactions
+FRAGMENTS = [
+    'plain words', 'Hello, world!', 'wait....', '.....', '..', 'end...start',
+    'https://example.com/path?q=1&utm_source=x', 'http://a.b/c(d)e', 'xhttp://a.b', 'http://',
+    'https://x.io/"quoted"', 'user@example.com', 'a@b', '@handle', 'trailing@', 'a@@b',
+    'a@http://b.com', 'mail:http://x.com@y', 'http://x.com...', '....http://x',
+    'été naïve café', '日本語の文', '— – “quotes” ‘s’',
+    'emoji \U0001F600 here', '#hashtag', '$100 & 50%', '<tag>', 'tab\there', 'nbsp space',
+    'line\nbreak', 'a b', '\x1c\x1d', '(parens)', "it's", 'semi;colon: dash-', '~`^|{}[]\\',
+    '١٢٣', 'x́y',
+]
+
+
+def generated_documents(count, seed=0):
+    """Random documents built from FRAGMENTS and filler text."""
+    rng = random.Random(seed)
+    filler = string.ascii_letters + string.digits + string.punctuation + ' \t\n é—'
+    documents = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 60)):
+            if rng.random() < 0.6:
+                parts.append(rng.choice(FRAGMENTS))
+            else:
+                parts.append(''.join(rng.choice(filler) for _ in range(rng.randint(1, 20))))
+            parts.append(rng.choice([' ', '', '\n', '  ', '\t']))
+        documents.append(''.join(parts))
+    return documents
+
+
+def corpus_documents(directory):
+    """Texts from .txt files and extracted .html pages in a directory."""
+    documents = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.txt'))):
+        with open(path, encoding='utf-8', errors='replace') as f:
+            documents.append(f.read())
+
+    html_paths = sorted(glob.glob(os.path.join(directory, '*.htm*')))
+    if html_paths:
+        from services.content_extractor import ContentExtractor
+        for path in html_paths:
+            with open(path, 'rb') as f:
+                try:
+                    documents.append(ContentExtractor._extract_from_html(f.read(), url=path)['text'])
+                except ValueError:
+                    continue
+    return documents
+
+
+def random_chunks(text, rng):
+    """Split text at random positions, including inside tokens and whitespace runs."""
+    chunks = []
+    position = 0
+    while position < len(text):
+        size = rng.randint(1, 64)
+        chunks.append(text[position:position + size])
+        position += size
+    return chunks
+
+
+def check_identical(documents):
+    """Compare the cleaners, with and without truncation; return the mismatch count."""
+    rng = random.Random(1)
+    mismatches = 0
+    for document in documents:
+        expected = legacy_clean_text(document)
+        results = [('clean_text', None, TextCleaner.clean_text(document), expected)]
+        results.append(('iter_clean', None, ''.join(TextCleaner.iter_clean(random_chunks(document, rng))), expected))
+        for max_length in (20, 200, 50000):
+            results.append((
+                'clean_text', max_length,
+                TextCleaner.clean_text(document, max_length),
+                legacy_clean_text(document, max_length)
+            ))
+
+        for name, max_length, actual, wanted in results:
+            if actual != wanted:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"MISMATCH {name} (max_length={max_length}): {document[:120]!r}")
+    return mismatches
+
+
+def median_seconds(func, repeat, *args):
+    """Return the median wall time of func(*args) in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def throughput(func, text, repeat):
+    """Return the median throughput of func(text) in MB/s."""
+    size_mb = len(text.encode('utf-8')) / (1024 * 1024)
+    return size_mb / median_seconds(func, repeat, text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--corpus', help='Directory of .txt or .html documents')
+    parser.add_argument('--size-mb', type=float, default=5, help='Size of the large benchmark document')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per cleaner')
+    args = parser.parse_args()
+
+    documents = generated_documents(2000)
+    if args.corpus:
+        documents = corpus_documents(args.corpus) + documents
+
+    mismatches = check_identical(documents)
+    print(f"regression corpus:    {len(documents)} documents, {mismatches} mismatches")
+    if mismatches:
+        raise SystemExit(1)
+
+    # One large document built by repeating the corpus up to the requested size
+    joined = '\n'.join(documents)
+    target = int(args.size_mb * 1024 * 1024)
+    large = (joined * (target // max(len(joined.encode('utf-8')), 1) + 1))[:target]
+
+    before = throughput(legacy_clean_text, large, args.repeat)
+    after = throughput(TextCleaner.clean_text, large, args.repeat)
+    print(f"document size:        {len(large.encode('utf-8')) / (1024 * 1024):.1f} MB")
+    print(f"throughput before:    {before:.1f} MB/s")
+    print(f"throughput after:     {after:.1f} MB/s ({after / before:.1f}x)")
+
+    max_length = Config.MAX_CONTENT_LENGTH
+    before = median_seconds(legacy_clean_text, args.repeat, large, max_length) * 1000
+    after = median_seconds(TextCleaner.clean_text, args.repeat, large, max_length) * 1000
+    print(f"clean to {max_length} chars: {before:.1f}ms -> {after:.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Topic rule matching benchmark.
+Compares TopicAnalyzer's single-pass, whole-word intent and category matching
+with the previous first-match substring checks: time per document at several
+lengths, and how often the two pick a different intent or category.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_topics [--corpus path/to/dir] [--repeat 20]
+"""
+import argparse
+
+from config import Config
+from benchmarks.bench_keywords import generated_documents
+from benchmarks.bench_text_cleaner import corpus_documents, median_seconds
+from services.topic_analyzer import TopicAnalyzer
+from services.text_cleaner import TextCleaner
+from services.tfidf_keywords import TfidfKeywordExtractor
+from utils.document import Document
+
+LEGACY_INTENTS = [
+    ('commercial', ['buy', 'purchase', 'price', 'cost', 'deal', 'discount', 'sale']),
+    ('educational', ['learn', 'tutorial', 'guide', 'how to', 'course', 'training']),
+    ('review', ['review', 'comparison', 'vs', 'versus', 'best', 'top']),
+]
+
+LEGACY_CATEGORIES = [
+    ('technology', ['software', 'technology', 'programming', 'code', 'app', 'digital', 'web', 'api']),
+    ('business', ['business', 'marketing', 'sales', 'strategy', 'management', 'enterprise']),
+    ('health', ['health', 'medical', 'wellness', 'fitness', 'nutrition', 'healthcare']),
+    ('education', ['education', 'learning', 'course', 'training', 'teaching', 'student']),
+    ('finance', ['finance', 'money', 'investment', 'banking', 'insurance', 'credit']),
+]
+
+
+def legacy_intent(document):
+    """_determine_intent as it was: the first intent with any substring match."""
+    text_lower = document.lower
+    for intent, words in LEGACY_INTENTS:
+        if any(word in text_lower for word in words):
+            return intent
+    return 'informational'
+
+
+def legacy_category(keywords):
+    """_categorize_content as it was: the first category with any substring match."""
+    keywords_text = ' '.join(keywords).lower()
+    for category, terms in LEGACY_CATEGORIES:
+        if any(term in keywords_text for term in terms):
+            return category
+    return 'general'
+
+
+def current_intent(document):
+    """Current single-pass intent matching."""
+    return TopicAnalyzer._determine_intent(document, [])[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--corpus', help='Directory of .txt or .html documents')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs per length')
+    args = parser.parse_args()
+
+    documents = corpus_documents(args.corpus) if args.corpus else []
+    documents = [TextCleaner.clean_text(document) for document in documents] or generated_documents(50)
+
+    # Each run gets a fresh Document, so lowercasing is timed as the pipeline pays it
+    joined = ' '.join(documents)
+    for length in (2000, 10000, Config.MAX_CONTENT_LENGTH):
+        text = (joined * (length // max(len(joined), 1) + 1))[:length]
+        before = median_seconds(lambda: legacy_intent(Document(text)), args.repeat) * 1000
+        after = median_seconds(lambda: current_intent(Document(text)), args.repeat) * 1000
+        print(f"{length:>6} chars intent: {before:6.2f}ms -> {after:6.2f}ms")
+
+    intent_changes = category_changes = 0
+    for text in documents:
+        document = Document(text)
+        keywords = [keyword for keyword, _ in TfidfKeywordExtractor.extract_keywords(text, top_n=15)]
+        intent_changes += legacy_intent(document) != current_intent(document)
+        category_changes += legacy_category(keywords) != TopicAnalyzer._categorize_content(keywords)[0]
+    print(f"documents:              {len(documents)}")
+    print(f"intent changed:         {intent_changes}")
+    print(f"category changed:       {category_changes}")
+
+
+if __name__ == '__main__':
+    main()
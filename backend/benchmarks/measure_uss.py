@@ -0,0 +1,85 @@
+"""
+Per-worker memory of a pre-forking server.
+Reads /proc/<pid>/smaps_rollup for a gunicorn master and its workers and
+reports USS (unique set size: memory only that process holds, what a worker
+really costs), PSS and RSS. Compare runs with PRELOAD_MODELS=True and False,
+after each worker has served a keyword request so lazily loaded models count.
+
+Usage (Linux):
+    python -m benchmarks.measure_uss --pid <gunicorn master pid>
+    python -m benchmarks.measure_uss --pid <pid> --warmup-url http://localhost:5000/api/blog/preview \
+        --token <JWT> --requests 8
+"""
+import argparse
+import json
+import os
+import urllib.request
+
+FIELDS = ('Rss', 'Pss', 'Private_Clean', 'Private_Dirty', 'Shared_Clean', 'Shared_Dirty')
+
+
+def children(pid):
+    """Child process ids of a process."""
+    pids = []
+    for task in os.listdir(f'/proc/{pid}/task'):
+        with open(f'/proc/{pid}/task/{task}/children') as f:
+            pids.extend(int(child) for child in f.read().split())
+    return pids
+
+
+def memory(pid):
+    """Memory figures of a process in MB, from smaps_rollup."""
+    values = dict.fromkeys(FIELDS, 0.0)
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            name, _, rest = line.partition(':')
+            if name in values:
+                values[name] = int(rest.split()[0]) / 1024
+    values['Uss'] = values['Private_Clean'] + values['Private_Dirty']
+    return values
+
+
+def warm_up(url, token, count, body):
+    """Send requests so every worker loads what it loads lazily."""
+    for _ in range(count):
+        request = urllib.request.Request(
+            url, data=json.dumps(body).encode('utf-8'), method='POST',
+            headers={'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'}
+        )
+        try:
+            urllib.request.urlopen(request, timeout=120).read()
+        except OSError as e:
+            print(f"warm-up request failed: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pid', type=int, required=True, help='Gunicorn master process id')
+    parser.add_argument('--warmup-url', help='Endpoint to POST to before measuring (e.g. /api/blog/preview)')
+    parser.add_argument('--token', default='', help='JWT for the warm-up requests')
+    parser.add_argument('--page', default='https://example.com', help='Page URL sent in warm-up requests')
+    parser.add_argument('--requests', type=int, default=8, help='Warm-up requests (at least the worker count)')
+    args = parser.parse_args()
+
+    if args.warmup_url:
+        warm_up(args.warmup_url, args.token, args.requests, {'url': args.page})
+
+    print(f"{'process':<16}{'USS MB':>10}{'PSS MB':>10}{'RSS MB':>10}{'shared MB':>11}")
+    master = memory(args.pid)
+    print(f"{'master ' + str(args.pid):<16}{master['Uss']:>10.1f}{master['Pss']:>10.1f}{master['Rss']:>10.1f}"
+          f"{master['Shared_Clean'] + master['Shared_Dirty']:>11.1f}")
+
+    workers = [(pid, memory(pid)) for pid in children(args.pid)]
+    for pid, values in workers:
+        print(f"{'worker ' + str(pid):<16}{values['Uss']:>10.1f}{values['Pss']:>10.1f}{values['Rss']:>10.1f}"
+              f"{values['Shared_Clean'] + values['Shared_Dirty']:>11.1f}")
+
+    if workers:
+        uss = [values['Uss'] for _, values in workers]
+        total_pss = master['Pss'] + sum(values['Pss'] for _, values in workers)
+        print(f"workers: {len(workers)}, mean USS {sum(uss) / len(uss):.1f} MB, "
+              f"total PSS (master + workers) {total_pss:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -31,14 +31,93 @@ class Config:
     GEMINI_MODEL = 'gemini-2.5-flash'  # Fast and cost-effective model
     
     # Content Extraction Configuration
-    REQUEST_TIMEOUT = 10  # seconds
+    REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', 10))  # seconds per connect/read
+    FETCH_DEADLINE = int(os.getenv('FETCH_DEADLINE', 20))  # seconds for a whole page download
+    MAX_PAGE_BYTES = int(os.getenv('MAX_PAGE_BYTES', 2 * 1024 * 1024))  # raw page bytes read
     MAX_CONTENT_LENGTH = 50000  # characters
     
+    # Outbound HTTP Configuration (per worker process)
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 20))  # hosts with kept-alive pools
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 10))  # kept-alive connections per host
+    HTTP_PER_HOST_LIMIT = int(os.getenv('HTTP_PER_HOST_LIMIT', 4))  # concurrent requests per host
+    HTTP_HOST_SLOT_TIMEOUT = int(os.getenv('HTTP_HOST_SLOT_TIMEOUT', 30))  # seconds to wait for a slot
+    DNS_CACHE_TTL = int(os.getenv('DNS_CACHE_TTL', 300))  # seconds
+    
+    # Page Cache Configuration
+    PAGE_CACHE_ENABLED = os.getenv('PAGE_CACHE_ENABLED', 'True') == 'True'
+    PAGE_CACHE_DIR = os.getenv('PAGE_CACHE_DIR', os.path.join('instance', 'page_cache'))
+    PAGE_CACHE_MAX_BYTES = int(os.getenv('PAGE_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+    PAGE_CACHE_TTL = int(os.getenv('PAGE_CACHE_TTL', 3600))  # seconds before revalidation
+    
+    # Extraction Cache Configuration
+    EXTRACTION_CACHE_SIZE = int(os.getenv('EXTRACTION_CACHE_SIZE', 256))  # in-process entries, 0 disables
+    EXTRACTION_CACHE_DIR = os.getenv('EXTRACTION_CACHE_DIR', '')  # shared on-disk tier, empty disables
+    EXTRACTION_CACHE_DISK_ENTRIES = int(os.getenv('EXTRACTION_CACHE_DISK_ENTRIES', 10000))
+    
+    # Embedding Cache Configuration
+    EMBEDDING_CACHE_SIZE = int(os.getenv('EMBEDDING_CACHE_SIZE', 10000))  # in-process vectors, 0 disables
+    EMBEDDING_CACHE_MAX_BYTES = int(os.getenv('EMBEDDING_CACHE_MAX_BYTES', 16 * 1024 * 1024))  # 16MB per worker
+    EMBEDDING_CACHE_DIR = os.getenv('EMBEDDING_CACHE_DIR', '')  # shared float16 memmap tier, empty disables
+    EMBEDDING_CACHE_DISK_ENTRIES = int(os.getenv('EMBEDDING_CACHE_DISK_ENTRIES', 200000))  # vectors per model
+    
+    # Keyword Cache Configuration
+    KEYWORD_CACHE_SIZE = int(os.getenv('KEYWORD_CACHE_SIZE', 1024))  # in-process keyword lists, 0 disables
+    KEYWORD_CACHE_MAX_BYTES = int(os.getenv('KEYWORD_CACHE_MAX_BYTES', 8 * 1024 * 1024))  # 8MB per worker
+    KEYWORD_CACHE_DEPTH = int(os.getenv('KEYWORD_CACHE_DEPTH', 20))  # keywords extracted and kept per text
+    
+    # Keyword Extraction Configuration
+    KEYWORD_BATCH_SIZE = int(os.getenv('KEYWORD_BATCH_SIZE', 16))  # texts per KeyBERT call in batch extraction
+    EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', 128))  # sentences per model forward pass
+    KEYWORD_WINDOW_CHARS = int(os.getenv('KEYWORD_WINDOW_CHARS', 500))  # document embedding window, 0 embeds whole
+    KEYWORD_MAX_CANDIDATES = int(os.getenv('KEYWORD_MAX_CANDIDATES', 500))  # phrases embedded per page, 0 for all
+    PREVIEW_KEYWORD_CANDIDATES = int(os.getenv('PREVIEW_KEYWORD_CANDIDATES', KEYWORD_MAX_CANDIDATES))  # same, /preview
+    KEYWORD_POOL_ADDRESS = os.getenv('KEYWORD_POOL_ADDRESS', '')  # socket path or host:port, empty disables
+    KEYWORD_POOL_WORKERS = int(os.getenv('KEYWORD_POOL_WORKERS', 2))  # model-holding processes
+    KEYWORD_POOL_QUEUE_SIZE = int(os.getenv('KEYWORD_POOL_QUEUE_SIZE', 8))  # waiting requests before refusing
+    KEYWORD_POOL_TIMEOUT = float(os.getenv('KEYWORD_POOL_TIMEOUT', 20))  # seconds per request
+    KEYWORD_POOL_AUTHKEY = os.getenv('KEYWORD_POOL_AUTHKEY', '')  # shared secret, required to use the pool
+    KEYWORD_POOL_ALLOW_REMOTE = os.getenv('KEYWORD_POOL_ALLOW_REMOTE', 'false').lower() in ('1', 'true', 'yes')
+    
+    # Fallback Keyword Extraction Configuration
+    IDF_DIR = os.getenv('IDF_DIR', os.path.join('instance', 'idf'))  # memory-mapped document frequencies
+    IDF_BUCKETS = int(os.getenv('IDF_BUCKETS', 1 << 20))  # hash buckets (power of two), 4 bytes each
+    IDF_REFRESH_SECONDS = int(os.getenv('IDF_REFRESH_SECONDS', 3600))  # learn from new blogs, 0 disables
+    
+    # Content Classification Configuration
+    CATEGORY_CENTROIDS_PATH = os.getenv('CATEGORY_CENTROIDS_PATH', os.path.join('instance', 'category_centroids.npz'))
+    CATEGORY_MIN_SCORE = float(os.getenv('CATEGORY_MIN_SCORE', 0.25))  # below it, keyword rules decide
+    CATEGORY_TOP_K = int(os.getenv('CATEGORY_TOP_K', 3))  # ranked categories reported
+    
+    # Language Detection Configuration
+    LANGUAGE_SAMPLE_CHARS = int(os.getenv('LANGUAGE_SAMPLE_CHARS', 2000))  # leading characters inspected
+    LANGUAGE_MIN_CONFIDENCE = float(os.getenv('LANGUAGE_MIN_CONFIDENCE', 0.2))  # below this, assume English
+    
     # Blog Generation Configuration
     MIN_BLOG_LENGTH = 500  # words
     MAX_BLOG_LENGTH = 3000  # words
     DEFAULT_BLOG_LENGTH = 1000  # words
     
+    # Blog Reuse Configuration
+    SIMHASH_MAX_DISTANCE = int(os.getenv('SIMHASH_MAX_DISTANCE', 6))  # bits; 7 at most
+    
+    # Site Crawl Configuration
+    CRAWL_MAX_PAGES = int(os.getenv('CRAWL_MAX_PAGES', 20))  # page budget per crawl
+    CRAWL_MAX_DEPTH = int(os.getenv('CRAWL_MAX_DEPTH', 2))  # link depth followed from the seeds
+    CRAWL_WORKERS = int(os.getenv('CRAWL_WORKERS', 4))  # concurrent page fetches per crawl
+    CRAWL_MAX_SITEMAPS = int(os.getenv('CRAWL_MAX_SITEMAPS', 5))  # sitemap files read per crawl
+    DEDUP_PAGE_THRESHOLD = float(os.getenv('DEDUP_PAGE_THRESHOLD', 0.8))  # near-duplicate page similarity
+    DEDUP_NUM_PERM = int(os.getenv('DEDUP_NUM_PERM', 64))  # MinHash permutations per page
+    DEDUP_SHINGLE_SIZE = int(os.getenv('DEDUP_SHINGLE_SIZE', 5))  # words per shingle
+    
+    # Batch Generation Configuration
+    BATCH_MAX_URLS = int(os.getenv('BATCH_MAX_URLS', 25))
+    BATCH_FETCH_WORKERS = int(os.getenv('BATCH_FETCH_WORKERS', 8))  # concurrent page fetches
+    BATCH_LLM_CONCURRENCY = int(os.getenv('BATCH_LLM_CONCURRENCY', 3))  # concurrent Gemini calls
+    
+    # Pre-fork Server Configuration
+    PRELOAD_MODELS = os.getenv('PRELOAD_MODELS', 'False') == 'True'  # load models before workers fork
+    PRELOAD_LANGUAGES = [language.strip() for language in os.getenv('PRELOAD_LANGUAGES', 'en').split(',') if language.strip()]
+    
     # Server Configuration
    # HOST = os.getenv('HOST', '0.0.0.0')
     #PORT = int(os.getenv('PORT', 5000))
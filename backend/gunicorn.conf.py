@@ -0,0 +1,22 @@
+"""
+Gunicorn configuration.
+PRELOAD_MODELS=True imports wsgi:app (and preloads models) in the master before
+forking, so workers share the model weights instead of loading one copy each.
+"""
+import os
+from config import Config
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+preload_app = Config.PRELOAD_MODELS
+
+
+def post_fork(server, worker):
+    """Give each worker its own database client and HTTP session instead of the master's."""
+    from utils.db import reconnect
+    from utils.http_client import close_session
+
+    reconnect()
+    close_session()
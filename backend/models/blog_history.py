@@ -5,6 +5,7 @@ Handles storage and retrieval of generated blogs.
 from datetime import datetime
 from bson import ObjectId
 from utils.db import get_db
+from utils.simhash import MAX_INDEXED_DISTANCE, band_keys, hamming_distance
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -16,7 +17,7 @@ class BlogHistory:
     collection_name = 'blog_history'
     
     @staticmethod
-    def create_blog_entry(user_id, website_url, keywords, generated_blog, blog_config):
+    def create_blog_entry(user_id, website_url, keywords, generated_blog, blog_config, simhash=None):
         """
         Create a new blog history entry.
         
@@ -26,6 +27,7 @@ class BlogHistory:
             keywords (list): Extracted keywords
             generated_blog (str): Generated blog content
             blog_config (dict): Blog generation configuration (length, tone, etc.)
+            simhash (int, optional): SimHash fingerprint of the cleaned source text
             
         Returns:
             dict: Created blog history document
@@ -40,6 +42,7 @@ class BlogHistory:
             'blog_config': blog_config,
             'created_at': datetime.utcnow()
         }
+        blog_doc.update(BlogHistory._fingerprint_fields(simhash))
         
         result = db[BlogHistory.collection_name].insert_one(blog_doc)
         blog_doc['_id'] = result.inserted_id
@@ -47,6 +50,98 @@ class BlogHistory:
         logger.info(f"Blog history entry created for user: {user_id}")
         return blog_doc
     
+    @staticmethod
+    def create_blog_entries(user_id, entries):
+        """
+        Create several blog history entries with a single bulk insert.
+        
+        Args:
+            user_id (str): User's ID
+            entries (list): Dicts with 'website_url', 'keywords',
+                'generated_blog' and 'blog_config' keys, and optionally 'simhash'
+            
+        Returns:
+            list: Created blog history documents, in input order
+        """
+        if not entries:
+            return []
+        
+        db = get_db()
+        now = datetime.utcnow()
+        
+        blog_docs = [
+            {
+                'user_id': ObjectId(user_id),
+                'website_url': entry['website_url'],
+                'keywords': entry['keywords'],
+                'generated_blog': entry['generated_blog'],
+                'blog_config': entry['blog_config'],
+                'created_at': now,
+                **BlogHistory._fingerprint_fields(entry.get('simhash'))
+            }
+            for entry in entries
+        ]
+        
+        result = db[BlogHistory.collection_name].insert_many(blog_docs)
+        for blog_doc, inserted_id in zip(blog_docs, result.inserted_ids):
+            blog_doc['_id'] = inserted_id
+        
+        logger.info(f"{len(blog_docs)} blog history entries created for user: {user_id}")
+        return blog_docs
+    
+    @staticmethod
+    def find_similar_blog(user_id, simhash, blog_config, max_distance):
+        """
+        Find the user's closest blog generated from a near-identical source.
+        
+        Candidates share at least one fingerprint band with the query (an
+        indexed lookup) and the same blog configuration; the exact Hamming
+        distance is then checked for each candidate.
+        
+        Args:
+            user_id (str): User's ID
+            simhash (int): SimHash fingerprint of the cleaned source text
+            blog_config (dict): Blog generation configuration to match exactly
+            max_distance (int): Largest accepted Hamming distance
+                (at most utils.simhash.MAX_INDEXED_DISTANCE)
+            
+        Returns:
+            tuple: (dict or None: blog history document, int or None: distance)
+        """
+        db = get_db()
+        max_distance = min(max_distance, MAX_INDEXED_DISTANCE)
+        
+        query = {
+            'user_id': ObjectId(user_id),
+            'simhash_bands': {'$in': band_keys(simhash)}
+        }
+        for key, value in blog_config.items():
+            query[f'blog_config.{key}'] = value
+        
+        candidates = db[BlogHistory.collection_name].find(
+            query,
+            {'simhash': 1}
+        ).sort('created_at', -1).limit(100)
+        
+        best_id, best_distance = None, None
+        for candidate in candidates:
+            distance = hamming_distance(simhash, candidate['simhash'])
+            if distance <= max_distance and (best_distance is None or distance < best_distance):
+                best_id, best_distance = candidate['_id'], distance
+        
+        if best_id is None:
+            return None, None
+        
+        blog_doc = db[BlogHistory.collection_name].find_one({'_id': best_id})
+        return blog_doc, best_distance
+    
+    @staticmethod
+    def _fingerprint_fields(simhash):
+        """Document fields storing a source fingerprint and its index bands."""
+        if simhash is None:
+            return {}
+        return {'simhash': simhash, 'simhash_bands': band_keys(simhash)}
+    
     @staticmethod
     def get_user_history(user_id, limit=10, skip=0):
         """
@@ -5,15 +5,22 @@ Main API endpoints for blog generation and history management.
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
+from config import Config
 from models.blog_history import BlogHistory
 from services.url_validator import URLValidator
+from services.page_fetcher import PageFetcher
 from services.content_extractor import ContentExtractor
 from services.text_cleaner import TextCleaner
 from services.keyword_extractor import KeywordExtractor
+from services.language_detector import LanguageDetector
 from services.topic_analyzer import TopicAnalyzer
 from services.prompt_builder import PromptBuilder
 from services.blog_generator import BlogGenerator
 from services.seo_postprocessor import SEOPostProcessor
+from services.batch_generator import BatchGenerator
+from services.site_crawler import SiteCrawler
+from utils.document import Document
+from utils.simhash import simhash
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -21,6 +28,187 @@ logger = setup_logger(__name__)
 blog_bp = Blueprint('blog', __name__)
 
 
+def _is_int_between(value, low, high):
+    """True if value is an integer (not a bool) from low to high inclusive."""
+    return isinstance(value, int) and not isinstance(value, bool) and low <= value <= high
+
+
+def _parse_blog_config(data):
+    """
+    Read and validate the blog configuration fields of a request body.
+    
+    Args:
+        data (dict): Request body
+        
+    Returns:
+        tuple: (dict or None: blog_config, tuple or None: error response)
+    """
+    blog_length = data.get('length', 1000)
+    tone = data.get('tone', 'professional')
+    include_cta = data.get('include_cta', True)
+    
+    # Validate blog length
+    if blog_length < 500 or blog_length > 3000:
+        return None, (jsonify({
+            'error': 'Invalid length',
+            'message': 'Blog length must be between 500 and 3000 words'
+        }), 400)
+    
+    # Validate tone
+    valid_tones = ['professional', 'casual', 'technical', 'persuasive', 'educational']
+    if tone not in valid_tones:
+        return None, (jsonify({
+            'error': 'Invalid tone',
+            'message': f'Tone must be one of: {", ".join(valid_tones)}'
+        }), 400)
+    
+    return {
+        'length': blog_length,
+        'tone': tone,
+        'include_cta': include_cta
+    }, None
+
+
+def _generate_from_content(user_id, url, website_data, cleaned_text, blog_config, extra_fields=None,
+                           fingerprint=None, language=None):
+    """
+    Run the generation pipeline from keyword extraction to saving (Steps 4-9).
+    
+    Args:
+        user_id (str): User's ID
+        url (str): Source URL stored with the blog
+        website_data (dict): Extracted website content
+        cleaned_text (str): Cleaned source text
+        blog_config (dict): Validated blog configuration
+        extra_fields (dict, optional): Additional fields for the 'blog' response
+        fingerprint (int, optional): SimHash of cleaned_text, stored with the blog
+        language (dict, optional): LanguageDetector.detect result for cleaned_text;
+            detected when not given
+        
+    Returns:
+        tuple: Flask JSON response and status code
+    """
+    # Step 4a: Detect language (routes keyword extraction to a model and stop words)
+    if language is None:
+        logger.info("Step 4a: Detecting language...")
+        language = LanguageDetector.detect(cleaned_text)
+    
+    # Step 4b: Extract keywords using NLP
+    logger.info("Step 4b: Extracting keywords with NLP...")
+    keywords = KeywordExtractor.extract_keywords_list(
+        cleaned_text,
+        top_n=15,
+        use_ngrams=True,
+        language=language['language']
+    )
+    
+    if not keywords:
+        return jsonify({
+            'error': 'Keyword extraction failed',
+            'message': 'Could not extract meaningful keywords from content'
+        }), 400
+    
+    # Step 5: Analyze topics and intent
+    logger.info("Step 5: Analyzing topics and intent...")
+    topic_analysis = TopicAnalyzer.analyze_topics(Document(cleaned_text), keywords, language['language'])
+    
+    # Step 6: Build optimized prompt
+    logger.info("Step 6: Building optimized prompt...")
+    prompt = PromptBuilder.build_blog_prompt(
+        website_data,
+        keywords,
+        topic_analysis,
+        blog_config
+    )
+    
+    # Step 7: Generate blog using LLM
+    logger.info("Step 7: Generating blog with LLM...")
+    try:
+        generated_blog = BlogGenerator.generate_with_retry(prompt)
+    except Exception as e:
+        return jsonify({
+            'error': 'Blog generation failed',
+            'message': str(e)
+        }), 500
+    
+    # Step 8: Apply SEO post-processing
+    logger.info("Step 8: Applying SEO optimizations...")
+    processed_blog = SEOPostProcessor.process_blog(generated_blog, keywords)
+    
+    # Step 9: Save to database
+    logger.info("Step 9: Saving to database...")
+    blog_entry = BlogHistory.create_blog_entry(
+        user_id=user_id,
+        website_url=url,
+        keywords=keywords,
+        generated_blog=processed_blog['content'],
+        blog_config=blog_config,
+        simhash=fingerprint
+    )
+    
+    logger.info(f"Blog generation complete! ID: {blog_entry['_id']}")
+    
+    # Return response
+    return jsonify({
+        'message': 'Blog generated successfully',
+        'blog': {
+            'id': str(blog_entry['_id']),
+            'content': processed_blog['content'],
+            'title': processed_blog['title'],
+            'meta_description': processed_blog['meta_description'],
+            'keywords': keywords,
+            'word_count': processed_blog['word_count'],
+            'reading_time': processed_blog['reading_time'],
+            'website_url': url,
+            'topic_analysis': topic_analysis,
+            'language': language,
+            **(extra_fields or {})
+        }
+    }), 200
+
+
+def _reuse_blog(url, blog_doc, cleaned_text, distance, language):
+    """
+    Build a generate response from a blog saved for a near-identical source.
+    
+    The stored blog and keywords are returned as they are; only the cheap
+    analysis and post-processing steps run again, so no LLM call is made.
+    
+    Args:
+        url (str): Requested URL
+        blog_doc (dict): Blog history document to reuse
+        cleaned_text (str): Cleaned text of the requested page
+        distance (int): Hamming distance between the source fingerprints
+        language (dict): LanguageDetector.detect result for cleaned_text
+        
+    Returns:
+        tuple: Flask JSON response and status code
+    """
+    keywords = blog_doc['keywords']
+    topic_analysis = TopicAnalyzer.analyze_topics(Document(cleaned_text), keywords, language['language'])
+    processed_blog = SEOPostProcessor.process_blog(blog_doc['generated_blog'], keywords)
+    
+    logger.info(f"Reusing blog {blog_doc['_id']} for {url} (fingerprint distance {distance})")
+    
+    return jsonify({
+        'message': 'Blog reused from a near-identical source',
+        'blog': {
+            'id': str(blog_doc['_id']),
+            'content': processed_blog['content'],
+            'title': processed_blog['title'],
+            'meta_description': processed_blog['meta_description'],
+            'keywords': keywords,
+            'word_count': processed_blog['word_count'],
+            'reading_time': processed_blog['reading_time'],
+            'website_url': url,
+            'topic_analysis': topic_analysis,
+            'language': language,
+            'reused': True,
+            'source_distance': distance
+        }
+    }), 200
+
+
 @blog_bp.route('/generate', methods=['POST'])
 @jwt_required()
 def generate_blog():
@@ -32,7 +220,8 @@ def generate_blog():
             "url": "https://example.com",
             "length": 1000,  # Optional, default 1000
             "tone": "professional",  # Optional, default "professional"
-            "include_cta": true  # Optional, default true
+            "include_cta": true,  # Optional, default true
+            "reuse": false  # Optional, return an earlier blog for a near-identical page
         }
     
     Returns:
@@ -50,40 +239,27 @@ def generate_blog():
             }), 400
         
         url = data['url'].strip()
-        blog_length = data.get('length', 1000)
-        tone = data.get('tone', 'professional')
-        include_cta = data.get('include_cta', True)
         
-        # Validate blog length
-        if blog_length < 500 or blog_length > 3000:
-            return jsonify({
-                'error': 'Invalid length',
-                'message': 'Blog length must be between 500 and 3000 words'
-            }), 400
-        
-        # Validate tone
-        valid_tones = ['professional', 'casual', 'technical', 'persuasive', 'educational']
-        if tone not in valid_tones:
-            return jsonify({
-                'error': 'Invalid tone',
-                'message': f'Tone must be one of: {", ".join(valid_tones)}'
-            }), 400
+        # Validate blog length and tone
+        blog_config, error_response = _parse_blog_config(data)
+        if error_response:
+            return error_response
         
         logger.info(f"Starting blog generation for URL: {url}")
         
-        # Step 1: Validate URL
-        logger.info("Step 1: Validating URL...")
-        is_valid, validation_message = URLValidator.validate(url)
+        # Step 1: Validate URL and fetch the page in one request
+        logger.info("Step 1: Validating and fetching URL...")
+        is_valid, validation_message, page = PageFetcher.acquire(url)
         if not is_valid:
             return jsonify({
                 'error': 'Invalid URL',
                 'message': validation_message
             }), 400
         
-        # Step 2: Extract content from URL
+        # Step 2: Extract content from the fetched page
         logger.info("Step 2: Extracting content from URL...")
         try:
-            website_data = ContentExtractor.extract_content(url)
+            website_data = ContentExtractor.extract_content(url, page=page)
         except Exception as e:
             return jsonify({
                 'error': 'Content extraction failed',
@@ -94,7 +270,7 @@ def generate_blog():
         logger.info("Step 3: Cleaning extracted text...")
         cleaned_text = TextCleaner.clean_text(
             website_data['text'],
-            max_length=50000  # Limit for processing
+            max_length=Config.MAX_CONTENT_LENGTH  # Limit for processing
         )
         
         if len(cleaned_text) < 100:
@@ -103,85 +279,172 @@ def generate_blog():
                 'message': 'The webpage does not contain enough meaningful content'
             }), 400
         
-        # Step 4: Extract keywords using NLP
-        logger.info("Step 4: Extracting keywords with NLP...")
-        keywords = KeywordExtractor.extract_keywords_list(
-            cleaned_text,
-            top_n=15,
-            use_ngrams=True
-        )
+        # Step 4a: Detect language (shared by the reuse check and the full pipeline)
+        logger.info("Step 4a: Detecting language...")
+        language = LanguageDetector.detect(cleaned_text)
+        
+        # Reuse a blog generated earlier for a near-identical page and the same settings
+        fingerprint = simhash(cleaned_text)
+        if data.get('reuse', False) and fingerprint is not None:
+            blog_doc, distance = BlogHistory.find_similar_blog(
+                user_id,
+                fingerprint,
+                blog_config,
+                Config.SIMHASH_MAX_DISTANCE
+            )
+            if blog_doc:
+                return _reuse_blog(url, blog_doc, cleaned_text, distance, language)
+        
+        return _generate_from_content(user_id, url, website_data, cleaned_text, blog_config,
+                                      fingerprint=fingerprint, language=language)
         
-        if not keywords:
+    except Exception as e:
+        logger.error(f"Unexpected error in blog generation: {str(e)}")
+        return jsonify({
+            'error': 'Server error',
+            'message': 'An unexpected error occurred during blog generation'
+        }), 500
+
+
+@blog_bp.route('/generate/site', methods=['POST'])
+@jwt_required()
+def generate_site_blog():
+    """
+    Generate a blog post from a whole website instead of a single page.
+    
+    Pages are discovered from robots.txt, sitemaps and same-site links, and
+    their deduplicated text is merged into one corpus for the pipeline.
+    
+    Request Body:
+        {
+            "url": "https://example.com",
+            "max_pages": 20,  # Optional, default CRAWL_MAX_PAGES
+            "max_depth": 2,  # Optional, default CRAWL_MAX_DEPTH
+            "length": 1000,  # Optional, default 1000
+            "tone": "professional",  # Optional, default "professional"
+            "include_cta": true  # Optional, default true
+        }
+    
+    Returns:
+        JSON response with generated blog content and the pages used
+    """
+    try:
+        user_id = get_jwt_identity()
+        data = request.get_json()
+        
+        # Validate input
+        if not data or 'url' not in data:
+            return jsonify({
+                'error': 'Missing required field',
+                'message': 'URL is required'
+            }), 400
+        
+        url = data['url'].strip()
+        if not URLValidator.is_valid_format(url):
             return jsonify({
-                'error': 'Keyword extraction failed',
-                'message': 'Could not extract meaningful keywords from content'
+                'error': 'Invalid URL',
+                'message': 'Invalid URL format'
             }), 400
         
-        # Step 5: Analyze topics and intent
-        logger.info("Step 5: Analyzing topics and intent...")
-        topic_analysis = TopicAnalyzer.analyze_topics(cleaned_text, keywords)
+        max_pages = data.get('max_pages', Config.CRAWL_MAX_PAGES)
+        max_depth = data.get('max_depth', Config.CRAWL_MAX_DEPTH)
+        if (not _is_int_between(max_pages, 1, Config.CRAWL_MAX_PAGES)
+                or not _is_int_between(max_depth, 0, Config.CRAWL_MAX_DEPTH)):
+            return jsonify({
+                'error': 'Invalid crawl limits',
+                'message': f'max_pages must be 1-{Config.CRAWL_MAX_PAGES} and max_depth 0-{Config.CRAWL_MAX_DEPTH}'
+            }), 400
         
-        # Step 6: Build optimized prompt
-        logger.info("Step 6: Building optimized prompt...")
-        blog_config = {
-            'length': blog_length,
-            'tone': tone,
-            'include_cta': include_cta
-        }
-        prompt = PromptBuilder.build_blog_prompt(
-            website_data,
-            keywords,
-            topic_analysis,
-            blog_config
-        )
+        blog_config, error_response = _parse_blog_config(data)
+        if error_response:
+            return error_response
         
-        # Step 7: Generate blog using LLM
-        logger.info("Step 7: Generating blog with LLM...")
-        try:
-            generated_blog = BlogGenerator.generate_with_retry(prompt)
-        except Exception as e:
+        # Steps 1-3: crawl the site and merge its cleaned page texts
+        logger.info(f"Crawling site for blog generation: {url}")
+        corpus = SiteCrawler.build_corpus(url, max_pages=max_pages, max_depth=max_depth)
+        
+        if len(corpus['text']) < 100:
             return jsonify({
-                'error': 'Blog generation failed',
-                'message': str(e)
-            }), 500
-        
-        # Step 8: Apply SEO post-processing
-        logger.info("Step 8: Applying SEO optimizations...")
-        processed_blog = SEOPostProcessor.process_blog(generated_blog, keywords)
-        
-        # Step 9: Save to database
-        logger.info("Step 9: Saving to database...")
-        blog_entry = BlogHistory.create_blog_entry(
-            user_id=user_id,
-            website_url=url,
-            keywords=keywords,
-            generated_blog=processed_blog['content'],
-            blog_config=blog_config
+                'error': 'Insufficient content',
+                'message': 'The website does not contain enough meaningful content'
+            }), 400
+        
+        return _generate_from_content(
+            user_id,
+            url,
+            corpus['website_data'],
+            corpus['text'],
+            blog_config,
+            extra_fields={'source_pages': corpus['pages'], 'dedup': corpus['dedup']},
+            fingerprint=simhash(corpus['text'])
         )
         
-        logger.info(f"Blog generation complete! ID: {blog_entry['_id']}")
+    except Exception as e:
+        logger.error(f"Unexpected error in site blog generation: {str(e)}")
+        return jsonify({
+            'error': 'Server error',
+            'message': 'An unexpected error occurred during site blog generation'
+        }), 500
+
+
+@blog_bp.route('/generate/batch', methods=['POST'])
+@jwt_required()
+def generate_blog_batch():
+    """
+    Generate one blog post per URL for a list of URLs.
+    
+    Request Body:
+        {
+            "urls": ["https://example.com/a", "https://example.com/b"],
+            "length": 1000,  # Optional, shared by all URLs
+            "tone": "professional",  # Optional, shared by all URLs
+            "include_cta": true  # Optional, shared by all URLs
+        }
+    
+    Returns:
+        JSON response with per-URL status, timings and generated blogs
+    """
+    try:
+        user_id = get_jwt_identity()
+        data = request.get_json()
+        
+        # Validate input
+        if not data or not isinstance(data.get('urls'), list) or not data['urls']:
+            return jsonify({
+                'error': 'Missing required field',
+                'message': 'A non-empty list of URLs is required'
+            }), 400
+        
+        if len(data['urls']) > Config.BATCH_MAX_URLS:
+            return jsonify({
+                'error': 'Too many URLs',
+                'message': f'A batch can contain at most {Config.BATCH_MAX_URLS} URLs'
+            }), 400
+        
+        urls = [str(url).strip() for url in data['urls']]
+        
+        blog_config, error_response = _parse_blog_config(data)
+        if error_response:
+            return error_response
+        
+        logger.info(f"Starting batch blog generation for {len(urls)} URLs")
+        results = BatchGenerator.generate(user_id, urls, blog_config)
+        succeeded = sum(1 for result in results if result['status'] == 'success')
+        
+        logger.info(f"Batch generation complete: {succeeded}/{len(results)} succeeded")
         
-        # Return response
         return jsonify({
-            'message': 'Blog generated successfully',
-            'blog': {
-                'id': str(blog_entry['_id']),
-                'content': processed_blog['content'],
-                'title': processed_blog['title'],
-                'meta_description': processed_blog['meta_description'],
-                'keywords': keywords,
-                'word_count': processed_blog['word_count'],
-                'reading_time': processed_blog['reading_time'],
-                'website_url': url,
-                'topic_analysis': topic_analysis
-            }
+            'message': 'Batch generation complete',
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
+            'results': results
         }), 200
         
     except Exception as e:
-        logger.error(f"Unexpected error in blog generation: {str(e)}")
+        logger.error(f"Unexpected error in batch blog generation: {str(e)}")
         return jsonify({
             'error': 'Server error',
-            'message': 'An unexpected error occurred during blog generation'
+            'message': 'An unexpected error occurred during batch generation'
         }), 500
 
 
@@ -295,8 +558,8 @@ def preview_content():
         
         url = data['url'].strip()
         
-        # Validate URL
-        is_valid, validation_message = URLValidator.validate(url)
+        # Validate URL and fetch the page in one request
+        is_valid, validation_message, page = PageFetcher.acquire(url)
         if not is_valid:
             return jsonify({
                 'error': 'Invalid URL',
@@ -304,16 +567,21 @@ def preview_content():
             }), 400
         
         # Extract content
-        website_data = ContentExtractor.extract_content(url)
+        website_data = ContentExtractor.extract_content(url, page=page)
         
         # Clean text
-        cleaned_text = TextCleaner.clean_text(website_data['text'], max_length=50000)
+        cleaned_text = TextCleaner.clean_text(website_data['text'], max_length=Config.MAX_CONTENT_LENGTH)
         
-        # Extract keywords
-        keywords = KeywordExtractor.extract_keywords_list(cleaned_text, top_n=10)
+        # Detect language and extract keywords (a larger generate budget's cache entry also serves preview)
+        language = LanguageDetector.detect(cleaned_text)
+        keywords = KeywordExtractor.extract_keywords_list(
+            cleaned_text, top_n=10, language=language['language'],
+            max_candidates=Config.PREVIEW_KEYWORD_CANDIDATES
+        )
         
         # Get summary
-        summary = ContentExtractor.get_summary(cleaned_text, max_length=300)
+        document = Document(cleaned_text)
+        summary = ContentExtractor.get_summary(document, max_length=300)
         
         return jsonify({
             'preview': {
@@ -321,7 +589,8 @@ def preview_content():
                 'description': website_data['description'],
                 'summary': summary,
                 'keywords': keywords,
-                'word_count': len(cleaned_text.split()),
+                'word_count': document.word_count,
+                'language': language,
                 'url': url
             }
         }), 200
@@ -0,0 +1,233 @@
+"""
+Batch blog generation service.
+Runs the blog generation pipeline for many URLs, overlapping network-bound stages.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from models.blog_history import BlogHistory
+from services.page_fetcher import PageFetcher
+from services.content_extractor import ContentExtractor
+from services.text_cleaner import TextCleaner
+from services.keyword_extractor import KeywordExtractor
+from services.language_detector import LanguageDetector
+from services.topic_analyzer import TopicAnalyzer
+from services.prompt_builder import PromptBuilder
+from services.blog_generator import BlogGenerator
+from services.seo_postprocessor import SEOPostProcessor
+from utils.document import Document
+from utils.simhash import simhash
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class BatchGenerator:
+    """Generates blogs for a list of URLs sharing one blog configuration."""
+
+    @staticmethod
+    def generate(user_id, urls, blog_config):
+        """
+        Generate one blog per URL.
+
+        Pages are fetched and extracted concurrently on a bounded pool,
+        keywords are extracted in one batched model call, LLM calls run under
+        a concurrency cap, and all blogs are saved with one bulk insert.
+
+        Args:
+            user_id (str): User's ID
+            urls (list): URLs to generate blogs from
+            blog_config (dict): Blog generation configuration shared by all URLs
+
+        Returns:
+            list: One result dict per URL, in input order
+                {
+                    'url': str,
+                    'status': 'success' or 'failed',
+                    'error': str,  # Only when failed
+                    'timings': dict,  # Seconds spent per stage
+                    'blog': dict  # Only when successful
+                }
+        """
+        jobs = [{'url': url, 'status': 'pending', 'timings': {}} for url in urls]
+
+        # Step 1-3: fetch, extract, clean and detect the language of every page concurrently
+        # (per-host politeness is enforced by the shared HTTP client)
+        BatchGenerator._run_concurrently(
+            BatchGenerator._acquire,
+            jobs,
+            Config.BATCH_FETCH_WORKERS
+        )
+
+        # Step 4: extract keywords for all pages in one batch (per language)
+        active = BatchGenerator._active(jobs)
+        if active:
+            started = time.perf_counter()
+            batch_keywords = KeywordExtractor.extract_keywords_batch(
+                [job['cleaned_text'] for job in active],
+                top_n=15,
+                use_ngrams=True,
+                languages=[job['language'] for job in active]
+            )
+            elapsed = (time.perf_counter() - started) / len(active)
+            for job, keywords in zip(active, batch_keywords):
+                job['timings']['keywords'] = round(elapsed, 3)
+                job['keywords'] = [keyword for keyword, score in keywords]
+                if not job['keywords']:
+                    BatchGenerator._fail(job, 'Could not extract meaningful keywords from content')
+
+        # Step 5-6: analyze topics and build prompts (cheap, sequential)
+        for job in BatchGenerator._active(jobs):
+            BatchGenerator._prepare(job, blog_config)
+
+        # Step 7-8: generate blogs under the LLM concurrency cap
+        BatchGenerator._run_concurrently(
+            BatchGenerator._generate,
+            BatchGenerator._active(jobs),
+            Config.BATCH_LLM_CONCURRENCY
+        )
+
+        # Step 9: save all generated blogs with a single bulk insert
+        active = BatchGenerator._active(jobs)
+        try:
+            blog_docs = BlogHistory.create_blog_entries(user_id, [
+                {
+                    'website_url': job['url'],
+                    'keywords': job['keywords'],
+                    'generated_blog': job['processed_blog']['content'],
+                    'blog_config': blog_config,
+                    'simhash': simhash(job['cleaned_text'])
+                }
+                for job in active
+            ])
+            for job, blog_doc in zip(active, blog_docs):
+                job['blog_id'] = str(blog_doc['_id'])
+                job['status'] = 'success'
+        except Exception as e:
+            logger.error(f"Bulk insert of batch results failed: {str(e)}")
+            for job in active:
+                BatchGenerator._fail(job, 'Failed to save generated blog')
+
+        return [BatchGenerator._to_result(job) for job in jobs]
+
+    @staticmethod
+    def _acquire(job):
+        """Fetch, extract and clean one page and detect its language (Steps 1-3)."""
+        started = time.perf_counter()
+        is_valid, message, page = PageFetcher.acquire(job['url'])
+        job['timings']['fetch'] = round(time.perf_counter() - started, 3)
+        if not is_valid:
+            return BatchGenerator._fail(job, message)
+
+        started = time.perf_counter()
+        try:
+            website_data = ContentExtractor.extract_content(job['url'], page=page)
+        except Exception as e:
+            return BatchGenerator._fail(job, str(e))
+        job['timings']['extract'] = round(time.perf_counter() - started, 3)
+
+        started = time.perf_counter()
+        cleaned_text = TextCleaner.clean_text(website_data['text'], max_length=Config.MAX_CONTENT_LENGTH)
+        job['timings']['clean'] = round(time.perf_counter() - started, 3)
+        if len(cleaned_text) < 100:
+            return BatchGenerator._fail(job, 'The webpage does not contain enough meaningful content')
+
+        language = LanguageDetector.detect(cleaned_text)
+        job['timings']['language'] = language['seconds']
+        
+        job['website_data'] = website_data
+        job['cleaned_text'] = cleaned_text
+        job['language'] = language['language']
+
+    @staticmethod
+    def _prepare(job, blog_config):
+        """Analyze topics and build the prompt for one page (Steps 5-6)."""
+        try:
+            job['topic_analysis'] = TopicAnalyzer.analyze_topics(
+                Document(job['cleaned_text']), job['keywords'], job['language']
+            )
+            job['prompt'] = PromptBuilder.build_blog_prompt(
+                job['website_data'],
+                job['keywords'],
+                job['topic_analysis'],
+                blog_config
+            )
+        except Exception as e:
+            logger.error(f"Topic analysis or prompt building failed for {job['url']}: {str(e)}")
+            BatchGenerator._fail(job, 'Failed to analyze content')
+
+    @staticmethod
+    def _generate(job):
+        """Generate and post-process one blog (Steps 7-8)."""
+        started = time.perf_counter()
+        try:
+            generated_blog = BlogGenerator.generate_with_retry(job['prompt'])
+        except Exception as e:
+            return BatchGenerator._fail(job, str(e))
+        job['timings']['generate'] = round(time.perf_counter() - started, 3)
+
+        job['processed_blog'] = SEOPostProcessor.process_blog(generated_blog, job['keywords'])
+
+    @staticmethod
+    def _run_concurrently(func, jobs, max_workers):
+        """
+        Run func over jobs on a bounded thread pool.
+
+        Args:
+            func (callable): Function taking one job dict
+            jobs (list): Job dicts
+            max_workers (int): Maximum concurrent calls
+        """
+        if not jobs:
+            return
+
+        def run(job):
+            try:
+                func(job)
+            except Exception as e:
+                logger.error(f"Batch job failed for {job['url']}: {str(e)}")
+                BatchGenerator._fail(job, 'An unexpected error occurred')
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            list(executor.map(run, jobs))
+
+    @staticmethod
+    def _active(jobs):
+        """Jobs that have not failed so far."""
+        return [job for job in jobs if job['status'] == 'pending']
+
+    @staticmethod
+    def _fail(job, message):
+        """Mark a job as failed."""
+        job['status'] = 'failed'
+        job['error'] = message
+        logger.warning(f"Batch job failed for {job['url']}: {message}")
+
+    @staticmethod
+    def _to_result(job):
+        """Convert a finished job into its API result."""
+        timings = dict(job['timings'])
+        timings['total'] = round(sum(timings.values()), 3)
+        result = {
+            'url': job['url'],
+            'status': job['status'],
+            'timings': timings
+        }
+
+        if job['status'] != 'success':
+            result['error'] = job.get('error')
+            return result
+
+        processed_blog = job['processed_blog']
+        result['blog'] = {
+            'id': job['blog_id'],
+            'content': processed_blog['content'],
+            'title': processed_blog['title'],
+            'meta_description': processed_blog['meta_description'],
+            'keywords': job['keywords'],
+            'word_count': processed_blog['word_count'],
+            'reading_time': processed_blog['reading_time'],
+            'website_url': job['url'],
+            'topic_analysis': job['topic_analysis']
+        }
+        return result
@@ -0,0 +1,66 @@
+"""
+Keyword candidate pruning.
+KeyBERT embeds every candidate phrase its vectorizer finds before ranking them,
+which is tens of thousands of 1-3 word phrases on a long page. This stage scores
+candidates cheaply (frequency, corpus IDF, first position and word-shape
+heuristics standing in for part-of-speech tags) and keeps the top K, which
+KeyBERT then embeds instead.
+"""
+import numpy as np
+from services.tfidf_keywords import PHRASE_BOOST, candidate_hashes
+from utils.idf_store import get_idf_store
+
+# Shortest candidate word, as KeyBERT's vectorizer keeps two-letter words ("ai", "ui")
+MIN_WORD_LENGTH = 2
+
+# Weight of a phrase's first appearance: x1.5 at the start of the text, x1.0 at the end
+POSITION_BOOST = 0.5
+
+# English word shapes: adverbs rarely make keyphrases, noun endings usually head them
+ADVERB_SUFFIX = 'ly'
+ADVERB_PENALTY = 0.5
+NOUN_SUFFIXES = ('tion', 'sion', 'ment', 'ness', 'ity', 'ism', 'ance', 'ence', 'ship', 'ogy', 'ist', 'er', 'or')
+NOUN_BOOST = 1.2
+
+
+def prune_candidates(text, max_candidates, language='en', use_ngrams=True):
+    """
+    Pick the most promising keyword candidates of a text.
+
+    Args:
+        text (str): Cleaned text
+        max_candidates (int): Number of candidates to keep
+        language (str): ISO 639-1 code of the text
+        use_ngrams (bool): Whether to include phrases (bigrams/trigrams)
+
+    Returns:
+        list: Up to max_candidates distinct lowercase phrases, best first
+    """
+    tokens, hashes, starts, sizes = candidate_hashes(text or '', language, use_ngrams, MIN_WORD_LENGTH)
+    if not len(hashes):
+        return []
+
+    unique, first, counts = np.unique(hashes, return_index=True, return_counts=True)
+    starts, sizes = starts[first], sizes[first]
+
+    store = get_idf_store()
+    idf = store.idf(unique) if store else np.ones(len(unique))
+
+    scores = (1.0 + np.log(counts)) * idf * (1.0 + PHRASE_BOOST * (sizes - 1))
+    scores *= 1.0 + POSITION_BOOST * (1.0 - starts / len(tokens))
+
+    if language == 'en':
+        shapes = {token: (token.endswith(ADVERB_SUFFIX), token.endswith(NOUN_SUFFIXES)) for token in set(tokens)}
+        adverb = np.fromiter((shapes[token][0] for token in tokens), dtype=bool, count=len(tokens))
+        noun = np.fromiter((shapes[token][1] for token in tokens), dtype=bool, count=len(tokens))
+        ends = starts + sizes - 1
+        scores *= np.where(adverb[starts] | adverb[ends], ADVERB_PENALTY, 1.0)
+        scores *= np.where(noun[ends], NOUN_BOOST, 1.0)
+
+    if len(scores) > max_candidates:
+        best = np.argpartition(-scores, max_candidates - 1)[:max_candidates]
+    else:
+        best = np.arange(len(scores))
+    best = best[np.argsort(-scores[best], kind='stable')]
+
+    return [' '.join(tokens[starts[index]:starts[index] + sizes[index]]) for index in best]
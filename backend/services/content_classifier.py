@@ -0,0 +1,148 @@
+"""
+Embedding-based content classifier.
+Scores a page against per-category centroid vectors with a vectorized cosine,
+using the document and keyword vectors keyword extraction already computed, so
+classification runs no model passes. Centroids live in a small NumPy file built
+offline from example texts, so categories can be added without code changes:
+    python -m services.content_classifier data/category_examples.json
+"""
+import argparse
+import json
+import os
+import numpy as np
+from config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Shared classifier instance (lazy loading; None if there is no centroid file)
+_classifier = None
+_classifier_loaded = False
+
+# Share of the score from the keywords; the rest comes from the document vector
+KEYWORD_WEIGHT = 0.5
+
+
+def _unit(matrix):
+    """Scale rows to unit length."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class CentroidClassifier:
+    """Ranks categories by cosine similarity to their centroid vectors."""
+
+    def __init__(self, labels, centroids, model_name):
+        """
+        Create the classifier.
+
+        Args:
+            labels (list): Category names
+            centroids (np.ndarray): One row per category, in the model's embedding space
+            model_name (str): Sentence-transformer the centroids were built with
+        """
+        self.labels = list(labels)
+        self.centroids = _unit(np.asarray(centroids, dtype=np.float32))
+        self.model_name = model_name
+        self.dim = self.centroids.shape[1]
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load centroids saved with save().
+
+        Args:
+            path (str): .npz file path
+
+        Returns:
+            CentroidClassifier: Loaded classifier
+        """
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['labels'].tolist(), data['centroids'], str(data['model']))
+
+    def save(self, path):
+        """
+        Save the centroids as an .npz file.
+
+        Args:
+            path (str): File path
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as f:
+            np.savez(f, labels=np.array(self.labels), centroids=self.centroids, model=np.array(self.model_name))
+
+    def classify(self, document_vector, keyword_vectors, top_k=3):
+        """
+        Rank categories for a page.
+
+        Args:
+            document_vector (np.ndarray): Document embedding
+            keyword_vectors (np.ndarray): One keyword embedding per row
+            top_k (int): Number of categories returned
+
+        Returns:
+            list: (category, score) tuples, best first; scores are cosines
+        """
+        scores = (_unit(np.asarray(document_vector, dtype=np.float32)[None]) @ self.centroids.T)[0]
+        if len(keyword_vectors):
+            keyword_scores = (_unit(np.asarray(keyword_vectors, dtype=np.float32)) @ self.centroids.T).mean(axis=0)
+            scores = (1.0 - KEYWORD_WEIGHT) * scores + KEYWORD_WEIGHT * keyword_scores
+
+        top_k = min(top_k, len(self.labels))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [(self.labels[i], round(float(scores[i]), 4)) for i in best]
+
+
+def build_centroids(examples, model_name):
+    """
+    Embed example texts and average them into one centroid per category.
+
+    Args:
+        examples (dict): Category name -> list of example texts
+        model_name (str): Sentence-transformer to embed with (the keyword model)
+
+    Returns:
+        CentroidClassifier: Classifier over the example categories
+    """
+    from services.keyword_extractor import _load_encoder
+
+    encoder, _ = _load_encoder(model_name)
+    labels = list(examples)
+    centroids = [
+        _unit(np.asarray(encoder.encode(examples[label]), dtype=np.float32)).mean(axis=0)
+        for label in labels
+    ]
+    return CentroidClassifier(labels, np.vstack(centroids), model_name)
+
+
+def get_content_classifier():
+    """Get or load the classifier from CATEGORY_CENTROIDS_PATH; None if there is no usable file."""
+    global _classifier, _classifier_loaded
+
+    if not _classifier_loaded:
+        _classifier_loaded = True
+        path = Config.CATEGORY_CENTROIDS_PATH
+        if path and os.path.exists(path):
+            try:
+                _classifier = CentroidClassifier.load(path)
+                logger.info(f"Loaded {len(_classifier.labels)} category centroids for {_classifier.model_name}")
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"Failed to load category centroids: {str(e)}")
+
+    return _classifier
+
+
+if __name__ == '__main__':
+    from services.keyword_extractor import _model_name
+
+    parser = argparse.ArgumentParser(description='Build category centroids from example texts')
+    parser.add_argument('examples', help='JSON file mapping category names to lists of example texts')
+    parser.add_argument('--model', default=_model_name('en'), help='Sentence-transformer (default: KEYBERT_MODEL)')
+    parser.add_argument('--output', default=Config.CATEGORY_CENTROIDS_PATH, help='Centroid file to write')
+    args = parser.parse_args()
+
+    with open(args.examples, encoding='utf-8') as f:
+        classifier = build_centroids(json.load(f), args.model)
+    classifier.save(args.output)
+    print(f"wrote {len(classifier.labels)} centroids ({classifier.dim} dimensions) to {args.output}")
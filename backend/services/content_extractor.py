@@ -2,24 +2,38 @@
 Content extraction service.
 Extracts meaningful text content from web pages using Trafilatura.
 """
+import json
+from copy import deepcopy
 import requests
 import trafilatura
+from lxml import etree
+from trafilatura.utils import load_html
+from config import Config
+from services.page_fetcher import PageFetcher
+from utils.document import Document
+from utils.extraction_cache import content_key, get_extraction_cache
+from utils.page_cache import get_page_cache
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Elements whose text is never rendered by a browser
+INVISIBLE_TAGS = frozenset(['script', 'style', 'template'])
+
 
 class ContentExtractor:
     """Extracts clean text content from web pages."""
     
     @staticmethod
-    def extract_content(url, timeout=10):
+    def extract_content(url, timeout=Config.REQUEST_TIMEOUT, page=None):
         """
         Extract main content from a web page.
         
         Args:
             url (str): URL to extract content from
             timeout (int): Request timeout in seconds
+            page (dict, optional): Page already fetched by PageFetcher; when
+                given, no further request is made
             
         Returns:
             dict: Dictionary containing extracted content
@@ -36,79 +50,38 @@ class ContentExtractor:
             Exception: If content extraction fails
         """
         try:
-            # Fetch the web page
-            response = requests.get(
-                url,
-                timeout=timeout,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-            )
-            response.raise_for_status()
+            # Fetch the web page unless the caller already has it
+            if page is None:
+                page = PageFetcher.fetch(url, timeout=timeout)
+                if page['status_code'] >= 400:
+                    raise requests.exceptions.HTTPError(
+                        f"{page['status_code']} Error for url: {page['final_url']}"
+                    )
             
-            # Extract content using Trafilatura with progressive fallbacks
-            downloaded = trafilatura.extract(
-                response.content,
-                include_comments=False,
-                include_tables=False,
-                favor_precision=True,
-                with_metadata=True,
-                output_format='json'
-            )
-
-            # If primary extraction fails, try a more permissive extraction
-            if not downloaded:
-                logger.info(f"Primary trafilatura extract failed for {url}, trying permissive mode")
-                downloaded = trafilatura.extract(
-                    response.text,
-                    include_comments=True,
-                    include_tables=True,
-                    favor_precision=False,
-                    with_metadata=True,
-                    output_format='json'
-                )
-
-            # Parse the JSON response if we have it
-            import json
-            content_data = None
-            if downloaded:
-                content_data = json.loads(downloaded) if isinstance(downloaded, str) else downloaded
-            else:
-                # Try plain-text extraction (no metadata)
-                plain_text = trafilatura.extract(response.content)
-                if plain_text:
-                    content_data = {'text': plain_text, 'title': '', 'description': '', 'author': '', 'date': ''}
-                else:
-                    # Final fallback: BeautifulSoup visible text
-                    try:
-                        from bs4 import BeautifulSoup
-                        soup = BeautifulSoup(response.content, "html.parser")
-                        visible = soup.get_text(separator="\n")
-                        visible = visible.strip() if visible else ""
-                        if visible:
-                            content_data = {'text': visible, 'title': '', 'description': '', 'author': '', 'date': ''}
-                    except Exception:
-                        content_data = None
-
-            if not content_data:
-                raise ValueError("Could not extract content from the page")
+            # An unchanged cached page already carries its extraction result
+            if page.get('extracted'):
+                logger.info(f"Reusing cached extraction for: {url}")
+                return dict(page['extracted'], url=url)
             
-            # Extract and clean data (use safe fallback when metadata is None)
-            def _safe_strip(value):
-                return (value or '').strip()
-
-            result = {
-                'text': _safe_strip(content_data.get('text')),
-                'title': _safe_strip(content_data.get('title')),
-                'description': _safe_strip(content_data.get('description')),
-                'author': _safe_strip(content_data.get('author')),
-                'date': _safe_strip(content_data.get('date')),
-                'url': url
-            }
+            html = page['content']
             
-            # Validate that we have meaningful content
-            if not result['text'] or len(result['text']) < 100:
-                raise ValueError("Extracted content is too short or empty")
+            # Identical HTML (any URL) is only run through the extractors once
+            extraction_cache = get_extraction_cache()
+            key = content_key(html) if extraction_cache else None
+            cached_result = extraction_cache.get(key) if extraction_cache else None
+            
+            if cached_result:
+                logger.info(f"Extraction cache hit for: {url}")
+                result = dict(cached_result, url=url)
+            else:
+                result = ContentExtractor._extract_from_html(html, url)
+                if extraction_cache:
+                    extraction_cache.put(key, result)
+            
+            # Keep the result with the cached page so a later 304 skips parsing
+            cache = get_page_cache()
+            if cache:
+                cache.store_extracted(url, result)
             
             logger.info(f"Successfully extracted content from: {url} ({len(result['text'])} chars)")
             return result
@@ -123,26 +96,137 @@ class ContentExtractor:
             logger.error(f"Unexpected error extracting content from {url}: {str(e)}")
             raise Exception(f"Unexpected error: {str(e)}")
     
+    @staticmethod
+    def _extract_from_html(html, url):
+        """
+        Run the extraction fallbacks over raw page content.
+        
+        Args:
+            html (bytes): Raw page content
+            url (str): Page URL (for logging and the result)
+            
+        Returns:
+            dict: Extracted content (same shape as extract_content)
+            
+        Raises:
+            ValueError: If no meaningful content could be extracted
+        """
+        # Parse once; every strategy below works on this tree
+        tree = load_html(html)
+        if tree is None:
+            raise ValueError("Could not parse the page")
+
+        # Extract content using Trafilatura with progressive fallbacks.
+        # Trafilatura prunes the tree it is given, so each pass gets a copy.
+        downloaded = trafilatura.extract(
+            deepcopy(tree),
+            include_comments=False,
+            include_tables=False,
+            favor_precision=True,
+            with_metadata=True,
+            output_format='json'
+        )
+
+        # If primary extraction fails, try a more permissive extraction
+        if not downloaded:
+            logger.info(f"Primary trafilatura extract failed for {url}, trying permissive mode")
+            downloaded = trafilatura.extract(
+                deepcopy(tree),
+                include_comments=True,
+                include_tables=True,
+                favor_precision=False,
+                with_metadata=True,
+                output_format='json'
+            )
+
+        # Parse the JSON response if we have it
+        content_data = None
+        if downloaded:
+            content_data = json.loads(downloaded) if isinstance(downloaded, str) else downloaded
+        else:
+            # Try plain-text extraction (no metadata)
+            plain_text = trafilatura.extract(deepcopy(tree))
+            if plain_text:
+                content_data = {'text': plain_text, 'title': '', 'description': '', 'author': '', 'date': ''}
+            else:
+                # Final fallback: visible text of the original tree
+                visible = ContentExtractor._visible_text(tree)
+                if visible:
+                    content_data = {'text': visible, 'title': '', 'description': '', 'author': '', 'date': ''}
+
+        if not content_data:
+            raise ValueError("Could not extract content from the page")
+        
+        # Extract and clean data (use safe fallback when metadata is None)
+        def _safe_strip(value):
+            return (value or '').strip()
+
+        result = {
+            'text': _safe_strip(content_data.get('text')),
+            'title': _safe_strip(content_data.get('title')),
+            'description': _safe_strip(content_data.get('description')),
+            'author': _safe_strip(content_data.get('author')),
+            'date': _safe_strip(content_data.get('date')),
+            'url': url
+        }
+        
+        # Validate that we have meaningful content
+        if not result['text'] or len(result['text']) < 100:
+            raise ValueError("Extracted content is too short or empty")
+        
+        return result
+    
+    @staticmethod
+    def _visible_text(tree):
+        """
+        Collect the visible text of a parsed page.
+        
+        Args:
+            tree (lxml.html.HtmlElement): Parsed page
+            
+        Returns:
+            str: Visible text, one text node per line
+        """
+        texts = []
+        hidden_depth = 0
+        
+        # Single walk: an element's text comes at 'start', its tail after 'end'
+        for event, element in etree.iterwalk(tree, events=('start', 'end')):
+            is_invisible = element.tag in INVISIBLE_TAGS
+            if event == 'start':
+                if is_invisible:
+                    hidden_depth += 1
+                elif not hidden_depth and isinstance(element.tag, str) and element.text:
+                    texts.append(element.text)
+            else:
+                if is_invisible:
+                    hidden_depth -= 1
+                if not hidden_depth and element.tail and element is not tree:
+                    texts.append(element.tail)
+        
+        return "\n".join(text.strip() for text in texts if text.strip())
+    
     @staticmethod
     def get_summary(content_text, max_length=500):
         """
         Get a short summary of the content.
         
         Args:
-            content_text (str): Full text content
+            content_text (Document or str): Full text content
             max_length (int): Maximum length of summary
             
         Returns:
             str: Summary text
         """
-        if not content_text:
+        document = Document.of(content_text)
+        if not document.text:
             return ""
         
         # Take first few sentences or max_length characters
-        summary = content_text[:max_length]
+        summary = document.text[:max_length]
         
         # Try to end at a sentence boundary
-        last_period = summary.rfind('.')
+        last_period = document.last_period_before(max_length)
         if last_period > max_length * 0.7:  # If we have at least 70% of desired length
             summary = summary[:last_period + 1]
         
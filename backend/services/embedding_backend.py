@@ -0,0 +1,94 @@
+"""
+Embedding backends for KeyBERT.
+Wrap a sentence encoder (SentenceTransformer or OnnxEmbedder) as a KeyBERT
+embedder, optionally in front of the embedding cache so only unseen document
+and candidate phrase texts reach the model.
+Imported when a KeyBERT model is loaded, as it needs keybert installed.
+"""
+import time
+import numpy as np
+from keybert.backend import BaseEmbedder
+from config import Config
+
+
+class EncoderEmbedder(BaseEmbedder):
+    """KeyBERT embedding backend for any encoder with SentenceTransformer's encode()."""
+
+    def __init__(self, embedding_model):
+        """
+        Wrap a sentence encoder.
+
+        Args:
+            embedding_model: SentenceTransformer or OnnxEmbedder
+        """
+        super().__init__()
+        self.embedding_model = embedding_model
+        self.dim = embedding_model.get_sentence_embedding_dimension()
+
+    def embed(self, documents, verbose=False):
+        """
+        Embed texts.
+
+        Args:
+            documents (list): Documents or candidate phrases
+            verbose (bool): Show the model's progress bar
+
+        Returns:
+            np.ndarray: float32 embeddings, one row per text
+        """
+        documents = list(documents)
+        if not documents:
+            return np.empty((0, self.dim), dtype=np.float32)
+        embeddings = self.embedding_model.encode(
+            documents, batch_size=Config.EMBEDDING_BATCH_SIZE, show_progress_bar=verbose
+        )
+        return np.asarray(embeddings, dtype=np.float32)
+
+
+class CachedEmbedder(EncoderEmbedder):
+    """KeyBERT embedding backend that serves repeated texts from an EmbeddingCache."""
+
+    def __init__(self, embedding_model, model_name, cache):
+        """
+        Wrap a sentence encoder.
+
+        Args:
+            embedding_model: SentenceTransformer or OnnxEmbedder
+            model_name (str): Model name, part of the cache key
+            cache (EmbeddingCache): Cache to read and fill
+        """
+        super().__init__(embedding_model)
+        self.model_name = model_name
+        self.cache = cache
+
+    def embed(self, documents, verbose=False):
+        """
+        Embed texts, encoding only the ones missing from the cache.
+
+        Args:
+            documents (list): Documents or candidate phrases
+            verbose (bool): Show the model's progress bar
+
+        Returns:
+            np.ndarray: float32 embeddings, one row per text
+        """
+        documents = list(documents)
+        vectors = self.cache.get_many(self.model_name, documents, dim=self.dim)
+
+        # Encode each missing text once, even if it repeats in the input
+        missing = list(dict.fromkeys(text for text, vector in zip(documents, vectors) if vector is None))
+        if missing:
+            started = time.perf_counter()
+            encoded = self.embedding_model.encode(
+                missing, batch_size=Config.EMBEDDING_BATCH_SIZE, show_progress_bar=verbose
+            )
+            self.cache.record_model_time(len(missing), time.perf_counter() - started)
+
+            encoded = [np.asarray(vector, dtype=np.float32) for vector in encoded]
+            self.cache.put_many(self.model_name, missing, encoded)
+            by_text = dict(zip(missing, encoded))
+            vectors = [by_text[text] if vector is None else vector for text, vector in zip(documents, vectors)]
+
+        if not vectors:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.vstack(vectors)
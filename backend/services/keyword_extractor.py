@@ -3,81 +3,199 @@ Keyword extraction service using KeyBERT.
 Extracts important keywords and phrases from text using NLP.
 """
 import os
-import re
-from collections import Counter
+import numpy as np
+from config import Config
+from services.candidate_pruner import prune_candidates
+from services.keyword_pool import request_keywords
+from services.language_detector import LanguageDetector, get_stopwords
+from services.tfidf_keywords import TfidfKeywordExtractor
+from utils.document import Document
+from utils.embedding_cache import get_embedding_cache
+from utils.keyword_cache import get_keyword_cache, keyword_cache_key
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
-# Initialize KeyBERT model (lazy loading)
-_keybert_model = None
+# Initialize KeyBERT models (lazy loading, one per sentence-transformer name)
+_keybert_models = {}
 
+# Maximal Marginal Relevance diversity for KeyBERT results
+MMR_DIVERSITY = 0.5
 
-def get_keybert_model():
-    """Get or initialize the KeyBERT model.
 
-    Respects DISABLE_KEYBERT (bool) and KEYBERT_MODEL env vars. Loads the model lazily
-    and returns None if loading is disabled or fails, so callers can fall back to a
-    lightweight extractor to avoid OOM on constrained hosts.
+def _model_name(language):
+    """Sentence-transformer for a language: the English model or the multilingual one."""
+    english_model = os.getenv("KEYBERT_MODEL", "paraphrase-MiniLM-L3-v2")
+    if language == "en":
+        return english_model
+    return os.getenv("KEYBERT_MULTILINGUAL_MODEL", "paraphrase-multilingual-MiniLM-L12-v2") or english_model
+
+
+def _cache_name(model_name):
+    """Name a model's embeddings are cached under for KEYBERT_BACKEND (ONNX vectors differ slightly)."""
+    if os.getenv("KEYBERT_BACKEND", "torch").lower() == "onnx":
+        return f"{model_name}:onnx-int8"
+    return model_name
+
+
+def _load_encoder(model_name):
+    """Load the sentence encoder for KEYBERT_BACKEND; returns (encoder, name used in cache keys).
+
+    "onnx" loads the int8 ONNX export of the model from KEYBERT_ONNX_DIR (see
+    services/onnx_embedder.py) and falls back to PyTorch if there is none.
     """
-    global _keybert_model
+    if os.getenv("KEYBERT_BACKEND", "torch").lower() == "onnx":
+        try:
+            from services.onnx_embedder import OnnxEmbedder, model_dir
+
+            onnx_dir = os.getenv("KEYBERT_ONNX_DIR", os.path.join("instance", "onnx"))
+            encoder = OnnxEmbedder(model_dir(onnx_dir, model_name))
+            logger.info("Using quantized ONNX backend for %s", model_name)
+            return encoder, _cache_name(model_name)
+        except Exception as e:
+            logger.warning("ONNX backend unavailable for %s (%s); using PyTorch", model_name, e)
+
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name), model_name
+
+
+def _extractor_name(language):
+    """Model and backend producing a language's keywords, as used in keyword cache keys."""
+    return f"{_model_name(language)}:{os.getenv('KEYBERT_BACKEND', 'torch').lower()}"
+
+
+def get_keybert_model(language="en"):
+    """Get or initialize the KeyBERT model for a language.
 
+    Respects DISABLE_KEYBERT (bool), KEYBERT_MODEL and KEYBERT_MULTILINGUAL_MODEL env vars.
+    English text uses KEYBERT_MODEL; other languages use the multilingual model, which is
+    only loaded once a non-English page arrives (set it empty to use KEYBERT_MODEL for all).
+    KEYBERT_BACKEND selects PyTorch ("torch", default) or a quantized ONNX export ("onnx").
+    Embeddings go through the shared embedding cache unless EMBEDDING_CACHE_SIZE is 0.
+    Loads models lazily and returns None if loading is disabled or fails, so callers can
+    fall back to a lightweight extractor to avoid OOM on constrained hosts.
+    """
     # Allow deployments to disable heavy model loading via env var
     if os.getenv("DISABLE_KEYBERT", "false").lower() in ("1", "true", "yes"):
         logger.info("KeyBERT disabled via DISABLE_KEYBERT")
         return None
 
-    if _keybert_model is None:
-        model_name = os.getenv("KEYBERT_MODEL", "paraphrase-MiniLM-L3-v2")
+    model_name = _model_name(language)
+    if model_name not in _keybert_models:
         logger.info("Loading KeyBERT model: %s", model_name)
         try:
             # Delay heavy imports until model load to keep module import lightweight
             from keybert import KeyBERT
-            from sentence_transformers import SentenceTransformer
+            from services.embedding_backend import CachedEmbedder, EncoderEmbedder
+
+            encoder, cache_name = _load_encoder(model_name)
+            cache = get_embedding_cache()
+            if cache:
+                embedding_model = CachedEmbedder(encoder, cache_name, cache)
+            else:
+                embedding_model = EncoderEmbedder(encoder)
 
-            _keybert_model = KeyBERT(model=SentenceTransformer(model_name))
+            _keybert_models[model_name] = KeyBERT(model=embedding_model)
             logger.info("KeyBERT model loaded successfully")
         except Exception as e:
             logger.error("Failed to load KeyBERT model: %s", e)
-            _keybert_model = None
+            return None
 
-    return _keybert_model
+    return _keybert_models[model_name]
 
 
-def _simple_keyword_fallback(text, top_n=10, use_ngrams=True):
-    """Lightweight frequency-based keyword extractor as a fallback.
+def preload_keybert_models(languages=("en",)):
+    """Load the KeyBERT models for some languages ahead of time, ready to be shared by forked workers.
 
-    Returns a list of (keyword, score) tuples to match KeyBERT's output shape.
+    Meant for the pre-fork master process (PRELOAD_MODELS): weights loaded here are shared
+    copy-on-write by every worker instead of being loaded once per worker. PyTorch models are
+    put in inference mode now, so workers do not flip module and parameter flags (dirtying
+    shared pages) on their first request. No inference runs here, since PyTorch's thread
+    pools must not be started before the fork.
+
+    Returns:
+        list: Names of the loaded models
     """
-    stop_words = {
-        "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
-        "with", "is", "of", "that", "this", "it", "as", "by", "from", "are"
-    }
+    loaded = []
+    for language in languages:
+        model = get_keybert_model(language)
+        if not model:
+            continue
+
+        encoder = getattr(model.model, "embedding_model", None)
+        if hasattr(encoder, "parameters"):
+            encoder.eval()
+            for parameter in encoder.parameters():
+                parameter.requires_grad_(False)
+        loaded.append(_model_name(language))
+    return loaded
+
+
+def _keybert_stop_words(language):
+    """stop_words argument for KeyBERT: scikit-learn's English list, or the language's own."""
+    if language == "en":
+        return "english"
+    stop_words = get_stopwords(language)
+    return sorted(stop_words) if stop_words else None
+
+
+def _pool_windows(windows, embeddings):
+    """Average each text's unit-length window vectors, weighted by window length.
+
+    Args:
+        windows (list): Window strings per text
+        embeddings (np.ndarray): One row per window, in order
+
+    Returns:
+        np.ndarray: One pooled row per text
+    """
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    embeddings = embeddings / np.maximum(norms, 1e-12)
+
+    pooled = []
+    offset = 0
+    for text_windows in windows:
+        weights = np.fromiter(map(len, text_windows), dtype=np.float32, count=len(text_windows))
+        pooled.append(weights @ embeddings[offset:offset + len(text_windows)] / weights.sum())
+        offset += len(text_windows)
+    return np.vstack(pooled)
 
-    words = re.findall(r"\b[a-z]{4,}\b", (text or "").lower())
-    words = [w for w in words if w not in stop_words]
 
-    candidates = list(words)
-    if use_ngrams and len(words) >= 2:
-        for n in (2, 3):
-            candidates.extend([" ".join(words[i:i+n]) for i in range(len(words) - n + 1)])
+def _document_windows(text):
+    """Windows a text's document vector is pooled from (the whole text if KEYWORD_WINDOW_CHARS is 0)."""
+    if Config.KEYWORD_WINDOW_CHARS <= 0:
+        return [Document.of(text).text]
+    return Document.of(text).windows(Config.KEYWORD_WINDOW_CHARS) or [Document.of(text).text]
 
-    most_common = [w for w, _ in Counter(candidates).most_common(top_n)]
-    return [(kw, 1.0) for kw in most_common]
+
+def _simple_keyword_fallback(text, top_n=10, use_ngrams=True, language="en"):
+    """Lightweight model-free keyword extractor as a fallback (TF-IDF with corpus IDF).
+
+    Returns a list of (keyword, score) tuples to match KeyBERT's output shape.
+    """
+    return TfidfKeywordExtractor.extract_keywords(text, top_n=top_n, use_ngrams=use_ngrams, language=language)
 
 
 class KeywordExtractor:
     """Extracts keywords and key phrases from text using KeyBERT."""
     
     @staticmethod
-    def extract_keywords(text, top_n=10, use_ngrams=True):
+    def extract_keywords(text, top_n=10, use_ngrams=True, language=None, max_candidates=None):
         """
         Extract top keywords from text.
         
+        Keywords are picked with MMR, which depends on how many are picked, so
+        every call ranks max(top_n, KEYWORD_CACHE_DEPTH) keywords and returns the
+        first top_n. The result is the same whether or not it came from the
+        keyword cache, but it is not always what a top_n-deep MMR run would pick.
+        
         Args:
             text (str): Text to extract keywords from
             top_n (int): Number of top keywords to extract
             use_ngrams (bool): Whether to include phrases (bigrams/trigrams)
+            language (str, optional): ISO 639-1 code of the text; detected when not given
+            max_candidates (int, optional): Candidate phrases embedded (default
+                KEYWORD_MAX_CANDIDATES, 0 embeds every candidate)
             
         Returns:
             list: List of tuples (keyword, score)
@@ -86,37 +204,257 @@ class KeywordExtractor:
             logger.warning("Text too short for keyword extraction")
             return []
         
-        try:
-            model = get_keybert_model()
-
-            # If the heavy model is disabled or failed to load, use a lightweight fallback
+        if language is None:
+            language = LanguageDetector.detect(text)['language']
+        
+        return KeywordExtractor.extract_keywords_batch(
+            [text], top_n, use_ngrams, [language], max_candidates=max_candidates
+        )[0]
+    
+    @staticmethod
+    def extract_keywords_batch(texts, top_n=10, use_ngrams=True, languages=None, batch_size=None,
+                               max_candidates=None):
+        """
+        Extract top keywords from several texts with batched model calls.
+        
+        Texts already in the keyword cache are answered from it. The rest are
+        grouped by language and split into batches; KeyBERT embeds each batch's
+        documents, and the union of their candidate phrases, in single model
+        calls. Each text gets the same result shape as extract_keywords.
+        
+        Args:
+            texts (list): Texts to extract keywords from
+            top_n (int): Number of top keywords to extract per text
+            use_ngrams (bool): Whether to include phrases (bigrams/trigrams)
+            languages (list, optional): ISO 639-1 code per text; detected when not given
+            batch_size (int, optional): Texts per model call (default KEYWORD_BATCH_SIZE)
+            max_candidates (int, optional): Candidate phrases embedded per text
+                (default KEYWORD_MAX_CANDIDATES, 0 embeds every candidate)
+            
+        Returns:
+            list: One list of (keyword, score) tuples per input text
+        """
+        if max_candidates is None:
+            max_candidates = Config.KEYWORD_MAX_CANDIDATES
+        
+        results = [[] for _ in texts]
+        valid = [i for i, text in enumerate(texts) if text and len(text) >= 50]
+        if not valid:
+            logger.warning("No texts long enough for batch keyword extraction")
+            return results
+        
+        if languages is None:
+            languages = [
+                LanguageDetector.detect(text)['language'] if i in valid else None
+                for i, text in enumerate(texts)
+            ]
+        
+        # Lists are always extracted deeper than asked, so smaller top_n reuse cached
+        # ones and the MMR pick is the same with the cache on or off
+        cache = get_keyword_cache()
+        depth = max(top_n, Config.KEYWORD_CACHE_DEPTH)
+        keys = {}
+        pending = []
+        for i in valid:
+            if cache:
+                keys[i] = keyword_cache_key(
+                    texts[i], _extractor_name(languages[i]),
+                    language=languages[i], use_ngrams=use_ngrams, diversity=MMR_DIVERSITY,
+                    window_chars=Config.KEYWORD_WINDOW_CHARS
+                )
+                cached = cache.get(keys[i], top_n, max_candidates)
+                if cached is not None:
+                    results[i] = cached
+                    continue
+            pending.append(i)
+        
+        if not pending:
+            return results
+        
+        extracted = KeywordExtractor._extract_uncached(
+            [texts[i] for i in pending], depth, use_ngrams, [languages[i] for i in pending], batch_size,
+            max_candidates
+        )
+        
+        for i, doc_keywords in zip(pending, extracted):
+            # Fallback keywords are not cached, so the model answers once it can
+            if doc_keywords is None:
+                results[i] = _simple_keyword_fallback(
+                    texts[i], top_n=top_n, use_ngrams=use_ngrams, language=languages[i]
+                )
+                continue
+            if cache:
+                cache.put(keys[i], doc_keywords, depth, max_candidates)
+            results[i] = doc_keywords[:top_n]
+        
+        return results
+    
+    @staticmethod
+    def _extract_uncached(texts, top_n, use_ngrams, languages, batch_size=None, max_candidates=0):
+        """
+        Extract keywords with KeyBERT, locally or in the keyword worker pool.
+        
+        Args:
+            texts (list): Texts long enough for extraction
+            top_n (int): Number of top keywords to extract per text
+            use_ngrams (bool): Whether to include phrases (bigrams/trigrams)
+            languages (list): ISO 639-1 code per text
+            batch_size (int, optional): Texts per model call (default KEYWORD_BATCH_SIZE)
+            max_candidates (int): Candidate phrases embedded per text, 0 for all
+            
+        Returns:
+            list: One list of (keyword, score) tuples per text, or None where the
+                model could not be used (disabled, failed, pool saturated or
+                unreachable) and the caller should fall back
+        """
+        results = [None] * len(texts)
+        
+        # The pool never makes a request wait on a model load; callers fall back instead
+        if Config.KEYWORD_POOL_ADDRESS:
+            pooled = request_keywords(
+                texts, top_n=top_n, use_ngrams=use_ngrams, languages=languages, max_candidates=max_candidates
+            )
+            if pooled is None:
+                logger.info("Keyword pool unavailable; using simple fallback extractor")
+                return results
+            return pooled
+        
+        batch_size = max(1, batch_size or Config.KEYWORD_BATCH_SIZE)
+        
+        # Stop words and model differ per language, so each language is its own batch
+        groups = {}
+        for i, language in enumerate(languages):
+            groups.setdefault(language, []).append(i)
+        
+        for language, group in groups.items():
+            model = get_keybert_model(language)
             if not model:
                 logger.info("KeyBERT disabled or failed to load; using simple fallback extractor")
-                return _simple_keyword_fallback(text, top_n=top_n, use_ngrams=use_ngrams)
-
-            # Set n-gram range (1-3 words if ngrams, else single words only)
+                continue
             keyphrase_ngram_range = (1, 3) if use_ngrams else (1, 1)
 
-            # Extract keywords
-            keywords = model.extract_keywords(
-                text,
-                keyphrase_ngram_range=keyphrase_ngram_range,
-                stop_words='english',
-                top_n=top_n,
-                use_mmr=True,  # Use Maximal Marginal Relevance for diversity
-                diversity=0.5
-            )
+            # The candidate vocabulary matrix grows with the batch, so batches are bounded
+            for start in range(0, len(group), batch_size):
+                indexes = group[start:start + batch_size]
+                try:
+                    batch = [texts[i] for i in indexes]
+                    candidates = KeywordExtractor._candidates(batch, max_candidates, language, use_ngrams)
 
-            logger.info(f"Extracted {len(keywords)} keywords from text")
-            return keywords
+                    # KeyBERT embeds all documents and their candidates in shared batches
+                    keywords = model.extract_keywords(
+                        batch,
+                        candidates=candidates,
+                        keyphrase_ngram_range=keyphrase_ngram_range,
+                        stop_words=_keybert_stop_words(language),
+                        top_n=top_n,
+                        use_mmr=True,  # Use Maximal Marginal Relevance for diversity
+                        diversity=MMR_DIVERSITY,
+                        doc_embeddings=KeywordExtractor._document_embeddings(model, batch)
+                    )
+                    
+                    # KeyBERT unwraps the result when given a single document
+                    if len(indexes) == 1:
+                        keywords = [keywords]
 
-        except Exception as e:
-            logger.error(f"Keyword extraction failed: {str(e)}")
-            # Fallback to frequency-based extractor to avoid crashing
-            return _simple_keyword_fallback(text, top_n=top_n, use_ngrams=use_ngrams)
+                    for i, doc_keywords in zip(indexes, keywords):
+                        results[i] = doc_keywords
+
+                    logger.info(f"Extracted keywords for {len(indexes)} '{language}' texts in one batch")
+
+                except Exception as e:
+                    logger.error(f"Keyword extraction failed: {str(e)}")
+        
+        return results
+    
+    @staticmethod
+    def _candidates(texts, max_candidates, language, use_ngrams):
+        """
+        Shortlist the candidate phrases KeyBERT embeds for a batch of texts.
+        
+        Args:
+            texts (list): Texts of one language
+            max_candidates (int): Candidates kept per text, 0 for all
+            language (str): ISO 639-1 code of the texts
+            use_ngrams (bool): Whether to include phrases (bigrams/trigrams)
+            
+        Returns:
+            list or None: Distinct candidates of all texts, or None to let
+                KeyBERT's vectorizer use every phrase it finds
+        """
+        if max_candidates <= 0:
+            return None
+        
+        # KeyBERT shares one vocabulary across a batch, and rejects duplicates in it
+        candidates = dict.fromkeys(
+            phrase for text in texts for phrase in prune_candidates(text, max_candidates, language, use_ngrams)
+        )
+        return list(candidates) or None
+    
+    @staticmethod
+    def _document_embeddings(model, texts):
+        """
+        Embed whole documents as pooled sentence-aligned windows.
+        
+        The encoder truncates its input to its maximum sequence length, so a
+        long text embedded in one piece only reflects its opening. Each text is
+        split into windows of up to KEYWORD_WINDOW_CHARS, all windows are
+        embedded in one call, and each text's unit-length window vectors are
+        averaged, weighted by window length.
+        
+        Args:
+            model (KeyBERT): Model whose embedding backend is used
+            texts (list): Texts to embed
+            
+        Returns:
+            np.ndarray or None: One row per text, or None to let KeyBERT embed
+                the texts whole (KEYWORD_WINDOW_CHARS is 0)
+        """
+        if Config.KEYWORD_WINDOW_CHARS <= 0:
+            return None
+        
+        windows = [_document_windows(text) for text in texts]
+        embeddings = model.model.embed([window for text_windows in windows for window in text_windows])
+        return _pool_windows(windows, embeddings)
+    
+    @staticmethod
+    def cached_embeddings(text, keywords, language="en", model_name=None, dim=None):
+        """
+        Look up the document and keyword vectors keyword extraction computed.
+        
+        Only the embedding cache is read, so this never runs the model; with a
+        keyword pool, vectors are found through the shared disk tier.
+        
+        Args:
+            text (Document or str): Text keywords were extracted from
+            keywords (list): Keyword strings extracted from it
+            language (str): ISO 639-1 code of the text
+            model_name (str, optional): Only return vectors of this sentence-transformer
+            dim (int, optional): Embedding dimension, for the disk tier when the
+                model is not loaded in this process
+            
+        Returns:
+            tuple or None: (pooled document vector, keyword matrix), or None if
+                the model differs or any vector is not cached
+        """
+        cache = get_embedding_cache()
+        name = _model_name(language)
+        if not cache or not keywords or (model_name and model_name != name):
+            return None
+        
+        embedder = getattr(_keybert_models.get(name), "model", None)
+        cache_name = getattr(embedder, "model_name", None) or _cache_name(name)
+        dim = getattr(embedder, "dim", dim)
+        
+        windows = _document_windows(text)
+        vectors = cache.get_many(cache_name, windows + list(keywords), dim=dim)
+        if any(vector is None for vector in vectors):
+            return None
+        
+        vectors = np.vstack(vectors)
+        return _pool_windows([windows], vectors[:len(windows)])[0], vectors[len(windows):]
     
     @staticmethod
-    def extract_keywords_list(text, top_n=10, use_ngrams=True):
+    def extract_keywords_list(text, top_n=10, use_ngrams=True, language=None, max_candidates=None):
         """
         Extract keywords as a simple list (without scores).
         
@@ -124,11 +462,13 @@ class KeywordExtractor:
             text (str): Text to extract keywords from
             top_n (int): Number of top keywords to extract
             use_ngrams (bool): Whether to include phrases
+            language (str, optional): ISO 639-1 code of the text; detected when not given
+            max_candidates (int, optional): Candidate phrases embedded (default KEYWORD_MAX_CANDIDATES)
             
         Returns:
             list: List of keyword strings
         """
-        keywords_with_scores = KeywordExtractor.extract_keywords(text, top_n, use_ngrams)
+        keywords_with_scores = KeywordExtractor.extract_keywords(text, top_n, use_ngrams, language, max_candidates)
         return [keyword for keyword, score in keywords_with_scores]
     
     @staticmethod
@@ -0,0 +1,332 @@
+"""
+Keyword extraction worker pool.
+A standalone service holding a small, fixed pool of processes that each load
+the KeyBERT model once, so web workers no longer load their own copy. Web
+workers send requests over a local socket; when the bounded queue is full, the
+request times out or the service is down, they use the frequency fallback.
+
+Run it next to the web server (from the backend directory):
+    python -m services.keyword_pool
+
+and point the web workers at it with KEYWORD_POOL_ADDRESS (the same value).
+Requests are pickled, so both sides need a dedicated KEYWORD_POOL_AUTHKEY, and
+the server only listens on a Unix socket or loopback TCP address unless
+KEYWORD_POOL_ALLOW_REMOTE is set.
+"""
+import ipaddress
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener, answer_challenge, deliver_challenge
+from config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Shortest KEYWORD_POOL_AUTHKEY accepted
+MIN_AUTHKEY_LENGTH = 32
+
+# Defaults published in config.py, never accepted as the pool key
+PUBLIC_KEYS = ('dev-secret-key-change-in-production', 'dev-jwt-secret')
+
+# Client-side counters (per web worker process)
+_metrics = {
+    'requests': 0,
+    'served': 0,
+    'busy': 0,
+    'timeouts': 0,
+    'errors': 0,
+    'unavailable': 0
+}
+_metrics_lock = threading.Lock()
+
+
+def _address(value):
+    """Parse KEYWORD_POOL_ADDRESS: "host:port" for TCP, anything else is a Unix socket path."""
+    host, _, port = value.rpartition(':')
+    if host and port.isdigit():
+        return host, int(port)
+    return value
+
+
+def _authkey():
+    """
+    Shared secret for the pool connection.
+
+    Returns:
+        bytes: KEYWORD_POOL_AUTHKEY
+
+    Raises:
+        ValueError: If the key is unset or too short to protect pickled traffic
+    """
+    key = Config.KEYWORD_POOL_AUTHKEY
+    if len(key) < MIN_AUTHKEY_LENGTH or key in PUBLIC_KEYS:
+        raise ValueError(f"KEYWORD_POOL_AUTHKEY must be a secret of at least {MIN_AUTHKEY_LENGTH} characters")
+    return key.encode('utf-8')
+
+
+def _is_loopback(address):
+    """True for Unix socket paths and TCP addresses on the loopback interface."""
+    if isinstance(address, str):
+        return True
+    host = address[0]
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _count(name):
+    """Increment a client counter."""
+    with _metrics_lock:
+        _metrics[name] += 1
+
+
+def request_keywords(texts, top_n=10, use_ngrams=True, languages=None, max_candidates=None):
+    """
+    Extract keywords for several texts in the worker pool.
+
+    Args:
+        texts (list): Texts to extract keywords from
+        top_n (int): Number of top keywords to extract per text
+        use_ngrams (bool): Whether to include phrases (bigrams/trigrams)
+        languages (list, optional): ISO 639-1 code per text
+        max_candidates (int, optional): Candidate phrases embedded per text
+
+    Returns:
+        list or None: One list of (keyword, score) tuples per text (None for
+            texts the model could not serve), or None if the pool is busy,
+            timed out or unreachable (callers fall back)
+    """
+    _count('requests')
+    request = {
+        'texts': texts, 'top_n': top_n, 'use_ngrams': use_ngrams, 'languages': languages,
+        'max_candidates': max_candidates
+    }
+
+    try:
+        with Client(_address(Config.KEYWORD_POOL_ADDRESS), authkey=_authkey()) as conn:
+            conn.send(request)
+            # The server answers by its own deadline; allow a little extra for transfer
+            if not conn.poll(Config.KEYWORD_POOL_TIMEOUT + 1):
+                _count('timeouts')
+                logger.warning("Keyword pool did not answer in time")
+                return None
+            reply = conn.recv()
+    except (OSError, EOFError, AuthenticationError, ValueError) as e:
+        _count('unavailable')
+        logger.warning(f"Keyword pool unavailable: {str(e)}")
+        return None
+
+    status = reply.get('status')
+    if status == 'ok':
+        _count('served')
+        return reply['keywords']
+
+    _count({'busy': 'busy', 'timeout': 'timeouts'}.get(status, 'errors'))
+    logger.warning(f"Keyword pool could not serve request: {status}")
+    return None
+
+
+def get_keyword_pool_metrics():
+    """
+    Get this worker's keyword pool client counters.
+
+    Returns:
+        dict: Request counters, or None if the pool is not configured
+    """
+    if not Config.KEYWORD_POOL_ADDRESS:
+        return None
+    with _metrics_lock:
+        return dict(_metrics)
+
+
+def _worker_main(jobs, results):
+    """Pool process: load the model once, then extract keywords for queued jobs."""
+    # Workers run the model themselves instead of calling back into the pool
+    Config.KEYWORD_POOL_ADDRESS = ''
+    from services.keyword_extractor import KeywordExtractor, get_keybert_model
+    from services.language_detector import LanguageDetector
+
+    get_keybert_model('en')
+    logger.info(f"Keyword pool worker {os.getpid()} ready")
+
+    while True:
+        job_id, deadline, request = jobs.get()
+        # The caller has already given up on jobs that waited past their deadline
+        if time.monotonic() > deadline:
+            results.put((job_id, 'expired', None))
+            continue
+        try:
+            max_candidates = request.get('max_candidates')
+            if max_candidates is None:
+                max_candidates = Config.KEYWORD_MAX_CANDIDATES
+            languages = request['languages'] or [
+                LanguageDetector.detect(text)['language'] for text in request['texts']
+            ]
+            # None where the model failed, so the caller falls back without caching the result
+            keywords = KeywordExtractor._extract_uncached(
+                request['texts'],
+                request['top_n'],
+                request['use_ngrams'],
+                languages,
+                max_candidates=max_candidates
+            )
+            results.put((job_id, 'ok', [
+                None if doc is None else [(keyword, float(score)) for keyword, score in doc]
+                for doc in keywords
+            ]))
+        except Exception as e:
+            logger.error(f"Keyword pool job failed: {str(e)}")
+            results.put((job_id, 'error', None))
+
+
+class KeywordPoolServer:
+    """Accepts keyword requests on a socket and runs them on a fixed pool of model processes."""
+
+    def __init__(self, address, workers, queue_size, timeout):
+        """
+        Create the server.
+
+        Args:
+            address (str): Unix socket path or "host:port"
+            workers (int): Model-holding worker processes
+            queue_size (int): Requests waiting for a worker before new ones are refused
+            timeout (float): Seconds a request may wait and run before it is answered 'timeout'
+
+        Raises:
+            ValueError: If KEYWORD_POOL_AUTHKEY is missing or the address is not
+                local and KEYWORD_POOL_ALLOW_REMOTE is not set
+        """
+        self.address = _address(address)
+        self._authkey = _authkey()
+        if not _is_loopback(self.address) and not Config.KEYWORD_POOL_ALLOW_REMOTE:
+            raise ValueError(
+                f"Refusing to listen on non-loopback address {address}; "
+                "set KEYWORD_POOL_ALLOW_REMOTE=true to allow it"
+            )
+        self.workers = workers
+        self.timeout = timeout
+
+        # Spawned workers start clean instead of inheriting the server's threads
+        self._context = multiprocessing.get_context('spawn')
+        self.jobs = self._context.Queue(maxsize=queue_size)
+        self.results = self._context.Queue()
+        self._processes = []
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._job_ids = itertools.count()
+
+    def serve_forever(self):
+        """Start the workers and answer requests until interrupted."""
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.remove(self.address)
+
+        self._processes = [self._start_worker() for _ in range(self.workers)]
+        threading.Thread(target=self._collect_results, daemon=True).start()
+        threading.Thread(target=self._supervise, daemon=True).start()
+
+        # No authkey here: the handshake runs in each connection's thread, so a
+        # client that stalls mid-handshake cannot hold up the accept loop
+        with Listener(self.address) as listener:
+            logger.info(f"Keyword pool listening on {self.address} with {self.workers} workers")
+            while True:
+                try:
+                    conn = listener.accept()
+                except OSError as e:
+                    logger.warning(f"Failed to accept keyword pool connection: {str(e)}")
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _start_worker(self):
+        """Start one model-holding worker process."""
+        process = self._context.Process(target=_worker_main, args=(self.jobs, self.results), daemon=True)
+        process.start()
+        return process
+
+    def _supervise(self):
+        """Replace worker processes that died (e.g. killed for memory)."""
+        while True:
+            time.sleep(1)
+            for i, process in enumerate(self._processes):
+                if not process.is_alive():
+                    logger.error(f"Keyword pool worker {process.pid} exited ({process.exitcode}); restarting")
+                    self._processes[i] = self._start_worker()
+
+    def _collect_results(self):
+        """Hand worker results to the connection threads waiting for them."""
+        while True:
+            job_id, status, keywords = self.results.get()
+            with self._pending_lock:
+                slot = self._pending.pop(job_id, None)
+            if slot is not None:
+                slot['status'] = status
+                slot['keywords'] = keywords
+                slot['done'].set()
+
+    def _handle(self, conn):
+        """Authenticate a client and serve one request: queue it if there is room, then wait for its result."""
+        with conn:
+            try:
+                deliver_challenge(conn, self._authkey)
+                answer_challenge(conn, self._authkey)
+            except (OSError, EOFError, AuthenticationError) as e:
+                # Failed handshakes (wrong key, dropped client) only affect that client
+                logger.warning(f"Rejected keyword pool connection: {str(e)}")
+                return
+
+            try:
+                request = conn.recv()
+            except (OSError, EOFError):
+                return
+
+            job_id = next(self._job_ids)
+            slot = {'done': threading.Event(), 'status': None, 'keywords': None}
+            with self._pending_lock:
+                self._pending[job_id] = slot
+
+            try:
+                self.jobs.put_nowait((job_id, time.monotonic() + self.timeout, request))
+            except queue.Full:
+                with self._pending_lock:
+                    self._pending.pop(job_id, None)
+                self._reply(conn, {'status': 'busy'})
+                return
+
+            if not slot['done'].wait(self.timeout):
+                with self._pending_lock:
+                    self._pending.pop(job_id, None)
+                self._reply(conn, {'status': 'timeout'})
+                return
+
+            self._reply(conn, {'status': slot['status'], 'keywords': slot['keywords']})
+
+    @staticmethod
+    def _reply(conn, reply):
+        """Send a reply, ignoring clients that already went away."""
+        try:
+            conn.send(reply)
+        except (OSError, EOFError):
+            pass
+
+
+if __name__ == '__main__':
+    if not Config.KEYWORD_POOL_ADDRESS:
+        raise SystemExit("Set KEYWORD_POOL_ADDRESS to the socket path or host:port to listen on")
+
+    try:
+        server = KeywordPoolServer(
+            Config.KEYWORD_POOL_ADDRESS,
+            workers=Config.KEYWORD_POOL_WORKERS,
+            queue_size=Config.KEYWORD_POOL_QUEUE_SIZE,
+            timeout=Config.KEYWORD_POOL_TIMEOUT
+        )
+    except ValueError as e:
+        raise SystemExit(str(e))
+    server.serve_forever()
@@ -0,0 +1,179 @@
+"""
+Language detection service.
+Detects the language of cleaned text with a script check and character trigram
+profiles, and provides per-language stopword sets (loaded lazily and cached).
+"""
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+STOPWORDS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'stopwords')
+
+# Languages told apart by their script alone: (first, last code point, language)
+SCRIPT_RANGES = [
+    (0x0370, 0x03FF, 'el'),
+    (0x0400, 0x04FF, 'ru'),
+    (0x0590, 0x05FF, 'he'),
+    (0x0600, 0x06FF, 'ar'),
+    (0x0900, 0x097F, 'hi'),
+    (0x0E00, 0x0E7F, 'th'),
+    (0x3040, 0x30FF, 'ja'),
+    (0x4E00, 0x9FFF, 'zh'),
+    (0xAC00, 0xD7AF, 'ko'),
+]
+
+# Latin-script languages scored with trigram profiles built from their stopwords
+LATIN_LANGUAGES = ('en', 'es', 'fr', 'de', 'it', 'pt', 'nl')
+
+DEFAULT_LANGUAGE = 'en'
+
+# Weight of trigram similarity next to the stopword hit rate, and the hit rate
+# below which Latin text is not classified at all
+TRIGRAM_WEIGHT = 0.5
+MIN_STOPWORD_RATE = 0.05
+
+WORD = re.compile(r'[^\W\d_]+')
+
+# Caches (lazy loading, shared by all requests)
+_stopwords = {}
+_profiles = None
+_cache_lock = threading.Lock()
+
+
+def get_stopwords(language):
+    """
+    Get the stopword set for a language, loading it on first use.
+
+    Args:
+        language (str): ISO 639-1 language code
+
+    Returns:
+        frozenset or None: Stopwords, or None if no list exists for the language
+    """
+    if language not in _stopwords:
+        path = os.path.join(STOPWORDS_DIR, f'{language}.txt')
+        words = None
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                words = frozenset(line.strip() for line in f if line.strip())
+        with _cache_lock:
+            _stopwords[language] = words
+    return _stopwords[language]
+
+
+def _trigrams(words):
+    """Character trigrams of space-padded words."""
+    for word in words:
+        padded = f' {word} '
+        for i in range(len(padded) - 2):
+            yield padded[i:i + 3]
+
+
+def _get_profiles():
+    """Normalized trigram profiles of the Latin-script languages (built once)."""
+    global _profiles
+    if _profiles is None:
+        profiles = {}
+        for language in LATIN_LANGUAGES:
+            counts = Counter(_trigrams(get_stopwords(language)))
+            norm = math.sqrt(sum(count * count for count in counts.values()))
+            profiles[language] = {trigram: count / norm for trigram, count in counts.items()}
+        _profiles = profiles
+    return _profiles
+
+
+class LanguageDetector:
+    """Detects the language of cleaned text."""
+
+    @staticmethod
+    def detect(text):
+        """
+        Detect the language of a text from a sample of its first characters.
+
+        Non-Latin scripts are identified by their Unicode ranges; Latin text
+        is scored by its stopword hit rate and the cosine similarity of its
+        character trigrams to each language's profile.
+
+        Args:
+            text (str): Cleaned text
+
+        Returns:
+            dict: Detection result
+                {
+                    'language': str,  # ISO 639-1 code ('en' when unsure)
+                    'confidence': float,  # 0-1
+                    'seconds': float  # Detection time
+                }
+        """
+        started = time.perf_counter()
+        language, confidence = LanguageDetector._detect(text[:Config.LANGUAGE_SAMPLE_CHARS])
+        seconds = time.perf_counter() - started
+
+        logger.info(f"Detected language: {language} (confidence {confidence:.2f}, {seconds * 1000:.1f}ms)")
+        return {
+            'language': language,
+            'confidence': round(confidence, 3),
+            'seconds': round(seconds, 4)
+        }
+
+    @staticmethod
+    def _detect(sample):
+        """Detect the language of a sample; returns (language, confidence)."""
+        letters = [char for char in sample if char.isalpha()]
+        if not letters:
+            return DEFAULT_LANGUAGE, 0.0
+
+        # Script check: a clear majority of letters in one non-Latin script
+        scripts = Counter()
+        for char in letters:
+            codepoint = ord(char)
+            if codepoint < 0x0370:
+                continue
+            for first, last, language in SCRIPT_RANGES:
+                if first <= codepoint <= last:
+                    scripts[language] += 1
+                    break
+
+        if scripts:
+            language, count = scripts.most_common(1)[0]
+            # Japanese text mixes kana with CJK ideographs
+            if language == 'zh' and scripts['ja']:
+                language, count = 'ja', count + scripts['ja']
+            share = count / len(letters)
+            if share >= 0.5:
+                return language, share
+
+        # Latin script: stopword hit rate plus cosine similarity of trigram frequencies
+        words = WORD.findall(sample.lower())
+        counts = Counter(_trigrams(words))
+        norm = math.sqrt(sum(count * count for count in counts.values()))
+        if not norm:
+            return DEFAULT_LANGUAGE, 0.0
+
+        scores = {}
+        for language, profile in _get_profiles().items():
+            stopwords = get_stopwords(language)
+            hit_rate = sum(1 for word in words if word in stopwords) / len(words)
+            similarity = sum(count * profile.get(trigram, 0.0) for trigram, count in counts.items()) / norm
+            scores[language] = (hit_rate + similarity * TRIGRAM_WEIGHT, hit_rate)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1][0], reverse=True)
+        best, (best_score, best_hit_rate) = ranked[0]
+        margin = best_score - ranked[1][1][0]
+
+        # Text without function words (lists, product names) gives no real signal
+        if best_hit_rate < MIN_STOPWORD_RATE:
+            return DEFAULT_LANGUAGE, 0.0
+
+        # Confidence: how far ahead the best language is, relative to its score
+        confidence = min(1.0, margin / best_score * 4)
+        if confidence < Config.LANGUAGE_MIN_CONFIDENCE:
+            return DEFAULT_LANGUAGE, confidence
+        return best, confidence
@@ -0,0 +1,184 @@
+"""
+Near-duplicate filter service.
+Removes boilerplate paragraphs repeated across the pages of one site and drops
+pages whose remaining text is a near-duplicate of a page already kept, using
+word shingles and MinHash signatures.
+"""
+import hashlib
+import re
+import time
+import zlib
+import numpy as np
+from config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# MinHash permutation parameters: (a * x + b) mod p with a Mersenne prime p
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Pages a paragraph must appear on before it is treated as boilerplate
+BOILERPLATE_PAGES = 2
+
+# Digits are masked when fingerprinting paragraphs, so boilerplate such as
+# "Page 2 of 9" or "(c) 2024" matches across pages
+DIGITS = re.compile(r'\d+')
+
+
+class SignatureStore:
+    """Growable (pages x permutations) uint32 array of MinHash signatures."""
+
+    def __init__(self, num_perm, capacity=16):
+        self._signatures = np.empty((capacity, num_perm), dtype=np.uint32)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, signature):
+        """Append one signature, doubling the backing array when full."""
+        if self._size == len(self._signatures):
+            grown = np.empty((self._size * 2, self._signatures.shape[1]), dtype=np.uint32)
+            grown[:self._size] = self._signatures
+            self._signatures = grown
+        self._signatures[self._size] = signature
+        self._size += 1
+
+    def max_similarity(self, signature):
+        """
+        Estimate the highest Jaccard similarity between a signature and the store.
+
+        Returns:
+            float: Share of matching MinHash slots (0.0 when the store is empty)
+        """
+        if not self._size:
+            return 0.0
+        matches = self._signatures[:self._size] == signature
+        return float(matches.mean(axis=1).max())
+
+
+class NearDuplicateFilter:
+    """Filters the pages of one crawl; create one instance per site."""
+
+    def __init__(self, threshold=Config.DEDUP_PAGE_THRESHOLD, num_perm=Config.DEDUP_NUM_PERM,
+                 shingle_size=Config.DEDUP_SHINGLE_SIZE):
+        """
+        Create the filter.
+
+        Args:
+            threshold (float): Estimated Jaccard similarity at or above which a
+                page counts as a near-duplicate of a kept page
+            num_perm (int): MinHash permutations per signature
+            shingle_size (int): Words per shingle
+        """
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self._store = SignatureStore(num_perm)
+        self._paragraph_pages = {}
+
+        # Fixed seed: signatures only need to be comparable within one filter
+        rng = np.random.RandomState(1)
+        self._a = rng.randint(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+        self.counters = {
+            'pages_seen': 0,
+            'pages_dropped': 0,
+            'paragraphs_dropped': 0,
+            'bytes_in': 0,
+            'bytes_removed': 0,
+            'seconds': 0.0
+        }
+
+    def filter_page(self, paragraphs):
+        """
+        Filter one page's cleaned paragraphs against the pages seen before.
+
+        If the page, ignoring known boilerplate, is a near-duplicate of a kept
+        page, the whole page is dropped. Otherwise paragraphs already seen on
+        an earlier page (or earlier on this page) are removed.
+
+        Args:
+            paragraphs (list): Cleaned paragraphs of the page
+
+        Returns:
+            list: Paragraphs to keep (empty if the page was dropped)
+        """
+        started = time.perf_counter()
+        page_bytes = sum(len(paragraph.encode('utf-8')) for paragraph in paragraphs)
+        self.counters['pages_seen'] += 1
+        self.counters['bytes_in'] += page_bytes
+
+        fingerprints = [self._fingerprint(paragraph) for paragraph in paragraphs]
+
+        # Similarity ignores boilerplate, i.e. paragraphs already on two or more pages
+        content = [
+            paragraph for paragraph, fingerprint in zip(paragraphs, fingerprints)
+            if self._paragraph_pages.get(fingerprint, 0) < BOILERPLATE_PAGES
+        ]
+        signature = self._signature(' '.join(content))
+
+        kept = []
+        if signature is not None and self._store.max_similarity(signature) >= self.threshold:
+            self.counters['pages_dropped'] += 1
+        else:
+            if signature is not None:
+                self._store.add(signature)
+
+            seen_on_page = set()
+            for paragraph, fingerprint in zip(paragraphs, fingerprints):
+                if fingerprint in seen_on_page:
+                    self.counters['paragraphs_dropped'] += 1
+                    continue
+                seen_on_page.add(fingerprint)
+                if fingerprint in self._paragraph_pages:
+                    self.counters['paragraphs_dropped'] += 1
+                else:
+                    kept.append(paragraph)
+
+            for fingerprint in seen_on_page:
+                self._paragraph_pages[fingerprint] = self._paragraph_pages.get(fingerprint, 0) + 1
+
+        kept_bytes = sum(len(paragraph.encode('utf-8')) for paragraph in kept)
+        self.counters['bytes_removed'] += page_bytes - kept_bytes
+        self.counters['seconds'] += time.perf_counter() - started
+        return kept
+
+    def stats(self):
+        """
+        Get filter counters.
+
+        Returns:
+            dict: Pages and paragraphs dropped, bytes in and removed, and the
+                seconds spent filtering
+        """
+        stats = dict(self.counters)
+        stats['seconds'] = round(stats['seconds'], 4)
+        return stats
+
+    def _signature(self, text):
+        """
+        Compute the MinHash signature of a text's word shingles.
+
+        Returns:
+            numpy.ndarray or None: uint32 signature, or None if the text is
+                shorter than one shingle
+        """
+        words = text.lower().split()
+        if len(words) < self.shingle_size:
+            return None
+
+        size = self.shingle_size
+        hashes = np.fromiter(
+            (zlib.crc32(' '.join(words[i:i + size]).encode('utf-8')) for i in range(len(words) - size + 1)),
+            dtype=np.uint64
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    @staticmethod
+    def _fingerprint(paragraph):
+        """Hash a paragraph with case and digits masked."""
+        normalized = DIGITS.sub('0', paragraph.lower())
+        return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest()
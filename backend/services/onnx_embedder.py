@@ -0,0 +1,168 @@
+"""
+ONNX Runtime sentence embedder.
+Runs an int8-quantized ONNX export of a sentence-transformer on CPU, without
+PyTorch, with the same mean pooling as the original model. Used for keyword
+embeddings when KEYBERT_BACKEND=onnx.
+
+Export a model once (needs sentence-transformers, torch and onnxruntime):
+    python -m services.onnx_embedder paraphrase-MiniLM-L3-v2 --output instance/onnx
+"""
+import argparse
+import json
+import os
+import numpy as np
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+MODEL_FILE = 'model_quantized.onnx'
+TOKENIZER_FILE = 'tokenizer.json'
+CONFIG_FILE = 'embedder.json'
+
+
+def model_dir(base_dir, model_name):
+    """Directory holding the export of a model under base_dir."""
+    return os.path.join(base_dir, model_name.replace('/', '--'))
+
+
+class OnnxEmbedder:
+    """Sentence embedder backed by ONNX Runtime; encode() mirrors SentenceTransformer.encode."""
+
+    def __init__(self, path, threads=None):
+        """
+        Load an exported model.
+
+        Args:
+            path (str): Directory written by export_quantized_model()
+            threads (int, optional): ONNX Runtime intra-op threads (default: runtime's choice)
+
+        Raises:
+            FileNotFoundError: If the directory holds no export
+        """
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        config_path = os.path.join(path, CONFIG_FILE)
+        if not os.path.exists(config_path):
+            raise FileNotFoundError(f"No exported ONNX model in {path}")
+        with open(config_path, encoding='utf-8') as f:
+            config = json.load(f)
+
+        self.dim = config['dim']
+        self.tokenizer = Tokenizer.from_file(os.path.join(path, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(config['max_seq_length'])
+        self.tokenizer.enable_padding(pad_id=config['pad_id'], pad_token=config['pad_token'])
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(path, MODEL_FILE), options, providers=['CPUExecutionProvider']
+        )
+        self.input_names = {node.name for node in self.session.get_inputs()}
+
+    def get_sentence_embedding_dimension(self):
+        """Embedding dimension."""
+        return self.dim
+
+    def encode(self, sentences, batch_size=32, show_progress_bar=False):
+        """
+        Embed texts.
+
+        Args:
+            sentences (list): Texts to embed
+            batch_size (int): Texts per forward pass
+            show_progress_bar (bool): Accepted for SentenceTransformer compatibility
+
+        Returns:
+            np.ndarray: float32 embeddings, one row per text
+        """
+        sentences = list(sentences)
+        embeddings = np.empty((len(sentences), self.dim), dtype=np.float32)
+
+        # Texts of similar length share batches to keep padding short
+        order = sorted(range(len(sentences)), key=lambda i: -len(sentences[i]))
+        for start in range(0, len(order), batch_size):
+            indexes = order[start:start + batch_size]
+            embeddings[indexes] = self._encode_batch([sentences[i] for i in indexes])
+        return embeddings
+
+    def _encode_batch(self, sentences):
+        """Embed one batch: run the transformer and mean-pool over real tokens."""
+        encodings = self.tokenizer.encode_batch(sentences)
+        mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+        inputs = {
+            'input_ids': np.array([encoding.ids for encoding in encodings], dtype=np.int64),
+            'attention_mask': mask,
+            'token_type_ids': np.array([encoding.type_ids for encoding in encodings], dtype=np.int64)
+        }
+        hidden = self.session.run(None, {name: inputs[name] for name in self.input_names})[0]
+
+        weights = mask[..., None].astype(np.float32)
+        return (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+
+
+def export_quantized_model(model_name, output_dir):
+    """
+    Export a sentence-transformer to ONNX and quantize its weights to int8.
+
+    Args:
+        model_name (str): Sentence-transformer name
+        output_dir (str): Base directory; the export goes to model_dir(output_dir, model_name)
+
+    Returns:
+        str: Directory of the export
+
+    Raises:
+        ValueError: If the model does not use plain mean pooling
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device='cpu')
+    transformer, pooling = model[0], model[1]
+    if len(model) != 2 or not pooling.pooling_mode_mean_tokens:
+        raise ValueError(f"{model_name} does not use plain mean pooling")
+
+    path = model_dir(output_dir, model_name)
+    os.makedirs(path, exist_ok=True)
+    model.tokenizer.backend_tokenizer.save(os.path.join(path, TOKENIZER_FILE))
+
+    sample = model.tokenizer(['an example sentence'], return_tensors='pt')
+    names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in sample]
+    dynamic_axes = {name: {0: 'batch', 1: 'tokens'} for name in names}
+    dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'tokens'}
+
+    full_path = os.path.join(path, 'model.onnx')
+    torch.onnx.export(
+        transformer.auto_model,
+        tuple(sample[name] for name in names),
+        full_path,
+        input_names=names,
+        output_names=['last_hidden_state'],
+        dynamic_axes=dynamic_axes,
+        opset_version=14
+    )
+    quantize_dynamic(full_path, os.path.join(path, MODEL_FILE), weight_type=QuantType.QInt8)
+    os.remove(full_path)
+
+    with open(os.path.join(path, CONFIG_FILE), 'w', encoding='utf-8') as f:
+        json.dump({
+            'model_name': model_name,
+            'dim': model.get_sentence_embedding_dimension(),
+            'max_seq_length': model.max_seq_length,
+            'pad_id': model.tokenizer.pad_token_id,
+            'pad_token': model.tokenizer.pad_token
+        }, f, indent=2)
+
+    logger.info(f"Exported {model_name} to {path}")
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export a sentence-transformer as an int8 ONNX model')
+    parser.add_argument('model', help='Sentence-transformer name, e.g. paraphrase-MiniLM-L3-v2')
+    parser.add_argument('--output', default=os.path.join('instance', 'onnx'), help='Base output directory')
+    args = parser.parse_args()
+    print(export_quantized_model(args.model, args.output))
@@ -0,0 +1,255 @@
+"""
+Page acquisition service.
+Validates a URL and fetches its page in a single round trip over the shared session.
+"""
+import socket
+import threading
+import time
+import requests
+from config import Config
+from services.url_validator import URLValidator
+from utils.http_client import get_session, host_slot
+from utils.page_cache import get_page_cache
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Content types accepted for extraction (a missing Content-Type is sniffed instead)
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Bytes read per iteration while streaming a page
+CHUNK_SIZE = 16 * 1024
+
+
+class PageFetcher:
+    """Fetches web pages once and derives URL validation from the same response."""
+
+    @staticmethod
+    def fetch(url, timeout=Config.REQUEST_TIMEOUT, content_types=HTML_CONTENT_TYPES):
+        """
+        Fetch a web page, following redirects.
+
+        The body is streamed and reading stops at Config.MAX_PAGE_BYTES or when
+        Config.FETCH_DEADLINE seconds have passed, whichever comes first; the
+        bounded buffer is returned. Error responses are not downloaded at all.
+        Pages cut short by the byte cap are cached with their truncated flag;
+        pages cut short by the deadline are not cached.
+
+        When the page cache is enabled, fresh entries are served without a
+        request and stale entries are revalidated with a conditional GET; a 304
+        reuses the cached body and any extraction result stored with it.
+
+        Args:
+            url (str): URL to fetch
+            timeout (int): Connect/read timeout in seconds
+            content_types (tuple, optional): Accepted Content-Type values;
+                None accepts any response
+
+        Returns:
+            dict: Fetched page
+                {
+                    'url': str,  # Requested URL
+                    'final_url': str,  # URL after redirects
+                    'status_code': int,  # HTTP status of the final response
+                    'headers': dict,  # Response headers
+                    'content': bytes,  # Raw response body (possibly truncated)
+                    'encoding': str,  # Declared encoding
+                    'truncated': bool,  # True if the byte cap or deadline was hit
+                    'from_cache': bool,  # True if the body came from the page cache
+                    'extracted': dict or None  # Cached extraction result, if any
+                }
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+            ValueError: If the response content type is not accepted
+        """
+        cache = get_page_cache()
+        cached = cache.lookup(url) if cache else None
+
+        if cached and cached['fresh']:
+            # Entries may come from fetches that accepted any type (sitemaps, robots.txt)
+            PageFetcher._check_content_type(cached['page'], content_types)
+            cache.mark_hit(url)
+            logger.info(f"Page cache hit: {url}")
+            return PageFetcher._from_cache(cached)
+
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        # Hold a per-host slot until the body is read and the connection released
+        with host_slot(url):
+            started = time.monotonic()
+            response = get_session().get(
+                url,
+                timeout=timeout,
+                allow_redirects=True,
+                headers=headers,
+                stream=True
+            )
+
+            try:
+                if cached and response.status_code == 304:
+                    PageFetcher._check_content_type(cached['page'], content_types)
+                    cache.mark_hit(url, revalidated=True)
+                    logger.info(f"Page cache revalidated (304): {url}")
+                    return PageFetcher._from_cache(cached)
+
+                page = {
+                    'url': url,
+                    'final_url': response.url,
+                    'status_code': response.status_code,
+                    'headers': dict(response.headers),
+                    'content': b'',
+                    'encoding': response.encoding,
+                    'truncated': False,
+                    'from_cache': False,
+                    'extracted': None
+                }
+
+                if response.status_code >= 400:
+                    return page
+
+                # The declared type is checked before the body is downloaded
+                PageFetcher._check_content_type(page, content_types)
+
+                content, truncated, timed_out = PageFetcher._read_bounded(response, started)
+                page['content'] = content
+                page['truncated'] = truncated
+                PageFetcher._check_content_type(page, content_types)
+            finally:
+                response.close()
+
+        if cache:
+            cache.mark_miss()
+            # A page cut short by the deadline is incomplete by accident; don't keep it
+            if response.status_code == 200 and not timed_out:
+                cache.store(url, page)
+
+        return page
+
+    @staticmethod
+    def _read_bounded(response, started):
+        """
+        Stream a response body up to the configured byte cap and deadline.
+
+        Args:
+            response (requests.Response): Streaming response
+            started (float): time.monotonic() when the request was sent
+
+        Returns:
+            tuple: (bytes: content, bool: truncated, bool: timed_out)
+        """
+        max_bytes = Config.MAX_PAGE_BYTES
+        chunks = []
+        size = 0
+
+        # A server trickling bytes never trips the read timeout, so a watchdog
+        # shuts the socket down at the deadline and wakes the blocked read
+        expired = threading.Event()
+
+        def expire():
+            expired.set()
+            PageFetcher._abort(response)
+
+        watchdog = threading.Timer(max(0.0, started + Config.FETCH_DEADLINE - time.monotonic()), expire)
+        watchdog.daemon = True
+        watchdog.start()
+
+        try:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                chunks.append(chunk)
+                size += len(chunk)
+
+                if size >= max_bytes:
+                    logger.warning(f"Page exceeds {max_bytes} bytes, truncating: {response.url}")
+                    return b''.join(chunks)[:max_bytes], True, False
+        except (requests.exceptions.RequestException, OSError):
+            if not expired.is_set():
+                raise
+        finally:
+            watchdog.cancel()
+
+        if expired.is_set():
+            logger.warning(f"Page download exceeded {Config.FETCH_DEADLINE}s, truncating: {response.url}")
+            return b''.join(chunks), True, True
+
+        return b''.join(chunks), False, False
+
+    @staticmethod
+    def _abort(response):
+        """Shut down a streaming response's socket, so a read blocked on it returns."""
+        sock = getattr(getattr(response.raw, '_connection', None), 'sock', None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _check_content_type(page, content_types):
+        """
+        Reject a page whose content type is not accepted.
+
+        A page without a Content-Type header is rejected if its body looks binary.
+
+        Args:
+            page (dict): Page dict (from the network or the page cache)
+            content_types (tuple): Accepted Content-Type values; None accepts any response
+
+        Raises:
+            ValueError: If the content type is not accepted
+        """
+        if not content_types:
+            return
+
+        headers = {name.lower(): value for name, value in page['headers'].items()}
+        content_type = headers.get('content-type', '').split(';')[0].strip().lower()
+        if content_type and content_type not in content_types:
+            raise ValueError(f"Unsupported content type: {content_type}")
+        if not content_type and b'\x00' in page['content'][:CHUNK_SIZE]:
+            raise ValueError("Unsupported content type: binary data")
+
+    @staticmethod
+    def _from_cache(cached):
+        """Build a page dict from a page cache entry."""
+        page = dict(cached['page'])
+        page['from_cache'] = True
+        page['extracted'] = cached['extracted']
+        return page
+
+    @staticmethod
+    def acquire(url, timeout=Config.REQUEST_TIMEOUT):
+        """
+        Validate a URL and fetch its page with one GET request.
+
+        Reachability is derived from the same response that carries the page
+        body, so no separate HEAD request is needed.
+
+        Args:
+            url (str): URL to validate and fetch
+            timeout (int): Connect/read timeout in seconds
+
+        Returns:
+            tuple: (bool: is_valid, str: message, dict or None: page)
+        """
+        if not URLValidator.is_valid_format(url):
+            return False, "Invalid URL format", None
+
+        try:
+            page = PageFetcher.fetch(url, timeout=timeout)
+        except ValueError as e:
+            logger.warning(f"Rejected page {url}: {str(e)}")
+            return False, str(e), None
+        except Exception as e:
+            is_valid, message = URLValidator.describe_error(url, e)
+            return is_valid, message, None
+
+        is_valid, message = URLValidator.check_status(url, page['status_code'])
+        if not is_valid:
+            return False, message, None
+
+        return True, message, page
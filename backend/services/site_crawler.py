@@ -0,0 +1,344 @@
+"""
+Site crawler service.
+Discovers pages of a website from robots.txt, sitemaps and same-site links, and
+streams their extracted, cleaned text without holding the whole site in memory.
+"""
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+from lxml import etree, html as lxml_html
+from config import Config
+from services.page_fetcher import PageFetcher
+from services.content_extractor import ContentExtractor
+from services.text_cleaner import TextCleaner
+from services.near_duplicate_filter import NearDuplicateFilter
+from utils.http_client import USER_AGENT
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Link targets that never contain page content
+SKIPPED_EXTENSIONS = (
+    '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.ico', '.css', '.js',
+    '.zip', '.gz', '.mp3', '.mp4', '.avi', '.mov', '.xml', '.json', '.doc', '.docx'
+)
+
+# Sitemap XML parser that never resolves entities or touches the network
+SITEMAP_PARSER = etree.XMLParser(resolve_entities=False, no_network=True, recover=True)
+
+
+class SiteCrawler:
+    """Crawls a single website and streams its content into the pipeline."""
+
+    @staticmethod
+    def crawl(root_url, max_pages=Config.CRAWL_MAX_PAGES, max_depth=Config.CRAWL_MAX_DEPTH):
+        """
+        Crawl a website breadth-first and yield each page's extracted content.
+
+        Seeds are the root URL plus the pages listed in the site's sitemaps;
+        links found on a page are followed while the depth limit allows.
+        Pages disallowed by robots.txt or on other hosts are skipped.
+
+        Args:
+            root_url (str): Website URL to start from
+            max_pages (int): Maximum number of pages fetched
+            max_depth (int): Maximum link depth followed from the seeds
+
+        Yields:
+            dict: Extracted content in the ContentExtractor.extract_content shape
+        """
+        root_host = SiteCrawler._site_host(root_url)
+        robots, sitemap_urls = SiteCrawler._read_robots(root_url)
+        seeds = [root_url] + SiteCrawler.discover_sitemap_urls(root_url, sitemap_urls, limit=max_pages)
+
+        seen = set()
+        frontier = deque()
+        for url in seeds:
+            # Sitemaps may list other hosts; seeds get the same-site check as links
+            url = SiteCrawler._normalize_link(url)
+            if (url and url not in seen
+                    and SiteCrawler._site_host(url) == root_host
+                    and robots.can_fetch(USER_AGENT, url)):
+                seen.add(url)
+                frontier.append((url, 0))
+
+        executor = ThreadPoolExecutor(max_workers=Config.CRAWL_WORKERS)
+        in_flight = {}
+        scheduled = 0
+
+        try:
+            while frontier or in_flight:
+                while frontier and len(in_flight) < Config.CRAWL_WORKERS and scheduled < max_pages:
+                    url, depth = frontier.popleft()
+                    future = executor.submit(SiteCrawler._fetch_page, url, depth < max_depth)
+                    in_flight[future] = depth
+                    scheduled += 1
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    depth = in_flight.pop(future)
+                    website_data, links = future.result()
+
+                    for link in links:
+                        # Never queue far more pages than the budget can fetch
+                        if len(seen) >= max_pages * 2:
+                            break
+                        if (link not in seen
+                                and SiteCrawler._site_host(link) == root_host
+                                and robots.can_fetch(USER_AGENT, link)):
+                            seen.add(link)
+                            frontier.append((link, depth + 1))
+
+                    if website_data:
+                        yield website_data
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        logger.info(f"Crawl of {root_url} finished: {scheduled} pages fetched")
+
+    @staticmethod
+    def iter_cleaned_texts(root_url, max_pages=Config.CRAWL_MAX_PAGES, max_depth=Config.CRAWL_MAX_DEPTH,
+                           duplicate_filter=None):
+        """
+        Crawl a website and yield each page's cleaned text.
+
+        Paragraphs repeated across pages (headers, footers, cookie banners)
+        and near-duplicate pages are removed before the text is yielded.
+
+        Args:
+            root_url (str): Website URL to start from
+            max_pages (int): Maximum number of pages fetched
+            max_depth (int): Maximum link depth followed from the seeds
+            duplicate_filter (NearDuplicateFilter, optional): Filter to use, so
+                the caller can read its stats; a new one is created otherwise
+
+        Yields:
+            tuple: (dict: website_data, str: cleaned_text)
+        """
+        duplicate_filter = duplicate_filter or NearDuplicateFilter()
+
+        for website_data in SiteCrawler.crawl(root_url, max_pages=max_pages, max_depth=max_depth):
+            paragraphs = duplicate_filter.filter_page(TextCleaner.split_paragraphs(website_data['text']))
+            cleaned_text = TextCleaner.clean_text(' '.join(paragraphs), max_length=Config.MAX_CONTENT_LENGTH)
+
+            if len(cleaned_text) < 100:
+                continue
+
+            yield website_data, cleaned_text
+
+    @staticmethod
+    def build_corpus(root_url, max_pages=Config.CRAWL_MAX_PAGES, max_depth=Config.CRAWL_MAX_DEPTH,
+                     max_length=Config.MAX_CONTENT_LENGTH):
+        """
+        Merge a website's cleaned, deduplicated page texts into one corpus of bounded size.
+
+        The crawl stops as soon as the corpus reaches max_length characters.
+
+        Args:
+            root_url (str): Website URL to start from
+            max_pages (int): Maximum number of pages fetched
+            max_depth (int): Maximum link depth followed from the seeds
+            max_length (int): Maximum corpus length in characters
+
+        Returns:
+            dict: Merged corpus
+                {
+                    'website_data': dict,  # Root page metadata with the merged text
+                    'text': str,  # Merged cleaned text
+                    'pages': list,  # URLs of the pages included
+                    'dedup': dict  # NearDuplicateFilter stats
+                }
+        """
+        parts = []
+        pages = []
+        length = 0
+        root_data = None
+        root_page_url = SiteCrawler._normalize_link(root_url)
+        duplicate_filter = NearDuplicateFilter()
+
+        texts = SiteCrawler.iter_cleaned_texts(
+            root_url,
+            max_pages=max_pages,
+            max_depth=max_depth,
+            duplicate_filter=duplicate_filter
+        )
+        for website_data, cleaned_text in texts:
+            if root_data is None or website_data['url'] == root_page_url:
+                root_data = website_data
+
+            remaining = max_length - length
+            parts.append(cleaned_text[:remaining])
+            pages.append(website_data['url'])
+            length += len(parts[-1]) + 1
+
+            if length >= max_length:
+                texts.close()
+                break
+
+        text = ' '.join(parts)
+        website_data = dict(root_data or {}, url=root_url, text=text)
+        dedup = duplicate_filter.stats()
+        logger.info(
+            f"Built site corpus for {root_url}: {len(pages)} pages, {len(text)} chars "
+            f"({dedup['bytes_removed']} duplicate bytes removed in {dedup['seconds']}s)"
+        )
+
+        return {
+            'website_data': website_data,
+            'text': text,
+            'pages': pages,
+            'dedup': dedup
+        }
+
+    @staticmethod
+    def discover_sitemap_urls(root_url, sitemap_urls=None, limit=Config.CRAWL_MAX_PAGES):
+        """
+        Collect page URLs from a website's sitemaps (sitemap indexes are followed).
+
+        Args:
+            root_url (str): Website URL
+            sitemap_urls (list, optional): Sitemaps listed in robots.txt;
+                /sitemap.xml is tried when none are given
+            limit (int): Maximum number of page URLs returned
+
+        Returns:
+            list: Page URLs in sitemap order
+        """
+        root_host = SiteCrawler._site_host(root_url)
+        pending = deque(sitemap_urls or [urljoin(root_url, '/sitemap.xml')])
+        fetched = 0
+        page_urls = []
+
+        while pending and fetched < Config.CRAWL_MAX_SITEMAPS and len(page_urls) < limit:
+            sitemap_url = pending.popleft()
+            fetched += 1
+            try:
+                page = PageFetcher.fetch(sitemap_url, content_types=None)
+                if page['status_code'] != 200:
+                    continue
+                content = page['content']
+                if content[:2] == b'\x1f\x8b':
+                    content = SiteCrawler._gunzip(content)
+                    if content is None:
+                        logger.warning(f"Sitemap {sitemap_url} expands past {Config.MAX_PAGE_BYTES} bytes; skipping")
+                        continue
+                tree = etree.fromstring(content, SITEMAP_PARSER)
+            except Exception as e:
+                logger.warning(f"Could not read sitemap {sitemap_url}: {str(e)}")
+                continue
+
+            if tree is None:
+                continue
+
+            locations = [loc.strip() for loc in tree.xpath('//*[local-name()="loc"]/text()')]
+            if etree.QName(tree).localname == 'sitemapindex':
+                # Child sitemaps get the same-site check as page seeds
+                pending.extend(
+                    location for location in locations if SiteCrawler._on_site(location, root_host)
+                )
+            else:
+                page_urls.extend(locations[:limit - len(page_urls)])
+
+        logger.info(f"Found {len(page_urls)} pages in sitemaps of {root_url}")
+        return page_urls
+
+    @staticmethod
+    def _gunzip(content):
+        """Decompress a gzipped sitemap up to MAX_PAGE_BYTES; None if it expands further."""
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        content = decompressor.decompress(content, max_length=Config.MAX_PAGE_BYTES)
+        return None if decompressor.unconsumed_tail else content
+
+    @staticmethod
+    def _read_robots(root_url):
+        """
+        Fetch and parse robots.txt.
+
+        Returns:
+            tuple: (RobotFileParser, list: sitemap URLs listed in robots.txt)
+        """
+        robots = RobotFileParser()
+        robots_url = urljoin(root_url, '/robots.txt')
+
+        try:
+            page = PageFetcher.fetch(robots_url, content_types=None)
+            lines = page['content'].decode('utf-8', errors='replace').splitlines() if page['status_code'] == 200 else []
+        except Exception as e:
+            logger.warning(f"Could not read robots.txt for {root_url}: {str(e)}")
+            lines = []
+
+        robots.parse(lines)
+        return robots, robots.site_maps() or []
+
+    @staticmethod
+    def _fetch_page(url, want_links):
+        """
+        Fetch and extract one page.
+
+        Returns:
+            tuple: (dict or None: website_data, list: normalized same-page links)
+        """
+        is_valid, message, page = PageFetcher.acquire(url)
+        if not is_valid:
+            logger.info(f"Skipping {url}: {message}")
+            return None, []
+
+        links = SiteCrawler._extract_links(page) if want_links else []
+
+        try:
+            website_data = ContentExtractor.extract_content(url, page=page)
+        except Exception:
+            website_data = None
+
+        return website_data, links
+
+    @staticmethod
+    def _extract_links(page):
+        """Collect normalized absolute link targets from a fetched page."""
+        try:
+            tree = lxml_html.fromstring(page['content'])
+        except Exception:
+            return []
+
+        links = []
+        for href in tree.xpath('//a/@href'):
+            # Malformed hrefs (e.g. "http://[bad/x") make urljoin raise; skip them
+            try:
+                link = SiteCrawler._normalize_link(urljoin(page['final_url'], href))
+            except ValueError:
+                continue
+            if link:
+                links.append(link)
+        return links
+
+    @staticmethod
+    def _normalize_link(url):
+        """Drop fragments and reject non-HTTP, non-page or malformed links."""
+        try:
+            parts = urlsplit(url.strip())
+            if parts.scheme not in ('http', 'https') or not parts.hostname:
+                return None
+        except ValueError:
+            return None
+        if parts.path.lower().endswith(SKIPPED_EXTENSIONS):
+            return None
+        return urlunsplit((parts.scheme, parts.netloc, parts.path or '/', parts.query, ''))
+
+    @staticmethod
+    def _on_site(url, root_host):
+        """True if url is an HTTP(S) URL on the site whose _site_host() is root_host."""
+        try:
+            return urlsplit(url).scheme in ('http', 'https') and SiteCrawler._site_host(url) == root_host
+        except ValueError:
+            return False
+
+    @staticmethod
+    def _site_host(url):
+        """Host name used to decide whether a link stays on the same site."""
+        host = (urlsplit(url).hostname or '').lower()
+        return host[4:] if host.startswith('www.') else host
@@ -3,10 +3,22 @@ Text cleaning service.
 Cleans and normalizes extracted text content.
 """
 import re
+from utils.document import Document
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+MULTIPLE_DOTS = re.compile(r'\.{3,}')
+URL = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+EMAIL = re.compile(r'\S+@\S+')
+# Raw characters cleaned per step when clean_text only needs max_length characters
+CHUNK_SIZE = 16 * 1024
+
+SPECIAL_CHARS = re.compile(r'[^\w\s.,!?;:\-\'"()&]+')
+
+# Substrings that a token must contain for the dot, URL or email rules to change it
+TRIGGER = re.compile(r'\.{3}|https?://|@')
+
 
 class TextCleaner:
     """Cleans and normalizes text content."""
@@ -26,30 +38,12 @@ class TextCleaner:
         if not text:
             return ""
         
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove multiple consecutive dots
-        text = re.sub(r'\.{3,}', '...', text)
-        
-        # Remove URLs from text
-        text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
-        
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
-        
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s.,!?;:\-\'"()&]', '', text)
-        
-        # Normalize quotes
-        text = text.replace('"', '"').replace('"', '"')
-        text = text.replace("'", "'").replace("'", "'")
-        
-        # Remove multiple spaces again
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Trim whitespace
-        text = text.strip()
+        if max_length:
+            # Clean only as much of the text as the truncated result needs
+            chunks = (text[i:i + CHUNK_SIZE] for i in range(0, len(text), CHUNK_SIZE))
+            text = ''.join(TextCleaner.iter_clean(chunks, max_length=max_length))
+        else:
+            text = TextCleaner._normalize(text)
         
         # Truncate if needed
         if max_length and len(text) > max_length:
@@ -63,6 +57,109 @@ class TextCleaner:
         logger.debug(f"Cleaned text: {len(text)} characters")
         return text
     
+    @staticmethod
+    def iter_clean(chunks, max_length=None):
+        """
+        Clean text arriving in chunks, yielding cleaned text as it is produced.
+        
+        A token cut by a chunk boundary is held back until the next chunk, so
+        the concatenated output equals clean_text on the whole text (without
+        truncation). With max_length, no more chunks are read once more than
+        max_length cleaned characters have been yielded.
+        
+        Args:
+            chunks (iterable): Raw text chunks (str)
+            max_length (int, optional): Cleaned characters after which to stop
+            
+        Yields:
+            str: Consecutive pieces of the cleaned text
+        """
+        carry = ''
+        separator = ''
+        produced = 0
+        
+        for chunk in chunks:
+            text = carry + chunk
+            if not text or text[-1].isspace():
+                carry = ''
+            else:
+                carry = text.rsplit(None, 1)[-1]
+            
+            cleaned = TextCleaner._normalize(text[:len(text) - len(carry)])
+            if cleaned:
+                yield separator + cleaned
+                produced += len(separator) + len(cleaned)
+                separator = ' '
+                if max_length and produced > max_length:
+                    return
+        
+        cleaned = TextCleaner._normalize(carry)
+        if cleaned:
+            yield separator + cleaned
+    
+    @staticmethod
+    def split_paragraphs(text):
+        """
+        Split text on line breaks and clean each paragraph separately.
+        
+        Each paragraph is cleaned with the same rules as clean_text, so
+        paragraphs can be compared or filtered before they are joined.
+        
+        Args:
+            text (str): Raw text with one paragraph per line
+            
+        Returns:
+            list: Non-empty cleaned paragraphs
+        """
+        if not text:
+            return []
+        
+        paragraphs = (TextCleaner._normalize(line) for line in text.split('\n'))
+        return [paragraph for paragraph in paragraphs if paragraph]
+    
+    @staticmethod
+    def _normalize(text):
+        """
+        Apply the cleaning rules of clean_text, without truncation.
+        
+        Whitespace is collapsed first; since none of the later rules can
+        match across a space, only the few tokens containing a dot run, URL
+        scheme or '@' go through the dot, URL and email rules, and special
+        characters are then removed in one more pass.
+        """
+        # Collapse whitespace
+        text = ' '.join(text.split())
+        
+        # Collapse dots and remove URLs and email addresses, token by token
+        pieces = []
+        position = 0
+        match = TRIGGER.search(text)
+        while match:
+            start = text.rfind(' ', 0, match.start()) + 1
+            end = text.find(' ', match.end())
+            if end == -1:
+                end = len(text)
+            pieces.append(text[position:start])
+            pieces.append(TextCleaner._clean_token(text[start:end]))
+            position = end
+            match = TRIGGER.search(text, position)
+        if pieces:
+            pieces.append(text[position:])
+            text = ''.join(pieces)
+        
+        # Remove special characters but keep basic punctuation
+        text = SPECIAL_CHARS.sub('', text)
+        
+        # Drop tokens left empty and trim whitespace
+        return ' '.join(text.split())
+    
+    @staticmethod
+    def _clean_token(token):
+        """Collapse dots, then remove URLs and emails, within one token."""
+        token = MULTIPLE_DOTS.sub('...', token)
+        token = URL.sub('', token)
+        return EMAIL.sub('', token)
+    
     @staticmethod
     def remove_stop_words(text, language='english'):
         """
@@ -97,14 +194,14 @@ class TextCleaner:
         Extract valid sentences from text.
         
         Args:
-            text (str): Text to process
+            text (Document or str): Text to process
             min_length (int): Minimum sentence length
             
         Returns:
             list: List of sentences
         """
         # Split by sentence endings
-        sentences = re.split(r'[.!?]+', text)
+        sentences = Document.of(text).sentences()
         
         # Filter and clean sentences
         valid_sentences = []
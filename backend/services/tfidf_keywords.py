@@ -0,0 +1,219 @@
+"""
+TF-IDF keyword extraction.
+Fast, model-free keyword extractor used when KeyBERT is disabled, unavailable
+or saturated. Candidate 1-3 word phrases are hashed and counted with NumPy and
+scored by sublinear term frequency times corpus IDF, learned incrementally from
+the blogs stored in blog_history.
+
+Backfill the IDF table by hand (from the backend directory):
+    python -m services.tfidf_keywords
+"""
+import re
+import threading
+import time
+import zlib
+import numpy as np
+from config import Config
+from services.language_detector import LanguageDetector, get_stopwords
+from utils.idf_store import get_idf_store
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Punctuation that ends a phrase; it becomes a '.' token
+BREAK = re.compile(r'[.!?;:,()"&]')
+
+MIN_WORD_LENGTH = 3
+
+# Weight per extra word in a phrase: repeated phrases are rarer than single words
+PHRASE_BOOST = 0.25
+
+HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+# Background IDF learning (one run at a time per process)
+_learning = threading.Lock()
+_last_refresh = 0.0
+
+
+def candidate_hashes(text, language='en', use_ngrams=True, min_word_length=MIN_WORD_LENGTH):
+    """
+    Hash the candidate phrases of a text.
+
+    Candidates are runs of 1-3 words (1 without ngrams) of at least
+    min_word_length letters that contain no stopword, digit or punctuation.
+
+    Args:
+        text (str): Cleaned text
+        language (str): ISO 639-1 code, selects the stopwords
+        use_ngrams (bool): Whether to include bigrams and trigrams
+        min_word_length (int): Shortest word allowed in a candidate
+
+    Returns:
+        tuple: (tokens list, uint64 hashes, int start token per candidate,
+            int words per candidate), candidates in text order per length
+    """
+    tokens = BREAK.sub(' . ', text.lower()).replace('-', ' ').replace("'", ' ').split()
+    if not tokens:
+        empty = np.empty(0, dtype=np.int64)
+        return tokens, np.empty(0, dtype=np.uint64), empty, empty
+
+    stopwords = get_stopwords(language) or frozenset()
+
+    # Hash and classify each distinct token once, then map tokens to ids
+    distinct = list(dict.fromkeys(tokens))
+    vocabulary = {token: i for i, token in enumerate(distinct)}
+    ids = np.fromiter(map(vocabulary.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+    word_hashes = np.fromiter((zlib.crc32(token.encode('utf-8')) for token in distinct),
+                              dtype=np.uint64, count=len(distinct))
+    usable = np.fromiter(
+        (len(token) >= min_word_length and token not in stopwords and token.isalpha() for token in distinct),
+        dtype=bool, count=len(distinct)
+    )
+
+    hashes = word_hashes[ids]
+    valid = usable[ids]
+
+    all_hashes, all_starts, all_sizes = [], [], []
+    phrase_hashes, phrase_valid = hashes, valid
+    for size in ((1, 2, 3) if use_ngrams else (1,)):
+        if size > 1:
+            # Extend every phrase by the next word (uint64 arithmetic wraps)
+            phrase_hashes = phrase_hashes[:-1] * HASH_MULTIPLIER + hashes[size - 1:]
+            phrase_valid = phrase_valid[:-1] & valid[size - 1:]
+        starts = np.flatnonzero(phrase_valid)
+        all_hashes.append(phrase_hashes[starts])
+        all_starts.append(starts)
+        all_sizes.append(np.full(len(starts), size))
+
+    return tokens, np.concatenate(all_hashes), np.concatenate(all_starts), np.concatenate(all_sizes)
+
+
+class TfidfKeywordExtractor:
+    """Extracts keywords by TF-IDF over hashed candidate phrases."""
+
+    @staticmethod
+    def extract_keywords(text, top_n=10, use_ngrams=True, language='en'):
+        """
+        Extract top keywords from text.
+
+        Args:
+            text (str): Text to extract keywords from
+            top_n (int): Number of top keywords to extract
+            use_ngrams (bool): Whether to include phrases (bigrams/trigrams)
+            language (str): ISO 639-1 code of the text
+
+        Returns:
+            list: List of tuples (keyword, score), scores relative to the best (0-1]
+        """
+        tokens, hashes, starts, sizes = candidate_hashes(text or '', language, use_ngrams)
+        if not len(hashes):
+            return []
+
+        unique, first, counts = np.unique(hashes, return_index=True, return_counts=True)
+
+        store = get_idf_store()
+        idf = store.idf(unique) if store else np.ones(len(unique))
+        TfidfKeywordExtractor._refresh_idf(store)
+
+        scores = (1.0 + np.log(counts)) * idf * (1.0 + PHRASE_BOOST * (sizes[first] - 1))
+
+        # Rank a few extra candidates, as phrases inside better ones are skipped
+        limit = min(len(scores), top_n * 4)
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        best = best[np.lexsort((first[best], -scores[best]))]
+
+        keywords = []
+        chosen = []
+        for index in best:
+            start, size = starts[first[index]], sizes[first[index]]
+            phrase = ' '.join(tokens[start:start + size])
+            padded = f' {phrase} '
+            if any(padded in other for other in chosen):
+                continue
+            chosen.append(padded)
+            keywords.append((phrase, float(scores[index])))
+            if len(keywords) == top_n:
+                break
+
+        top_score = keywords[0][1]
+        return [(phrase, round(score / top_score, 4)) for phrase, score in keywords]
+
+    @staticmethod
+    def _refresh_idf(store):
+        """Every IDF_REFRESH_SECONDS, learn from new blog_history entries in the background."""
+        global _last_refresh
+
+        if not store or Config.IDF_REFRESH_SECONDS <= 0:
+            return
+        now = time.monotonic()
+        if now - _last_refresh < Config.IDF_REFRESH_SECONDS or not _learning.acquire(blocking=False):
+            return
+        _last_refresh = now
+
+        def run():
+            try:
+                learn_from_history(store)
+            except Exception as e:
+                logger.warning(f"IDF learning skipped: {str(e)}")
+            finally:
+                _learning.release()
+
+        threading.Thread(target=run, daemon=True).start()
+
+
+def learn_from_history(store, limit=None):
+    """
+    Add blog_history entries newer than the store's watermark to the IDF table.
+
+    Source pages are not stored, so each blog's generated text stands in for it.
+
+    Args:
+        store (IdfStore): Store to update
+        limit (int, optional): Maximum entries to learn from in this run
+
+    Returns:
+        int: Number of entries learned from
+    """
+    from bson import ObjectId
+    from models.blog_history import BlogHistory
+    from utils.db import get_db
+
+    collection = get_db()[BlogHistory.collection_name]
+    learned = 0
+
+    with store.lock():
+        # Another process may have learned since this one last looked
+        store.reload()
+        query = {'_id': {'$gt': ObjectId(store.last_id)}} if store.last_id else {}
+        cursor = collection.find(query, {'generated_blog': 1}).sort('_id', 1)
+        if limit:
+            cursor = cursor.limit(limit)
+
+        docs, last_id = store.docs, store.last_id
+        for doc in cursor:
+            text = doc.get('generated_blog') or ''
+            language = LanguageDetector.detect(text)['language']
+            hashes = candidate_hashes(text, language)[1]
+            if len(hashes):
+                store.add_document(hashes)
+                docs += 1
+            last_id = str(doc['_id'])
+            learned += 1
+
+        if learned:
+            store.flush()
+            store.write_meta(docs, last_id)
+
+    if learned:
+        logger.info(f"IDF table learned from {learned} blogs ({docs} documents total)")
+    return learned
+
+
+if __name__ == '__main__':
+    from app import create_app
+
+    create_app()
+    store = get_idf_store()
+    if store is None:
+        raise SystemExit("IDF store could not be opened")
+    print(f"learned from {learn_from_history(store)} blogs; {store.docs} documents in {Config.IDF_DIR}")
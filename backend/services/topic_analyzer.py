@@ -2,46 +2,75 @@
 Topic analyzer service.
 Analyzes text to understand main topics and intent.
 """
-from collections import Counter
-import re
+from config import Config
+from services.content_classifier import get_content_classifier
+from services.keyword_extractor import KeywordExtractor
+from utils.document import Document
 from utils.logger import setup_logger
+from utils.term_matcher import TermMatcher
 
 logger = setup_logger(__name__)
 
+# Intent vocabularies, in tie-break order (pages matching none are informational)
+INTENT_MATCHER = TermMatcher({
+    'commercial': ['buy', 'purchase', 'price', 'cost', 'deal', 'discount', 'sale'],
+    'educational': ['learn', 'tutorial', 'guide', 'how to', 'course', 'training'],
+    'review': ['review', 'comparison', 'vs', 'versus', 'best', 'top'],
+})
+
+# Category vocabularies, matched against the keywords, in tie-break order
+CATEGORY_MATCHER = TermMatcher({
+    'technology': ['software', 'technology', 'programming', 'code', 'app', 'digital', 'web', 'api'],
+    'business': ['business', 'marketing', 'sales', 'strategy', 'management', 'enterprise'],
+    'health': ['health', 'medical', 'wellness', 'fitness', 'nutrition', 'healthcare'],
+    'education': ['education', 'learning', 'course', 'training', 'teaching', 'student'],
+    'finance': ['finance', 'money', 'investment', 'banking', 'insurance', 'credit'],
+})
+
 
 class TopicAnalyzer:
     """Analyzes text to extract topics and understand intent."""
     
     @staticmethod
-    def analyze_topics(text, keywords):
+    def analyze_topics(text, keywords, language=None):
         """
         Analyze text to understand main topics.
         
         Args:
-            text (str): Text to analyze
+            text (Document or str): Cleaned document to analyze
             keywords (list): Extracted keywords
+            language (str, optional): ISO 639-1 code the keywords were extracted
+                for; enables the embedding classifier
             
         Returns:
             dict: Analysis results containing topics, intent, and summary
         """
         try:
+            document = Document.of(text)
+            
             # Get text statistics
-            word_count = len(text.split())
-            sentence_count = len(re.split(r'[.!?]+', text))
+            word_count = document.word_count
+            sentence_count = document.sentence_count
             
             # Determine content type/intent
-            intent = TopicAnalyzer._determine_intent(text, keywords)
+            intent, intent_hits = TopicAnalyzer._determine_intent(document, keywords)
             
             # Generate topic summary
             topic_summary = TopicAnalyzer._generate_topic_summary(keywords)
             
             # Get content category
-            category = TopicAnalyzer._categorize_content(keywords)
+            category, category_hits = TopicAnalyzer._categorize_content(keywords)
+            category_scores = TopicAnalyzer._classify_content(document, keywords, language)
+            if category_scores and category_scores[0][1] >= Config.CATEGORY_MIN_SCORE:
+                category = category_scores[0][0]
             
             result = {
                 'intent': intent,
+                'intent_hits': intent_hits,
                 'topic_summary': topic_summary,
                 'category': category,
+                'category_hits': category_hits,
+                'category_scores': category_scores or [],
                 'word_count': word_count,
                 'sentence_count': sentence_count,
                 'main_topics': keywords[:5] if len(keywords) > 5 else keywords
@@ -54,44 +83,34 @@ class TopicAnalyzer:
             logger.error(f"Topic analysis failed: {str(e)}")
             return {
                 'intent': 'informational',
+                'intent_hits': {},
                 'topic_summary': 'General content',
                 'category': 'general',
+                'category_hits': {},
+                'category_scores': [],
                 'word_count': 0,
                 'sentence_count': 0,
                 'main_topics': []
             }
     
     @staticmethod
-    def _determine_intent(text, keywords):
+    def _determine_intent(document, keywords):
         """
         Determine the intent of the content.
         
+        Every intent's terms are counted as whole words in one pass over the
+        text, and the intent with the most hits wins.
+        
         Args:
-            text (str): Text to analyze
+            document (Document): Document to analyze
             keywords (list): Extracted keywords
             
         Returns:
-            str: Intent type (informational, commercial, educational, etc.)
+            tuple: (intent type such as informational, commercial or educational,
+                dict of hits per intent)
         """
-        text_lower = text.lower()
-        
-        # Check for commercial intent
-        commercial_words = ['buy', 'purchase', 'price', 'cost', 'deal', 'discount', 'sale']
-        if any(word in text_lower for word in commercial_words):
-            return 'commercial'
-        
-        # Check for educational intent
-        educational_words = ['learn', 'tutorial', 'guide', 'how to', 'course', 'training']
-        if any(word in text_lower for word in educational_words):
-            return 'educational'
-        
-        # Check for review/comparison intent
-        review_words = ['review', 'comparison', 'vs', 'versus', 'best', 'top']
-        if any(word in text_lower for word in review_words):
-            return 'review'
-        
-        # Default to informational
-        return 'informational'
+        hits = INTENT_MATCHER.count(document.lower)
+        return INTENT_MATCHER.best(hits, 'informational'), hits
     
     @staticmethod
     def _generate_topic_summary(keywords):
@@ -124,35 +143,39 @@ class TopicAnalyzer:
             keywords (list): List of keywords
             
         Returns:
-            str: Content category
+            tuple: (content category, dict of hits per category)
         """
         # Combine all keywords into a single string
         keywords_text = ' '.join(keywords).lower()
         
-        # Technology category
-        tech_terms = ['software', 'technology', 'programming', 'code', 'app', 'digital', 'web', 'api']
-        if any(term in keywords_text for term in tech_terms):
-            return 'technology'
-        
-        # Business category
-        business_terms = ['business', 'marketing', 'sales', 'strategy', 'management', 'enterprise']
-        if any(term in keywords_text for term in business_terms):
-            return 'business'
+        hits = CATEGORY_MATCHER.count(keywords_text)
+        return CATEGORY_MATCHER.best(hits, 'general'), hits
+    
+    @staticmethod
+    def _classify_content(document, keywords, language):
+        """
+        Rank categories with the embedding classifier.
         
-        # Health category
-        health_terms = ['health', 'medical', 'wellness', 'fitness', 'nutrition', 'healthcare']
-        if any(term in keywords_text for term in health_terms):
-            return 'health'
+        Uses the document and keyword vectors cached by keyword extraction, so
+        no model runs here.
         
-        # Education category
-        education_terms = ['education', 'learning', 'course', 'training', 'teaching', 'student']
-        if any(term in keywords_text for term in education_terms):
-            return 'education'
+        Args:
+            document (Document): Document the keywords were extracted from
+            keywords (list): List of keywords
+            language (str): ISO 639-1 code the keywords were extracted for
+            
+        Returns:
+            list or None: (category, score) tuples, best first, or None if there
+                are no centroids or the vectors are not cached
+        """
+        classifier = get_content_classifier()
+        if not classifier or not language:
+            return None
         
-        # Finance category
-        finance_terms = ['finance', 'money', 'investment', 'banking', 'insurance', 'credit']
-        if any(term in keywords_text for term in finance_terms):
-            return 'finance'
+        vectors = KeywordExtractor.cached_embeddings(
+            document, keywords, language, model_name=classifier.model_name, dim=classifier.dim
+        )
+        if vectors is None:
+            return None
         
-        # Default category
-        return 'general'
+        return classifier.classify(*vectors, top_k=Config.CATEGORY_TOP_K)
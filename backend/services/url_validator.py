@@ -4,6 +4,7 @@ Validates URL format and checks if the URL is reachable.
 """
 import re
 import requests
+from utils.http_client import get_session, host_slot
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -39,44 +40,74 @@ class URLValidator:
         return bool(URLValidator.URL_PATTERN.match(url.strip()))
     
     @staticmethod
-    def is_reachable(url, timeout=5):
+    def check_status(url, status_code):
         """
-        Check if URL is reachable (returns HTTP 200-399).
+        Derive reachability from an HTTP status code (200-399 is reachable).
         
         Args:
-            url (str): URL to check
-            timeout (int): Request timeout in seconds
+            url (str): URL that was requested
+            status_code (int): HTTP status code of the final response
             
         Returns:
             tuple: (bool: is_reachable, str: status_message)
         """
-        try:
-            response = requests.head(
-                url,
-                timeout=timeout,
-                allow_redirects=True,
-                headers={'User-Agent': 'Mozilla/5.0'}
-            )
+        if status_code < 400:
+            logger.info(f"URL is reachable: {url} (Status: {status_code})")
+            return True, "URL is reachable"
+        
+        logger.warning(f"URL returned error: {url} (Status: {status_code})")
+        return False, f"URL returned status code {status_code}"
+    
+    @staticmethod
+    def describe_error(url, error):
+        """
+        Convert a request exception into a user-facing validation message.
+        
+        Args:
+            url (str): URL that was requested
+            error (Exception): Exception raised while requesting the URL
             
-            if response.status_code < 400:
-                logger.info(f"URL is reachable: {url} (Status: {response.status_code})")
-                return True, "URL is reachable"
-            else:
-                logger.warning(f"URL returned error: {url} (Status: {response.status_code})")
-                return False, f"URL returned status code {response.status_code}"
-                
-        except requests.exceptions.Timeout:
+        Returns:
+            tuple: (bool: False, str: status_message)
+        """
+        if isinstance(error, requests.exceptions.Timeout):
             logger.warning(f"URL timeout: {url}")
             return False, "Request timeout - URL took too long to respond"
-        except requests.exceptions.ConnectionError:
+        if isinstance(error, requests.exceptions.ConnectionError):
             logger.warning(f"Connection error: {url}")
             return False, "Connection error - Could not reach the URL"
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request error for {url}: {str(e)}")
-            return False, f"Request error: {str(e)}"
+        if isinstance(error, requests.exceptions.RequestException):
+            logger.error(f"Request error for {url}: {str(error)}")
+            return False, f"Request error: {str(error)}"
+        
+        logger.error(f"Unexpected error validating {url}: {str(error)}")
+        return False, "Unexpected error occurred"
+    
+    @staticmethod
+    def is_reachable(url, timeout=5):
+        """
+        Check if URL is reachable (returns HTTP 200-399).
+        
+        Prefer PageFetcher.acquire when the page body is needed as well, since it
+        derives the same result from a single GET.
+        
+        Args:
+            url (str): URL to check
+            timeout (int): Request timeout in seconds
+            
+        Returns:
+            tuple: (bool: is_reachable, str: status_message)
+        """
+        try:
+            with host_slot(url):
+                response = get_session().head(
+                    url,
+                    timeout=timeout,
+                    allow_redirects=True
+                )
+            return URLValidator.check_status(url, response.status_code)
         except Exception as e:
-            logger.error(f"Unexpected error validating {url}: {str(e)}")
-            return False, "Unexpected error occurred"
+            return URLValidator.describe_error(url, e)
     
     @staticmethod
     def validate(url):
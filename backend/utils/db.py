@@ -11,6 +11,7 @@ logger = setup_logger(__name__)
 # Global database client and database instance
 _client = None
 _db = None
+_uri = None
 
 
 def init_db(app):
@@ -23,11 +24,12 @@ def init_db(app):
     Returns:
         Database: MongoDB database instance
     """
-    global _client, _db
+    global _client, _db, _uri
     
     try:
         # Create MongoDB client
         mongodb_uri = app.config['MONGODB_URI']
+        _uri = mongodb_uri
         _client = MongoClient(mongodb_uri, serverSelectionTimeoutMS=5000)
         
         # Test connection
@@ -74,12 +76,30 @@ def _create_indexes():
         _db.blog_history.create_index("user_id")
         _db.blog_history.create_index("created_at")
         _db.blog_history.create_index([("user_id", 1), ("created_at", -1)])
+        _db.blog_history.create_index([("user_id", 1), ("simhash_bands", 1)])
         
         logger.info("Database indexes created successfully")
     except Exception as e:
         logger.warning(f"Error creating indexes: {str(e)}")
 
 
+def reconnect():
+    """
+    Replace the client with a new one in a forked worker process.
+    
+    MongoClient is not fork-safe, so workers of a preloading server must not
+    reuse the client the master opened before forking.
+    """
+    global _client, _db
+    if _client is None:
+        return
+    
+    db_name = _db.name
+    _client = MongoClient(_uri, serverSelectionTimeoutMS=5000, connect=False)
+    _db = _client[db_name]
+    logger.info("Database client recreated after fork")
+
+
 def close_db():
     """Close database connection."""
     global _client
@@ -0,0 +1,147 @@
+"""
+Cleaned document with shared token and sentence offsets.
+Built once after cleaning so every later stage reads the same word and sentence
+boundaries instead of re-splitting the text.
+"""
+import re
+from array import array
+from bisect import bisect_left
+
+TOKEN = re.compile(r'\S+')
+
+# Sentence delimiter runs, as split on by the pipeline ("[.!?]+")
+SENTENCE_END = re.compile(r'[.!?]+')
+
+
+class Document:
+    """Cleaned text with lazily computed, cached token and sentence offsets."""
+
+    def __init__(self, text):
+        """
+        Create a document.
+
+        Args:
+            text (str): Cleaned text
+        """
+        self.text = text
+        self._lower = None
+        self._token_starts = None
+        self._token_ends = None
+        self._delimiter_starts = None
+        self._delimiter_ends = None
+
+    @classmethod
+    def of(cls, value):
+        """Return value if it is already a Document, otherwise wrap the string."""
+        return value if isinstance(value, cls) else cls(value or '')
+
+    @property
+    def lower(self):
+        """Lowercased text (cached)."""
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def token_starts(self):
+        """array('I') of token start offsets; tokens are runs of non-whitespace."""
+        if self._token_starts is None:
+            self._token_starts, self._token_ends = self._spans(TOKEN)
+        return self._token_starts
+
+    @property
+    def token_ends(self):
+        """array('I') of token end offsets (exclusive)."""
+        if self._token_ends is None:
+            self._token_starts, self._token_ends = self._spans(TOKEN)
+        return self._token_ends
+
+    @property
+    def word_count(self):
+        """Number of whitespace-separated tokens (same as len(text.split()))."""
+        return len(self.token_starts)
+
+    @property
+    def sentence_count(self):
+        """Number of pieces between delimiter runs (same as len(re.split(r'[.!?]+', text)))."""
+        return len(self._delimiters()[0]) + 1
+
+    def sentences(self):
+        """
+        Get the raw pieces between sentence delimiter runs.
+
+        Returns:
+            list: Unstripped sentence strings, as re.split(r'[.!?]+', text) returns them
+        """
+        starts, ends = self._delimiters()
+        text = self.text
+        pieces = []
+        position = 0
+        for start, end in zip(starts, ends):
+            pieces.append(text[position:start])
+            position = end
+        pieces.append(text[position:])
+        return pieces
+
+    def windows(self, max_chars):
+        """
+        Split the text into consecutive windows that end at sentence boundaries.
+
+        A sentence longer than max_chars is cut at the last space that fits.
+
+        Args:
+            max_chars (int): Maximum window length in characters
+
+        Returns:
+            list: Stripped, non-empty window strings covering the whole text
+        """
+        text = self.text
+        windows = []
+        start = 0
+        cut = 0  # Furthest sentence end that fits in the current window
+        for end in list(self._delimiters()[1]) + [len(text)]:
+            while end - start > max_chars:
+                if cut <= start:
+                    space = text.rfind(' ', start + 1, start + max_chars)
+                    cut = space if space != -1 else start + max_chars
+                windows.append(text[start:cut].strip())
+                start = cut
+            cut = end
+        windows.append(text[start:].strip())
+        return [window for window in windows if window]
+
+    def last_period_before(self, limit):
+        """
+        Find the last '.' before an offset, using the delimiter index.
+
+        Args:
+            limit (int): Offset to search before (exclusive)
+
+        Returns:
+            int: Offset of the period, or -1 if there is none (like text[:limit].rfind('.'))
+        """
+        starts, ends = self._delimiters()
+        text = self.text
+        index = bisect_left(starts, limit) - 1
+        while index >= 0:
+            period = text.rfind('.', starts[index], min(ends[index], limit))
+            if period != -1:
+                return period
+            index -= 1
+        return -1
+
+    def _delimiters(self):
+        """Sentence delimiter run offsets: (array starts, array ends)."""
+        if self._delimiter_starts is None:
+            self._delimiter_starts, self._delimiter_ends = self._spans(SENTENCE_END)
+        return self._delimiter_starts, self._delimiter_ends
+
+    def _spans(self, pattern):
+        """Offsets of every pattern match as two compact uint32 arrays."""
+        starts = array('I')
+        ends = array('I')
+        for match in pattern.finditer(self.text):
+            start, end = match.span()
+            starts.append(start)
+            ends.append(end)
+        return starts, ends
@@ -0,0 +1,320 @@
+"""
+Embedding cache.
+Caches sentence-transformer embeddings of documents and candidate phrases, keyed
+by model name and text, so recurring phrases are only embedded once: an
+in-process LRU plus an optional memory-mapped float16 store shared by workers.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+import numpy as np
+from config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Shared cache instance (lazy loading)
+_embedding_cache = None
+
+# Rough per-vector bookkeeping overhead in memory (key, OrderedDict node, array header)
+ENTRY_OVERHEAD = 200
+
+KEY_BYTES = 16
+EMPTY_KEY = bytes(KEY_BYTES)
+
+
+def embedding_key(model_name, text):
+    """
+    Hash a model name and text into an embedding cache key.
+
+    Args:
+        model_name (str): Sentence-transformer name
+        text (str): Embedded text
+
+    Returns:
+        bytes: 16-byte digest
+    """
+    return hashlib.blake2b(f'{model_name}\0{text}'.encode('utf-8'), digest_size=KEY_BYTES).digest()
+
+
+class DiskEmbeddingStore:
+    """
+    Fixed-capacity ring of float16 vectors in a memory-mapped file.
+
+    A SQLite index maps keys to rows and allocates rows (overwriting the oldest
+    when full) under its write lock, so several worker processes can share one
+    store. Each row also holds its key, which readers check before and after
+    copying the vector, so a row being overwritten is read as a miss.
+    """
+
+    def __init__(self, path, model_name, dim, capacity):
+        """
+        Open or create the store for one model.
+
+        Args:
+            path (str): Directory holding the store files
+            model_name (str): Sentence-transformer name
+            dim (int): Embedding dimension
+            capacity (int): Number of vectors kept
+        """
+        os.makedirs(path, exist_ok=True)
+        slug = hashlib.blake2b(model_name.encode('utf-8'), digest_size=8).hexdigest()
+        base = os.path.join(path, f'embeddings-{slug}-{dim}')
+        self.capacity = capacity
+        self.dtype = np.dtype([('key', f'V{KEY_BYTES}'), ('vector', np.float16, (dim,))])
+
+        # Growing the file with truncate is safe when several workers open it at once
+        size = self.dtype.itemsize * capacity
+        with open(f'{base}.f16', 'ab') as f:
+            if f.tell() < size:
+                f.truncate(size)
+        self._rows = np.memmap(f'{base}.f16', dtype=self.dtype, mode='r+', shape=(capacity,))
+
+        self.db_path = f'{base}.sqlite3'
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute('CREATE TABLE IF NOT EXISTS slots (key BLOB PRIMARY KEY, row INTEGER)')
+        conn.execute('CREATE INDEX IF NOT EXISTS slots_row ON slots (row)')
+        conn.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)')
+        conn.execute("INSERT OR IGNORE INTO meta (name, value) VALUES ('next_row', 0)")
+
+    def _connect(self):
+        """Get this thread's connection to the index database."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, keys):
+        """
+        Look up vectors.
+
+        Args:
+            keys (list): Keys from embedding_key()
+
+        Returns:
+            dict: key -> float32 vector, for the keys found
+        """
+        conn = self._connect()
+        found = {}
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ','.join('?' * len(batch))
+            rows = conn.execute(f'SELECT key, row FROM slots WHERE key IN ({placeholders})', batch).fetchall()
+            for key, row in rows:
+                key = bytes(key)
+                if self._rows[row]['key'].tobytes() != key:
+                    continue
+                vector = np.array(self._rows[row]['vector'], dtype=np.float32)
+                if self._rows[row]['key'].tobytes() == key:
+                    found[key] = vector
+        return found
+
+    def put_many(self, keys, vectors):
+        """
+        Store vectors, overwriting the oldest rows once the store is full.
+
+        Args:
+            keys (list): Keys from embedding_key()
+            vectors (list): Vectors in the same order
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            next_row = conn.execute("SELECT value FROM meta WHERE name = 'next_row'").fetchone()[0]
+            for key, vector in zip(keys, vectors):
+                row = next_row % self.capacity
+                next_row += 1
+
+                conn.execute('DELETE FROM slots WHERE row = ?', (row,))
+                # Invalidate the row before rewriting it, then publish the new key
+                self._rows[row]['key'] = EMPTY_KEY
+                self._rows[row]['vector'] = vector
+                self._rows[row]['key'] = key
+                conn.execute('INSERT OR REPLACE INTO slots (key, row) VALUES (?, ?)', (key, row))
+
+            conn.execute("UPDATE meta SET value = ? WHERE name = 'next_row'", (next_row,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache: in-process LRU plus optional shared float16 memmap."""
+
+    def __init__(self, max_entries, disk_path=None, disk_max_entries=100000, max_bytes=None):
+        """
+        Create the cache.
+
+        Args:
+            max_entries (int): Vectors kept in the in-process LRU
+            disk_path (str, optional): Directory for the shared on-disk tier;
+                the disk tier is disabled when not given
+            disk_max_entries (int): Vectors kept per model in the on-disk tier
+            max_bytes (int, optional): Approximate memory the in-process LRU may
+                use, in bytes (unbounded when not given)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._bytes = 0
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        self._memory = OrderedDict()
+        self._stores = {}
+        self._lock = threading.Lock()
+        self.counters = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'model_texts': 0,
+            'model_seconds': 0.0
+        }
+
+    def _store(self, model_name, dim):
+        """Get the on-disk store for a model, opening it on first use."""
+        if not self.disk_path:
+            return None
+
+        key = (model_name, dim)
+        with self._lock:
+            if key not in self._stores:
+                try:
+                    self._stores[key] = DiskEmbeddingStore(self.disk_path, model_name, dim, self.disk_max_entries)
+                except Exception as e:
+                    logger.error(f"Failed to open embedding store for {model_name}: {str(e)}")
+                    self._stores[key] = None
+            return self._stores[key]
+
+    def get_many(self, model_name, texts, dim=None):
+        """
+        Look up the embeddings of several texts.
+
+        Args:
+            model_name (str): Sentence-transformer name
+            texts (list): Texts to look up
+            dim (int, optional): Embedding dimension; the disk tier is only
+                searched once it is known
+
+        Returns:
+            list: float32 vector or None per text
+        """
+        keys = [embedding_key(model_name, text) for text in texts]
+        vectors = [None] * len(texts)
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    vectors[i] = vector
+            memory_hits = sum(vector is not None for vector in vectors)
+            self.counters['memory_hits'] += memory_hits
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        store = self._store(model_name, dim) if missing and dim else None
+        if store:
+            found = store.get_many([keys[i] for i in missing])
+            for i in missing:
+                vector = found.get(keys[i])
+                if vector is not None:
+                    vectors[i] = vector
+                    self._remember(keys[i], vector)
+            with self._lock:
+                self.counters['disk_hits'] += len(found)
+
+        with self._lock:
+            self.counters['misses'] += sum(vector is None for vector in vectors)
+        return vectors
+
+    def put_many(self, model_name, texts, vectors):
+        """
+        Store the embeddings of several texts.
+
+        Args:
+            model_name (str): Sentence-transformer name
+            texts (list): Embedded texts
+            vectors (list): float32 vectors in the same order
+        """
+        keys = [embedding_key(model_name, text) for text in texts]
+        for key, vector in zip(keys, vectors):
+            self._remember(key, vector)
+
+        store = self._store(model_name, len(vectors[0])) if vectors else None
+        if store:
+            try:
+                store.put_many(keys, vectors)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not write embeddings to disk: {str(e)}")
+
+    def record_model_time(self, texts, seconds):
+        """
+        Record time spent embedding cache misses with the model.
+
+        Args:
+            texts (int): Number of texts embedded
+            seconds (float): Time taken
+        """
+        with self._lock:
+            self.counters['model_texts'] += texts
+            self.counters['model_seconds'] += seconds
+
+    def _remember(self, key, vector):
+        """Insert into the in-process LRU, evicting the oldest entries past the entry or byte bound."""
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes + ENTRY_OVERHEAD
+            self._memory[key] = vector
+            self._bytes += vector.nbytes + ENTRY_OVERHEAD
+            while self._memory and (len(self._memory) > self.max_entries
+                                    or (self.max_bytes and self._bytes > self.max_bytes)):
+                _, evicted = self._memory.popitem(last=False)
+                self._bytes -= evicted.nbytes + ENTRY_OVERHEAD
+
+    def stats(self):
+        """
+        Get cache counters.
+
+        Returns:
+            dict: Hit/miss counters, 'hit_rate', and 'model_seconds_saved',
+                estimated from the average model time per embedded text
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['memory_entries'] = len(self._memory)
+            stats['memory_bytes'] = self._bytes
+
+        hits = stats['memory_hits'] + stats['disk_hits']
+        lookups = hits + stats['misses']
+        per_text = stats['model_seconds'] / stats['model_texts'] if stats['model_texts'] else 0.0
+        stats['hit_rate'] = round(hits / lookups, 3) if lookups else None
+        stats['model_seconds_saved'] = round(hits * per_text, 3)
+        stats['model_seconds'] = round(stats['model_seconds'], 3)
+        return stats
+
+
+def get_embedding_cache():
+    """Get or initialize the shared embedding cache.
+
+    Returns None when EMBEDDING_CACHE_SIZE is 0. The on-disk tier is only
+    enabled when EMBEDDING_CACHE_DIR is set.
+    """
+    global _embedding_cache
+
+    if Config.EMBEDDING_CACHE_SIZE <= 0:
+        return None
+
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(
+            Config.EMBEDDING_CACHE_SIZE,
+            disk_path=Config.EMBEDDING_CACHE_DIR or None,
+            disk_max_entries=Config.EMBEDDING_CACHE_DISK_ENTRIES,
+            max_bytes=Config.EMBEDDING_CACHE_MAX_BYTES
+        )
+
+    return _embedding_cache
@@ -0,0 +1,181 @@
+"""
+Extraction result cache.
+Caches ContentExtractor results by a hash of the page bytes, so identical HTML is
+only run through trafilatura once.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Shared cache instance (lazy loading)
+_extraction_cache = None
+
+
+def content_key(html):
+    """
+    Hash page bytes into an extraction cache key.
+
+    Args:
+        html (bytes or str): Raw page content
+
+    Returns:
+        str: Hex digest identifying the content
+    """
+    if isinstance(html, str):
+        html = html.encode('utf-8')
+    return hashlib.blake2b(html, digest_size=16).hexdigest()
+
+
+class ExtractionCache:
+    """Two-tier extraction cache: in-process LRU plus an optional SQLite file."""
+
+    def __init__(self, max_entries, disk_path=None, disk_max_entries=10000):
+        """
+        Create the cache.
+
+        Args:
+            max_entries (int): Entries kept in the in-process LRU
+            disk_path (str, optional): Directory for the shared on-disk tier;
+                the disk tier is disabled when not given
+            disk_max_entries (int): Entries kept in the on-disk tier
+        """
+        self.max_entries = max_entries
+        self.disk_max_entries = disk_max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+        self.db_path = None
+        if disk_path:
+            os.makedirs(disk_path, exist_ok=True)
+            self.db_path = os.path.join(disk_path, 'extractions.sqlite3')
+            self._connect().execute(
+                'CREATE TABLE IF NOT EXISTS extractions ('
+                ' key TEXT PRIMARY KEY, result TEXT, accessed_at REAL)'
+            )
+            self._connect().execute(
+                'CREATE INDEX IF NOT EXISTS extractions_accessed ON extractions (accessed_at)'
+            )
+
+    def _connect(self):
+        """Get this thread's connection to the on-disk tier."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def _remember(self, key, result):
+        """Insert into the in-process LRU, evicting the oldest entry if full."""
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key):
+        """
+        Look up an extraction result.
+
+        Args:
+            key (str): Content key from content_key()
+
+        Returns:
+            dict or None: Cached extraction result (without 'url')
+        """
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.counters['memory_hits'] += 1
+                return dict(result)
+
+        if self.db_path:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT result FROM extractions WHERE key = ?', (key,)
+            ).fetchone()
+            if row:
+                conn.execute(
+                    'UPDATE extractions SET accessed_at = ? WHERE key = ?',
+                    (time.time(), key)
+                )
+                result = json.loads(row[0])
+                self._remember(key, result)
+                with self._lock:
+                    self.counters['disk_hits'] += 1
+                return dict(result)
+
+        with self._lock:
+            self.counters['misses'] += 1
+        return None
+
+    def put(self, key, result):
+        """
+        Store an extraction result.
+
+        Args:
+            key (str): Content key from content_key()
+            result (dict): Extraction result; any 'url' field is not stored
+        """
+        result = {name: value for name, value in result.items() if name != 'url'}
+        self._remember(key, result)
+
+        if self.db_path:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO extractions (key, result, accessed_at) VALUES (?, ?, ?)',
+                (key, json.dumps(result), time.time())
+            )
+            conn.execute(
+                'DELETE FROM extractions WHERE key IN ('
+                ' SELECT key FROM extractions ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                (self.disk_max_entries,)
+            )
+
+    def stats(self):
+        """
+        Get cache counters.
+
+        Returns:
+            dict: Hit/miss counters plus in-process entry count
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['memory_entries'] = len(self._memory)
+        return stats
+
+
+def get_extraction_cache():
+    """Get or initialize the shared extraction cache.
+
+    Returns None when EXTRACTION_CACHE_SIZE is 0. The on-disk tier is only
+    enabled when EXTRACTION_CACHE_DIR is set.
+    """
+    global _extraction_cache
+
+    if Config.EXTRACTION_CACHE_SIZE <= 0:
+        return None
+
+    if _extraction_cache is None:
+        try:
+            _extraction_cache = ExtractionCache(
+                Config.EXTRACTION_CACHE_SIZE,
+                disk_path=Config.EXTRACTION_CACHE_DIR or None,
+                disk_max_entries=Config.EXTRACTION_CACHE_DISK_ENTRIES
+            )
+        except Exception as e:
+            logger.error(f"Failed to open extraction cache disk tier: {str(e)}")
+            _extraction_cache = ExtractionCache(Config.EXTRACTION_CACHE_SIZE)
+
+    return _extraction_cache
@@ -0,0 +1,212 @@
+"""
+Shared outbound HTTP client.
+Provides a pooled requests session, per-host concurrency limits, a cached DNS
+resolver, and connection reuse metrics for all services that fetch web pages.
+"""
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+import requests
+import urllib3.util.connection
+from requests.adapters import HTTPAdapter
+from config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Default browser-like User-Agent sent with every outbound request
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Shared session (lazy loading, one per worker process)
+_session = None
+_session_lock = threading.Lock()
+
+# Per-host concurrency slots: host -> [semaphore, users]; dropped once no request uses them
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+# DNS cache: (host, port) -> (expires_at, [sockaddr, ...])
+_dns_cache = {}
+_dns_lock = threading.Lock()
+_original_create_connection = None
+
+# Outbound request counters
+_metrics = {
+    'requests': 0,
+    'new_connections': 0,
+    'dns_hits': 0,
+    'dns_misses': 0,
+    'host_slot_waits': 0
+}
+_metrics_lock = threading.Lock()
+
+
+def _count(name):
+    with _metrics_lock:
+        _metrics[name] += 1
+
+
+def _resolve(host, port):
+    """
+    Resolve a host to its socket addresses, caching results for DNS_CACHE_TTL.
+
+    Args:
+        host (str): Hostname or IP literal
+        port (int): Port number
+
+    Returns:
+        list: (family, sockaddr) tuples in resolver order
+    """
+    key = (host, port)
+    now = time.monotonic()
+
+    with _dns_lock:
+        cached = _dns_cache.get(key)
+    if cached and cached[0] > now:
+        _count('dns_hits')
+        return cached[1]
+
+    _count('dns_misses')
+    addresses = [
+        (family, sockaddr)
+        for family, _, _, _, sockaddr in socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+    ]
+    with _dns_lock:
+        _dns_cache[key] = (now + Config.DNS_CACHE_TTL, addresses)
+    return addresses
+
+
+def _cached_create_connection(address, *args, **kwargs):
+    """
+    Drop-in for urllib3's create_connection that resolves through the DNS cache.
+
+    Every resolved address is tried in order, as urllib3 does itself. TLS
+    verification and SNI still use the original hostname, which urllib3
+    passes separately.
+    """
+    host, port = address
+    _count('new_connections')
+
+    try:
+        addresses = _resolve(host.strip('[]'), port)
+    except socket.gaierror:
+        return _original_create_connection(address, *args, **kwargs)
+
+    error = None
+    for family, sockaddr in addresses:
+        try:
+            return _original_create_connection((sockaddr[0], port), *args, **kwargs)
+        except OSError as e:
+            error = e
+    if error is not None:
+        raise error
+    raise socket.error("getaddrinfo returns an empty list")
+
+
+def _count_response(response, *args, **kwargs):
+    """Session response hook counting every response, redirects included."""
+    _count('requests')
+
+
+def get_session():
+    """
+    Get or initialize the shared HTTP session.
+
+    The session keeps TCP/TLS connections alive between requests (one pool
+    per host), so repeated fetches in the same worker skip the connection
+    handshake. The first call also installs the cached DNS resolver.
+
+    Returns:
+        requests.Session: Shared session instance
+    """
+    global _session, _original_create_connection
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                if _original_create_connection is None:
+                    _original_create_connection = urllib3.util.connection.create_connection
+                    urllib3.util.connection.create_connection = _cached_create_connection
+
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=Config.HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=Config.HTTP_POOL_MAXSIZE
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update({'User-Agent': USER_AGENT})
+                session.hooks['response'].append(_count_response)
+
+                _session = session
+                logger.info("Shared HTTP session initialized")
+
+    return _session
+
+
+@contextmanager
+def host_slot(url):
+    """
+    Hold one of the per-host concurrency slots for the URL's host.
+
+    Wrap the whole request, including reading a streamed body, so no more than
+    HTTP_PER_HOST_LIMIT requests per host are in flight in this process.
+
+    Args:
+        url (str): URL about to be requested
+
+    Raises:
+        requests.exceptions.Timeout: If no slot frees up within
+            HTTP_HOST_SLOT_TIMEOUT seconds
+    """
+    host = (urlsplit(url).hostname or '').lower()
+    with _host_slots_lock:
+        entry = _host_slots.setdefault(host, [threading.BoundedSemaphore(Config.HTTP_PER_HOST_LIMIT), 0])
+        entry[1] += 1
+    slot = entry[0]
+
+    try:
+        if not slot.acquire(blocking=False):
+            _count('host_slot_waits')
+            if not slot.acquire(timeout=Config.HTTP_HOST_SLOT_TIMEOUT):
+                raise requests.exceptions.Timeout(f"Timed out waiting for a connection slot to {host}")
+        try:
+            yield
+        finally:
+            slot.release()
+    finally:
+        # Forget hosts nobody is using, so the table only holds hosts in flight
+        with _host_slots_lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del _host_slots[host]
+
+
+def get_http_metrics():
+    """
+    Get outbound HTTP counters.
+
+    Returns:
+        dict: Request, connection and DNS counters plus 'connection_reuse',
+            the share of requests served over an already open connection
+    """
+    with _metrics_lock:
+        metrics = dict(_metrics)
+
+    if metrics['requests']:
+        reused = max(metrics['requests'] - metrics['new_connections'], 0)
+        metrics['connection_reuse'] = round(reused / metrics['requests'], 3)
+    else:
+        metrics['connection_reuse'] = None
+    return metrics
+
+
+def close_session():
+    """Close the shared HTTP session and release pooled connections."""
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+        logger.info("Shared HTTP session closed")
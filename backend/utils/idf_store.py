@@ -0,0 +1,146 @@
+"""
+Corpus document frequencies for TF-IDF keyword scoring.
+Keeps hashed document-frequency counts in a compact memory-mapped uint32 array
+shared by all worker processes, plus a small metadata file with the document
+count and the last blog_history entry learned from.
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+import numpy as np
+from config import Config
+from utils.logger import setup_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: learning is only serialized within the process
+    fcntl = None
+
+logger = setup_logger(__name__)
+
+# Shared store instance (lazy loading)
+_idf_store = None
+
+
+class IdfStore:
+    """Hashed document frequencies in a memory-mapped array, updated incrementally."""
+
+    def __init__(self, path, buckets):
+        """
+        Open or create the store.
+
+        Args:
+            path (str): Directory holding the store files
+            buckets (int): Hash buckets (a power of two); changing it resets the store
+        """
+        os.makedirs(path, exist_ok=True)
+        self.buckets = buckets
+        self.mask = buckets - 1
+        self.meta_path = os.path.join(path, 'meta.json')
+        self.counts_path = os.path.join(path, 'df.u32')
+        self._lock_path = os.path.join(path, 'lock')
+        self._thread_lock = threading.Lock()
+        self._meta_mtime = None
+
+        with self.lock():
+            meta = self._read_meta()
+            if meta.get('buckets') != buckets:
+                if meta:
+                    logger.warning(f"IDF store bucket count changed to {buckets}; starting over")
+                with open(self.counts_path, 'wb') as f:
+                    f.truncate(buckets * 4)
+                self.write_meta(0, None)
+
+        self._counts = np.memmap(self.counts_path, dtype=np.uint32, mode='r+', shape=(buckets,))
+        self.reload()
+
+    @contextmanager
+    def lock(self):
+        """Hold the store's write lock (across processes where fcntl is available)."""
+        with self._thread_lock, open(self._lock_path, 'a') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_meta(self):
+        """Read the metadata file ({} if missing or unreadable)."""
+        try:
+            with open(self.meta_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def write_meta(self, docs, last_id):
+        """Atomically replace the metadata file (hold lock())."""
+        tmp_path = f'{self.meta_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'buckets': self.buckets, 'docs': docs, 'last_id': last_id}, f)
+        os.replace(tmp_path, self.meta_path)
+        self.docs, self.last_id = docs, last_id
+        self._meta_mtime = self._meta_stamp()
+
+    def _meta_stamp(self):
+        """Modification time of the metadata file (None if missing)."""
+        try:
+            return os.stat(self.meta_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def reload(self):
+        """Re-read the document count and watermark (other processes may have learned)."""
+        self._meta_mtime = self._meta_stamp()
+        meta = self._read_meta()
+        self.docs = meta.get('docs', 0)
+        self.last_id = meta.get('last_id')
+
+    def add_document(self, hashes):
+        """
+        Count one document's terms (hold lock(), then write_meta() when done).
+
+        Args:
+            hashes (np.ndarray): uint64 term hashes of the document
+        """
+        buckets = np.unique(hashes & np.uint64(self.mask)).astype(np.intp)
+        counts = self._counts[buckets]
+        self._counts[buckets] = np.where(counts < np.iinfo(np.uint32).max, counts + 1, counts)
+
+    def flush(self):
+        """Write counts to disk."""
+        self._counts.flush()
+
+    def idf(self, hashes):
+        """
+        Smoothed inverse document frequencies, log((1 + N) / (1 + df)) + 1.
+
+        Args:
+            hashes (np.ndarray): uint64 term hashes
+
+        Returns:
+            np.ndarray: float64 IDF per hash (all 1.0 before any document is learned)
+        """
+        # The shared counts update in place; pick up the document count that goes with them
+        if self._meta_stamp() != self._meta_mtime:
+            self.reload()
+        if not self.docs:
+            return np.ones(len(hashes))
+        df = self._counts[(hashes & np.uint64(self.mask)).astype(np.intp)]
+        return np.log((1.0 + self.docs) / (1.0 + df)) + 1.0
+
+
+def get_idf_store():
+    """Get or initialize the shared IDF store; None if it cannot be opened."""
+    global _idf_store
+
+    if _idf_store is None:
+        try:
+            _idf_store = IdfStore(Config.IDF_DIR, Config.IDF_BUCKETS)
+        except OSError as e:
+            logger.error(f"Failed to open IDF store: {str(e)}")
+            return None
+
+    return _idf_store
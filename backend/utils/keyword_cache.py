@@ -0,0 +1,142 @@
+"""
+Keyword result cache.
+Caches ranked keyword lists by a hash of the cleaned text plus the model and
+extraction parameters, so previewing a page and then generating from it runs
+KeyBERT once. Lists are stored deeper than requested, so any smaller top_n is
+served from the same entry.
+"""
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Shared cache instance (lazy loading)
+_keyword_cache = None
+
+# Rough per-entry bookkeeping overhead (key, OrderedDict node, list, tuples)
+ENTRY_OVERHEAD = 256
+KEYWORD_OVERHEAD = 120
+
+
+def keyword_cache_key(text, model_name, **params):
+    """
+    Hash a cleaned text, model and extraction parameters into a cache key.
+
+    Args:
+        text (str): Cleaned text keywords are extracted from
+        model_name (str): Model (and backend) producing the keywords
+        **params: Extraction parameters that change the ranking (not top_n)
+
+    Returns:
+        str: Hex digest
+    """
+    settings = '\0'.join(f'{name}={params[name]}' for name in sorted(params))
+    return hashlib.blake2b(f'{model_name}\0{settings}\0{text}'.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _covers(cached, wanted):
+    """True if a list ranked from `cached` candidates can answer a request for `wanted` (0 means all)."""
+    return cached <= 0 or 0 < wanted <= cached
+
+
+class KeywordCache:
+    """In-process LRU of ranked keyword lists, bounded by entry count and memory."""
+
+    def __init__(self, max_entries, max_bytes):
+        """
+        Create the cache.
+
+        Args:
+            max_entries (int): Entries kept
+            max_bytes (int): Approximate memory kept, in bytes
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key, top_n, candidates=0):
+        """
+        Look up the top keywords for a key.
+
+        Args:
+            key (str): Key from keyword_cache_key()
+            top_n (int): Number of keywords wanted
+            candidates (int): Candidate phrases the caller would rank, 0 for all
+
+        Returns:
+            list or None: Up to top_n (keyword, score) tuples, or None if not
+                cached or the cached list is too short or ranked fewer candidates
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            # A list shorter than its depth holds every candidate there was
+            if (entry is not None and (top_n <= entry['depth'] or len(entry['keywords']) < entry['depth'])
+                    and _covers(entry['candidates'], candidates)):
+                self._entries.move_to_end(key)
+                self.counters['hits'] += 1
+                return entry['keywords'][:top_n]
+            self.counters['misses'] += 1
+            return None
+
+    def put(self, key, keywords, depth, candidates=0):
+        """
+        Store a ranked keyword list.
+
+        Args:
+            key (str): Key from keyword_cache_key()
+            keywords (list): (keyword, score) tuples, best first
+            depth (int): top_n the list was extracted with
+            candidates (int): Candidate phrases ranked per text, 0 for all
+        """
+        keywords = [(keyword, float(score)) for keyword, score in keywords]
+        size = ENTRY_OVERHEAD + sum(sys.getsizeof(keyword) + KEYWORD_OVERHEAD for keyword, _ in keywords)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous['size']
+            self._entries[key] = {'keywords': keywords, 'depth': depth, 'candidates': candidates, 'size': size}
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted['size']
+                self.counters['evictions'] += 1
+
+    def stats(self):
+        """
+        Get cache counters.
+
+        Returns:
+            dict: Hit/miss/eviction counters, 'entries', 'bytes' and 'hit_rate'
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else None
+        return stats
+
+
+def get_keyword_cache():
+    """Get or initialize the shared keyword cache; None when KEYWORD_CACHE_SIZE is 0."""
+    global _keyword_cache
+
+    if Config.KEYWORD_CACHE_SIZE <= 0:
+        return None
+
+    if _keyword_cache is None:
+        _keyword_cache = KeywordCache(Config.KEYWORD_CACHE_SIZE, Config.KEYWORD_CACHE_MAX_BYTES)
+
+    return _keyword_cache
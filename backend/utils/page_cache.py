@@ -0,0 +1,257 @@
+"""
+Persistent HTTP page cache.
+Stores fetched pages with their validators so repeat fetches can be revalidated
+with conditional GETs instead of downloading and re-parsing the page.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Query parameters that never change page content and are dropped from cache keys
+TRACKING_PARAMS = ('utm_', 'gclid', 'fbclid', 'mc_cid', 'mc_eid')
+
+# Shared cache instance (lazy loading)
+_page_cache = None
+
+
+def normalize_url(url):
+    """
+    Normalize a URL for use as a cache key.
+
+    Lowercases scheme and host, drops default ports, fragments and tracking
+    parameters, and sorts the remaining query parameters.
+
+    Args:
+        url (str): URL to normalize
+
+    Returns:
+        str: Normalized URL
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+
+    port = parts.port
+    if port and not ((scheme == 'http' and port == 80) or (scheme == 'https' and port == 443)):
+        host = f"{host}:{port}"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    )
+
+    return urlunsplit((scheme, host, parts.path or '/', urlencode(query), ''))
+
+
+class PageCache:
+    """Size-bounded LRU page cache backed by a SQLite file."""
+
+    def __init__(self, path, max_bytes, ttl):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path (str): Directory holding the cache database
+            max_bytes (int): Maximum total size of cached bodies
+            ttl (int): Seconds an entry is served without revalidation
+        """
+        os.makedirs(path, exist_ok=True)
+        self.db_path = os.path.join(path, 'pages.sqlite3')
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+        self._connect().execute(
+            'CREATE TABLE IF NOT EXISTS pages ('
+            ' key TEXT PRIMARY KEY, final_url TEXT, headers TEXT,'
+            ' etag TEXT, last_modified TEXT, body BLOB, size INTEGER,'
+            ' extracted TEXT, stored_at REAL, accessed_at REAL)'
+        )
+        self._connect().execute('CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at)')
+
+    def _connect(self):
+        """Get this thread's connection to the cache database."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def lookup(self, url):
+        """
+        Look up a cached page.
+
+        Args:
+            url (str): Requested URL
+
+        Returns:
+            dict or None: Cached entry with 'page', 'etag', 'last_modified',
+                'extracted' and 'fresh' (True while within the TTL)
+        """
+        row = self._connect().execute(
+            'SELECT final_url, headers, etag, last_modified, body, extracted, stored_at'
+            ' FROM pages WHERE key = ?',
+            (normalize_url(url),)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        final_url, headers, etag, last_modified, body, extracted, stored_at = row
+        headers = json.loads(headers)
+        return {
+            'page': {
+                'url': url,
+                'final_url': final_url,
+                'status_code': 200,
+                'headers': headers,
+                'content': bytes(body),
+                'encoding': headers.get('X-Cache-Encoding'),
+                'truncated': bool(headers.get('X-Cache-Truncated'))
+            },
+            'etag': etag,
+            'last_modified': last_modified,
+            'extracted': json.loads(extracted) if extracted else None,
+            'fresh': time.time() - stored_at < self.ttl
+        }
+
+    def mark_hit(self, url, revalidated=False):
+        """
+        Record a cache hit and refresh the entry's LRU position.
+
+        Args:
+            url (str): Requested URL
+            revalidated (bool): True if the hit came from a 304 response, which
+                also restarts the entry's TTL
+        """
+        now = time.time()
+        if revalidated:
+            self._connect().execute(
+                'UPDATE pages SET stored_at = ?, accessed_at = ? WHERE key = ?',
+                (now, now, normalize_url(url))
+            )
+            self._count('revalidated')
+        else:
+            self._connect().execute(
+                'UPDATE pages SET accessed_at = ? WHERE key = ?',
+                (now, normalize_url(url))
+            )
+            self._count('hits')
+
+    def mark_miss(self):
+        """Record a fetch that had to download the page body."""
+        self._count('misses')
+
+    def store(self, url, page):
+        """
+        Store a fetched page and its validators.
+
+        Pages marked no-store by the origin are not cached.
+
+        Args:
+            url (str): Requested URL
+            page (dict): Page returned by PageFetcher.fetch
+        """
+        headers = dict(page['headers'])
+        if 'no-store' in headers.get('Cache-Control', '').lower():
+            return
+
+        headers['X-Cache-Encoding'] = page.get('encoding')
+        headers['X-Cache-Truncated'] = bool(page.get('truncated'))
+        body = page['content']
+        now = time.time()
+
+        self._connect().execute(
+            'INSERT OR REPLACE INTO pages'
+            ' (key, final_url, headers, etag, last_modified, body, size, extracted, stored_at, accessed_at)'
+            ' VALUES (?, ?, ?, ?, ?, ?, ?, NULL, ?, ?)',
+            (
+                normalize_url(url), page['final_url'], json.dumps(headers),
+                headers.get('ETag'), headers.get('Last-Modified'),
+                sqlite3.Binary(body), len(body), now, now
+            )
+        )
+        self._count('stores')
+        self._evict()
+
+    def store_extracted(self, url, extracted):
+        """
+        Attach an extraction result to a cached page, so a 304 can skip parsing.
+
+        Args:
+            url (str): Requested URL
+            extracted (dict): Result of ContentExtractor.extract_content
+        """
+        self._connect().execute(
+            'UPDATE pages SET extracted = ? WHERE key = ?',
+            (json.dumps(extracted), normalize_url(url))
+        )
+
+    def _evict(self):
+        """Evict least recently used entries until the cache fits max_bytes."""
+        conn = self._connect()
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for key, size in conn.execute('SELECT key, size FROM pages ORDER BY accessed_at').fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute('DELETE FROM pages WHERE key = ?', (key,))
+            total -= size
+            self._count('evictions')
+
+    def stats(self):
+        """
+        Get cache counters and current size.
+
+        Returns:
+            dict: Hit/miss counters plus 'entries' and 'bytes'
+        """
+        entries, total = self._connect().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages'
+        ).fetchone()
+        with self._lock:
+            stats = dict(self.counters)
+        stats.update({'entries': entries, 'bytes': total})
+        return stats
+
+
+def get_page_cache():
+    """Get or initialize the shared page cache.
+
+    Respects PAGE_CACHE_ENABLED; returns None when caching is disabled or the
+    cache database cannot be opened, so callers fetch normally.
+    """
+    global _page_cache
+
+    if not Config.PAGE_CACHE_ENABLED:
+        return None
+
+    if _page_cache is None:
+        try:
+            _page_cache = PageCache(
+                Config.PAGE_CACHE_DIR,
+                max_bytes=Config.PAGE_CACHE_MAX_BYTES,
+                ttl=Config.PAGE_CACHE_TTL
+            )
+            logger.info(f"Page cache opened at {Config.PAGE_CACHE_DIR}")
+        except Exception as e:
+            logger.error(f"Failed to open page cache: {str(e)}")
+            return None
+
+    return _page_cache
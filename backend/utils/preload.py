@@ -0,0 +1,61 @@
+"""
+Preload-before-fork support.
+Loads the heavy, read-only parts of the app (KeyBERT model, trafilatura and lxml,
+the Gemini client library, language profiles, category centroids) in a
+pre-forking server's master process, so workers share them copy-on-write
+instead of loading them N times.
+"""
+import gc
+import time
+from config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Small page run through the extractor once, so trafilatura builds its lazy settings now
+WARMUP_HTML = (
+    '<html><head><title>Warmup</title></head><body><article><h1>Warmup</h1>'
+    + '<p>This paragraph warms up the content extraction pipeline before workers fork.</p>' * 5
+    + '</article></body></html>'
+)
+
+
+def preload():
+    """
+    Load shared models and modules, then freeze every object allocated so far.
+
+    gc.freeze() moves all current objects into the permanent generation, so the
+    garbage collector in the workers never walks them and writes to their
+    headers, which would copy the shared pages into each worker.
+
+    Returns:
+        dict: Loaded models and the time taken
+    """
+    started = time.perf_counter()
+
+    # Content extraction: trafilatura, lxml and their lazily built settings
+    from services.content_extractor import ContentExtractor
+    try:
+        ContentExtractor._extract_from_html(WARMUP_HTML.encode('utf-8'), url='preload')
+    except ValueError:
+        pass
+
+    # Gemini client library (its network clients are still created per worker, on first use)
+    import services.blog_generator  # noqa: F401
+
+    # Language detection profiles and stopword lists
+    from services.language_detector import _get_profiles
+    _get_profiles()
+
+    from services.keyword_extractor import preload_keybert_models
+    models = preload_keybert_models(Config.PRELOAD_LANGUAGES)
+
+    from services.content_classifier import get_content_classifier
+    get_content_classifier()
+
+    gc.collect()
+    gc.freeze()
+
+    seconds = time.perf_counter() - started
+    logger.info(f"Preloaded {models or 'no KeyBERT models'} in {seconds:.1f}s; {gc.get_freeze_count()} objects frozen")
+    return {'models': models, 'seconds': round(seconds, 2)}
@@ -0,0 +1,74 @@
+"""
+SimHash fingerprints for source texts.
+Near-identical texts get fingerprints that differ in only a few bits, so a
+Hamming-distance lookup finds blogs generated from (almost) the same page.
+"""
+import hashlib
+import re
+from collections import Counter
+import numpy as np
+
+# Fingerprint size and the 8-bit bands it is split into for index lookups.
+# Two fingerprints within distance 7 share at least one band (pigeonhole), so
+# MAX_INDEXED_DISTANCE is the largest distance the band index can find.
+FINGERPRINT_BITS = 64
+BAND_BITS = 8
+BANDS = FINGERPRINT_BITS // BAND_BITS
+MAX_INDEXED_DISTANCE = BANDS - 1
+
+# Words per shingle; shingles keep word order in the fingerprint
+SHINGLE_SIZE = 3
+
+WORD = re.compile(r'\w+')
+MASK = (1 << FINGERPRINT_BITS) - 1
+
+
+def simhash(text):
+    """
+    Compute the 64-bit SimHash of a text's word shingles.
+
+    Each shingle votes on every bit with its 64-bit hash, weighted by how
+    often it occurs; the fingerprint keeps the bits with a positive total.
+
+    Args:
+        text (str): Cleaned text
+
+    Returns:
+        int or None: Signed 64-bit fingerprint (storable in MongoDB), or None
+            if the text is shorter than one shingle
+    """
+    words = WORD.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return None
+
+    shingles = Counter(' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1))
+    digests = b''.join(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest() for shingle in shingles)
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(-1, 8), axis=1)
+    weights = np.fromiter(shingles.values(), dtype=np.int64, count=len(shingles))
+
+    votes = weights @ (bits.astype(np.int64) * 2 - 1)
+    fingerprint = int.from_bytes(np.packbits(votes > 0).tobytes(), 'big')
+    return fingerprint - (1 << FINGERPRINT_BITS) if fingerprint >> (FINGERPRINT_BITS - 1) else fingerprint
+
+
+def hamming_distance(a, b):
+    """Number of differing bits between two fingerprints."""
+    return bin((a ^ b) & MASK).count('1')
+
+
+def band_keys(fingerprint):
+    """
+    Split a fingerprint into its index keys, one per 8-bit band.
+
+    Keys carry their band position, so equal values in different bands
+    never match.
+
+    Args:
+        fingerprint (int): Fingerprint from simhash()
+
+    Returns:
+        list: BANDS integer keys
+    """
+    fingerprint &= MASK
+    band_mask = (1 << BAND_BITS) - 1
+    return [(band << BAND_BITS) | ((fingerprint >> (band * BAND_BITS)) & band_mask) for band in range(BANDS)]
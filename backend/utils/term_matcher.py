@@ -0,0 +1,63 @@
+"""
+Multi-class term matching.
+Compiles several classes' term lists into one regular expression with word
+boundaries, so a text is scanned once and every class gets a hit count.
+"""
+import re
+
+# Plural and verb endings a term may carry ("app" matches "apps", "learn" matches "learning")
+INFLECTIONS = r'(?:s|es|d|ed|ing)?'
+
+
+class TermMatcher:
+    """Counts whole-word matches of per-class term lists in a single pass."""
+
+    def __init__(self, vocabularies):
+        """
+        Compile the term lists.
+
+        Args:
+            vocabularies (dict): Class name -> list of lowercase terms (words or
+                phrases); class order is the tie-break order used by best()
+        """
+        self.classes = list(vocabularies)
+        self._classes_by_term = {}
+        for name, terms in vocabularies.items():
+            for term in terms:
+                self._classes_by_term.setdefault(term, []).append(name)
+
+        # Longest first, so "how to" wins over "how" and "learning" over "learn"
+        terms = sorted(self._classes_by_term, key=len, reverse=True)
+        self._pattern = re.compile(
+            r'\b(' + '|'.join(re.escape(term) for term in terms) + r')' + INFLECTIONS + r'\b'
+        )
+
+    def count(self, text):
+        """
+        Count term hits per class.
+
+        Args:
+            text (str): Lowercase text to scan
+
+        Returns:
+            dict: Class name -> number of term occurrences, for every class
+        """
+        hits = dict.fromkeys(self.classes, 0)
+        for term in self._pattern.findall(text):
+            for name in self._classes_by_term[term]:
+                hits[name] += 1
+        return hits
+
+    def best(self, hits, default):
+        """
+        Pick the class with the most hits.
+
+        Args:
+            hits (dict): Counts from count()
+            default (str): Class returned when nothing matched
+
+        Returns:
+            str: Class with the most hits; ties go to the class listed first
+        """
+        name = max(self.classes, key=hits.get, default=None)
+        return name if name is not None and hits[name] else default
@@ -0,0 +1,15 @@
+"""
+WSGI entry point for pre-forking servers.
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+With PRELOAD_MODELS=True the app and its models are loaded once in the master
+process and shared copy-on-write by the workers.
+"""
+import os
+from app import create_app
+from config import Config
+from utils.preload import preload
+
+app = create_app(os.environ.get('FLASK_ENV', 'production'))
+
+if Config.PRELOAD_MODELS:
+    preload()